@@ -1,14 +1,55 @@
+import io
 import os
-from flask import Flask, render_template, send_from_directory, current_app, request, redirect, url_for, flash
+import gzip
+import zlib
+import posixpath
+import re
+import csv
+import json
+import time
+import base64
+import tempfile
+import threading
+import shutil
+import uuid
+import random
+import socket
+import bisect
+import hashlib
+import functools
+import itertools
+import mimetypes
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from contextlib import ExitStack, contextmanager
+import click
+from flask import Flask, render_template, send_from_directory, current_app, request, redirect, url_for, flash, jsonify, Response, stream_with_context, send_file, abort
+from flask import g, has_request_context, before_render_template, template_rendered, session as flask_session, stream_template
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as ModelSession
+from markupsafe import Markup, escape
+from jinja2 import nodes
+from jinja2.ext import Extension
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import DDL, and_, or_, event, select, bindparam, literal, text, union_all
+from sqlalchemy import exc as sa_exc, func, inspect as sa_inspect
+from sqlalchemy import insert as sa_insert, update as sa_update, delete as sa_delete
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased, configure_mappers, contains_eager, joinedload, object_session, selectinload
 
 from flask_wtf import FlaskForm
+from flask_wtf.csrf import generate_csrf, validate_csrf
 from wtforms import StringField, TextAreaField, DateField, FloatField, IntegerField, ValidationError, SelectField, SelectMultipleField, BooleanField, SubmitField
 from wtforms.validators import DataRequired, Length, NumberRange, Email, Optional
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_accept_header
 from werkzeug.utils import secure_filename
-from flask_migrate import Migrate # <--- FIXED: Uncommented this
+from werkzeug.wsgi import FileWrapper
+from werkzeug.security import safe_join
 # from flask_mail import Mail, Message
 
 # Load environment variables
@@ -21,12 +62,12 @@ ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif'}
 
 app = Flask(__name__)
 
-# Ensure upload folder exists (Cloud Run starts with an empty filesystem)
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024 
+# Chunked (flow.js) uploads stream to disk one chunk per request, so an assembled file may
+# exceed MAX_CONTENT_LENGTH, which only bounds a single request.
+app.config['UPLOAD_MAX_FILE_SIZE'] = int(os.getenv("UPLOAD_MAX_FILE_SIZE", 512 * 1024 * 1024))
+app.config['UPLOAD_CHUNK_TTL'] = int(os.getenv("UPLOAD_CHUNK_TTL", 24 * 60 * 60))
 
 # --- Configuration ---
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-default-key") 
@@ -37,8 +78,150 @@ app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-default-key")
 app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", "sqlite:///site.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-db = SQLAlchemy(app) 
-migrate = Migrate(app, db) # This will now work because the import is fixed
+# --- Database connection pool ---
+# gunicorn runs GUNICORN_WORKERS processes x GUNICORN_THREADS threads (see Dockerfile) and each
+# process has its own pool, sized so every request thread can hold a connection plus a small
+# overflow. Connections are pinged on checkout and recycled well before MySQL's idle timeout, so
+# one dropped server-side is replaced instead of failing the request.
+GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", 3))
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", 8))
+# Background job threads per worker process (see Background jobs); they share the same pool.
+JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", 2))
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class LatencyHistogram(object):
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max: self.max = seconds
+
+    def snapshot(self):
+        # Cumulative (upper bound, count) pairs, Prometheus style; the last bound is +Inf.
+        with self._lock:
+            cumulative, running = [], 0
+            for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+                running += n
+                cumulative.append((bound, running))
+            return dict(count=self.count, sum=self.total, max=self.max, buckets=cumulative)
+
+class PoolMetrics(object):
+    COUNTERS = ('checkouts', 'overflow_checkouts', 'timeouts', 'connects', 'invalidations', 'soft_invalidations')
+
+    def __init__(self):
+        self.checkout_wait = LatencyHistogram()
+        self.max_overflow_seen = 0
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def incr(self, name):
+        with self._lock: self._counters[name] += 1
+
+    def record_overflow(self, overflow):
+        with self._lock:
+            if overflow > 0: self._counters['overflow_checkouts'] += 1
+            if overflow > self.max_overflow_seen: self.max_overflow_seen = overflow
+
+    def stats(self):
+        wait = self.checkout_wait.snapshot()
+        with self._lock:
+            return dict(self._counters, max_overflow_seen=self.max_overflow_seen,
+                        checkout_wait_ms=dict(count=wait['count'], max=round(wait['max'] * 1000, 2),
+                                              avg=round(wait['sum'] * 1000 / wait['count'], 2) if wait['count'] else 0.0))
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    # Times Pool.connect(): queue wait, the pre-ping and any new connection the checkout had to open.
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super(InstrumentedQueuePool, self).connect()
+        except sa_exc.TimeoutError:
+            pool_metrics.incr('timeouts')
+            raise
+        finally:
+            pool_metrics.checkout_wait.observe(time.perf_counter() - started)
+
+def engine_options(uri):
+    options = dict(pool_pre_ping=True)
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options  # Flask-SQLAlchemy gives in-memory SQLite a single shared connection
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", GUNICORN_THREADS + JOB_WORKER_THREADS)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 2)),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    )
+    return options
+
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+
+# Optional read replica (see Read replica below). Locally, point it at a copy of the SQLite file:
+# DATABASE_REPLICA_URL=sqlite:///replica.db, and copy site.db over it again to "replicate".
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+if DATABASE_REPLICA_URL:
+    app.config["SQLALCHEMY_BINDS"] = {'replica': dict(engine_options(DATABASE_REPLICA_URL), url=DATABASE_REPLICA_URL)}
+
+class RoutingSession(ModelSession):
+    # Statements of a request running under @replica_reads go to the replica engine, except writes:
+    # a flush or DML statement goes to the primary and keeps the rest of the request there.
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and g.get('db_replica'):
+            if self._flushing or getattr(clause, 'is_dml', False):
+                g.db_replica = False
+            else:
+                return self._db.engines['replica']
+        return super(RoutingSession, self).get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+# Bound to the app (and its engine created) by create_app()
+db = SQLAlchemy(session_options=dict(class_=RoutingSession))
+
+def instrument_pool(engine):
+    # Engine-level pool listeners survive the pool being recreated after dispose() or a disconnect.
+    @event.listens_for(engine, 'checkout')
+    def _checkout(dbapi_connection, record, proxy):
+        pool_metrics.incr('checkouts')
+        if isinstance(engine.pool, QueuePool): pool_metrics.record_overflow(engine.pool.overflow())
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, record): pool_metrics.incr('connects')
+
+    @event.listens_for(engine, 'invalidate')
+    def _invalidate(dbapi_connection, record, exception): pool_metrics.incr('invalidations')
+
+    @event.listens_for(engine, 'soft_invalidate')
+    def _soft_invalidate(dbapi_connection, record, exception): pool_metrics.incr('soft_invalidations')
+
+def enable_sqlite_foreign_keys(dbapi_connection, record):
+    # SQLite only enforces foreign keys, and so ON DELETE CASCADE, when asked to on each connection.
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+def pool_state(engine):
+    pool = engine.pool
+    state = dict(pool_class=type(pool).__name__, status=pool.status())
+    if isinstance(pool, QueuePool):
+        options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+        state.update(size=pool.size(), checked_in=pool.checkedin(), checked_out=pool.checkedout(),
+                     overflow=max(pool.overflow(), 0), max_overflow=options.get('max_overflow'),
+                     timeout=pool.timeout(), recycle=options.get('pool_recycle'),
+                     # Upper bound this instance can open against the database
+                     max_connections=GUNICORN_WORKERS * (pool.size() + options.get('max_overflow', 0)))
+    return state
 
 def allowed_file(filename):
     return '.' in filename and \
@@ -102,36 +285,53 @@ class Returnonexperienceentrymodel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(50), nullable=False, default='RexCommitee')
-    ProjectNameAndNumber_id = db.Column(db.Integer, db.ForeignKey('projectlist.id'), nullable=False)
-    Region_id = db.Column(db.Integer, db.ForeignKey('regionlist.id'), nullable=False)
-    REXInitiator_id = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=False)
-    REXOnDiscipline_id = db.Column(db.Integer, db.ForeignKey('disciplinelist.id'), nullable=False)
-    REXInitiatingDiscipline_id = db.Column(db.Integer, db.ForeignKey('disciplinelist.id'), nullable=True)
+    ProjectNameAndNumber_id = db.Column(db.Integer, db.ForeignKey('projectlist.id'), nullable=False, index=True)
+    Region_id = db.Column(db.Integer, db.ForeignKey('regionlist.id'), nullable=False, index=True)
+    REXInitiator_id = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=False, index=True)
+    REXOnDiscipline_id = db.Column(db.Integer, db.ForeignKey('disciplinelist.id'), nullable=False, index=True)
+    REXInitiatingDiscipline_id = db.Column(db.Integer, db.ForeignKey('disciplinelist.id'), nullable=True, index=True)
     REXOnTopic = db.Column(db.String(500), nullable=False)
     REXDescription = db.Column(db.String(500), nullable=False)
     Impact = db.Column(db.String(500), nullable=False)
     AttachmentLink = db.Column(db.String(500), nullable=False)
     Recommendation = db.Column(db.String(500), nullable=False)
+    # Advanced on every write to the entry or its child rows (see _bump_entry_versions)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     primary_discipline = db.relationship('Disciplinelist', foreign_keys=[REXOnDiscipline_id])
     secondary_discipline = db.relationship('Disciplinelist', foreign_keys=[REXInitiatingDiscipline_id])
-    rexcommitee  = db.relationship('RexCommitteeModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan')
-    actionplan  = db.relationship('ActionPlanModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan')
-    reviewByCommitteeModel  = db.relationship('ReviewByCommitteeModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan')
+    # Child rows go with the entry through ON DELETE CASCADE; passive_deletes keeps the ORM from loading them first
+    rexcommitee  = db.relationship('RexCommitteeModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    actionplan  = db.relationship('ActionPlanModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    reviewByCommitteeModel  = db.relationship('ReviewByCommitteeModel', backref='returnonexperienceentrymodel', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    search_document = db.relationship('RexSearchDocument', primaryjoin='Returnonexperienceentrymodel.id == foreign(RexSearchDocument.entry_id)',
+                                      uselist=False, lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+
+    # Listing keyset order and status-filtered listing (see paginate_keyset). Archived entries keep
+    # their ids, so ids must never be handed out twice: AUTOINCREMENT on SQLite (InnoDB on MySQL 8
+    # never reuses them either).
+    __table_args__ = (
+        db.Index('ix_rex_date_created_id', 'date_created', 'id'),
+        db.Index('ix_rex_status_date_created_id', 'status', 'date_created', 'id'),
+        {'sqlite_autoincrement': True},
+    )
     
     def __repr__(self): return f"{self.id} - {self.date_created}"    
     
 class RexCommitteeModel(db.Model):
+    # Ids move to the archive with the row, so they must not be reused (see the entry's __table_args__)
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id'), nullable=False) 
+    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id', ondelete='CASCADE'), nullable=False, index=True)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
-    ReviewCommiteeMember = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True)
+    ReviewCommiteeMember = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True, index=True)
     IsitREX = db.Column(db.String(100), nullable=False)
     Isfurtheranalysisrequired = db.Column(db.String(500), nullable=True)
-    Mentor = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True)
-    ActionBy = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True)
-    QMSSpoc = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True)
-    Technology = db.Column(db.Integer, db.ForeignKey('technologylist.id'), nullable=True)
+    Mentor = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True, index=True)
+    ActionBy = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True, index=True)
+    QMSSpoc = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True, index=True)
+    Technology = db.Column(db.Integer, db.ForeignKey('technologylist.id'), nullable=True, index=True)
     REXCommitteeComments = db.Column(db.String(500), nullable=False)
 
     primary_employeelist = db.relationship('Employeelist', foreign_keys=[Mentor])
@@ -142,17 +342,18 @@ class RexCommitteeModel(db.Model):
     def __repr__(self): return f"{self.id} - {self.date_created}"    
 
 class ActionPlanModel(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id'), nullable=False) 
+    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id', ondelete='CASCADE'), nullable=False, index=True)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
-    AttendeesOfRootCause = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True)
+    AttendeesOfRootCause = db.Column(db.Integer, db.ForeignKey('employeelist.id'), nullable=True, index=True)
     Date = db.Column(db.DateTime , nullable=True)
-    FrequesncyOfIssue = db.Column(db.Integer, db.ForeignKey('frequencyofissuelist.id'), nullable=True)
-    EHSRisk = db.Column(db.Integer, db.ForeignKey('ehsrisklist.id'), nullable=True)
+    FrequesncyOfIssue = db.Column(db.Integer, db.ForeignKey('frequencyofissuelist.id'), nullable=True, index=True)
+    EHSRisk = db.Column(db.Integer, db.ForeignKey('ehsrisklist.id'), nullable=True, index=True)
     AddDocumentsLink = db.Column(db.String(500), nullable=True)
     RootCause = db.Column(db.String(500), nullable=True)
     CorrectiveAction = db.Column(db.String(500), nullable=True)
-    DocummentToUpdate = db.Column(db.Integer, db.ForeignKey('documenttoupdatelist.id'), nullable=True)
+    DocummentToUpdate = db.Column(db.Integer, db.ForeignKey('documenttoupdatelist.id'), nullable=True, index=True)
     Remarks = db.Column(db.String(500), nullable=True)
     AttachmentLink = db.Column(db.String(500), nullable=True)
     ReportingManagerConfirmation = db.Column(db.Boolean, nullable=False, default=False)
@@ -160,19 +361,237 @@ class ActionPlanModel(db.Model):
     def __repr__(self): return f"{self.id} - {self.date_created}"            
 
 class ReviewByCommitteeModel(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id'), nullable=False) 
+    parentid = db.Column(db.Integer, db.ForeignKey('returnonexperienceentrymodel.id', ondelete='CASCADE'), nullable=False, index=True)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
     Remarks = db.Column(db.String(500), nullable=False)
     def __repr__(self): return f"{self.id} - {self.date_created}"  
 
+# Closed and Rejected entries are moved here with their children by archive_entries(). The tables
+# copy the live columns (plus archived_at on the entry) and keep the ids, so links, search documents
+# and attachments still resolve; the listing, update page, search and export read both.
+ARCHIVE_STATUSES = ('Closed', 'Rejected')
+
+def archive_table(name, model, *extra):
+    columns = []
+    for column in model.__table__.columns:
+        # Children point at the archived entry; lookup keys are kept as they are
+        keys = [db.ForeignKey('rex_archive_entry.id', ondelete='CASCADE') if fk.target_fullname == 'returnonexperienceentrymodel.id'
+                else db.ForeignKey(fk.target_fullname) for fk in column.foreign_keys]
+        columns.append(db.Column(column.name, column.type, *keys, primary_key=column.primary_key,
+                                 nullable=column.nullable, index=column.index, autoincrement=False))
+    return db.Table(name, *columns, *extra)
+
+class ArchivedEntry(db.Model):
+    __table__ = archive_table('rex_archive_entry', Returnonexperienceentrymodel,
+                              db.Column('archived_at', db.DateTime, nullable=False, index=True),
+                              db.Index('ix_rex_archive_entry_date_created_id', 'date_created', 'id'),
+                              db.Index('ix_rex_archive_entry_status_date_created_id', 'status', 'date_created', 'id'))
+    # Same relationship names as the live entry, so templates, forms and the listing query take either
+    project = db.relationship('Projectlist')
+    region = db.relationship('Regionlist')
+    initiator = db.relationship('Employeelist')
+    on_topic_discipline = db.relationship('Disciplinelist', foreign_keys='ArchivedEntry.REXOnDiscipline_id')
+    initiating_discipline = db.relationship('Disciplinelist', foreign_keys='ArchivedEntry.REXInitiatingDiscipline_id')
+    rexcommitee = db.relationship('ArchivedCommittee', lazy=True, viewonly=True)
+    actionplan = db.relationship('ArchivedActionPlan', lazy=True, viewonly=True)
+    reviewByCommitteeModel = db.relationship('ArchivedReview', lazy=True, viewonly=True)
+    search_document = db.relationship('RexSearchDocument', primaryjoin='ArchivedEntry.id == foreign(RexSearchDocument.entry_id)',
+                                      uselist=False, lazy=True, cascade='all, delete-orphan', passive_deletes=True, overlaps='search_document')
+    def __repr__(self): return f"{self.id} - {self.date_created} (archived)"
+
+class ArchivedCommittee(db.Model):
+    __table__ = archive_table('rex_archive_committee', RexCommitteeModel)
+    def __repr__(self): return f"{self.id} - {self.date_created} (archived)"
+
+class ArchivedActionPlan(db.Model):
+    __table__ = archive_table('rex_archive_action_plan', ActionPlanModel)
+    def __repr__(self): return f"{self.id} - {self.date_created} (archived)"
+
+class ArchivedReview(db.Model):
+    __table__ = archive_table('rex_archive_review', ReviewByCommitteeModel)
+    def __repr__(self): return f"{self.id} - {self.date_created} (archived)"
+
+# Live model -> archive model, parent first
+ARCHIVE_MODELS = [(Returnonexperienceentrymodel, ArchivedEntry), (RexCommitteeModel, ArchivedCommittee),
+                  (ActionPlanModel, ArchivedActionPlan), (ReviewByCommitteeModel, ArchivedReview)]
+# (entry, committee, action plan, review) of the live tables, then of the archive
+ARCHIVE_MODEL_SETS = [tuple(pair[0] for pair in ARCHIVE_MODELS), tuple(pair[1] for pair in ARCHIVE_MODELS)]
+
+# Denormalized text of an entry and its committee/action plan, maintained by index_rex_entry().
+# MySQL searches it through a FULLTEXT index; SQLite through the rex_search_fts FTS5 table below.
+# entry_id is a live or an archived entry, so there is no foreign key; unlink_entries() removes it.
+SEARCH_COLUMNS = ['topic', 'description', 'impact', 'recommendation', 'committee_comments', 'root_cause', 'corrective_action']
+
+class RexSearchDocument(db.Model):
+    __tablename__ = 'rex_search_document'
+    entry_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    topic = db.Column(db.String(500), nullable=False, default='')
+    description = db.Column(db.String(500), nullable=False, default='')
+    impact = db.Column(db.String(500), nullable=False, default='')
+    recommendation = db.Column(db.String(500), nullable=False, default='')
+    committee_comments = db.Column(db.String(500), nullable=False, default='')
+    root_cause = db.Column(db.String(500), nullable=False, default='')
+    corrective_action = db.Column(db.String(500), nullable=False, default='')
+    __table_args__ = (
+        db.Index('ix_rex_search_fulltext', *SEARCH_COLUMNS, mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+    def __repr__(self): return f"<RexSearchDocument {self.entry_id}>"
+
+# External-content FTS5 table kept in sync with rex_search_document by triggers.
+SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS rex_search_fts USING fts5({', '.join(SEARCH_COLUMNS)}, content='rex_search_document', content_rowid='entry_id')",
+    f"CREATE TRIGGER IF NOT EXISTS rex_search_ai AFTER INSERT ON rex_search_document BEGIN "
+    f"INSERT INTO rex_search_fts(rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (new.entry_id, {', '.join('new.' + c for c in SEARCH_COLUMNS)}); END",
+    f"CREATE TRIGGER IF NOT EXISTS rex_search_ad AFTER DELETE ON rex_search_document BEGIN "
+    f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {', '.join(SEARCH_COLUMNS)}) VALUES ('delete', old.entry_id, {', '.join('old.' + c for c in SEARCH_COLUMNS)}); END",
+    f"CREATE TRIGGER IF NOT EXISTS rex_search_au AFTER UPDATE ON rex_search_document BEGIN "
+    f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {', '.join(SEARCH_COLUMNS)}) VALUES ('delete', old.entry_id, {', '.join('old.' + c for c in SEARCH_COLUMNS)}); "
+    f"INSERT INTO rex_search_fts(rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (new.entry_id, {', '.join('new.' + c for c in SEARCH_COLUMNS)}); END",
+]
+for _ddl in SQLITE_SEARCH_DDL:
+    event.listen(RexSearchDocument.__table__, 'after_create', DDL(_ddl).execute_if(dialect='sqlite'))
+event.listen(RexSearchDocument.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS rex_search_fts').execute_if(dialect='sqlite'))
+
+# Entry counts per status x region x discipline x creation month, kept current by the
+# after_flush hook in the workflow summary section. Dashboards read this instead of GROUP BY.
+class RexStatusSummary(db.Model):
+    __tablename__ = 'rex_status_summary'
+    status = db.Column(db.String(50), primary_key=True)
+    region_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    discipline_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    def __repr__(self): return f"<RexStatusSummary {self.status} {self.region_id} {self.discipline_id} {self.month} = {self.entry_count}>"
+
+# Append-only log of status changes, written in the same transaction as the change (see Status
+# transitions); from_status is NULL for the entry's creation. Rows outlive the entry's archiving, so
+# entry_id has no foreign key; unlink_entries() removes them when the entry is deleted or purged.
+# Region and discipline are copied from the entry at the time.
+class RexStatusTransition(db.Model):
+    __tablename__ = 'rex_status_transition'
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(db.Integer, nullable=False)
+    from_status = db.Column(db.String(50), nullable=True)
+    to_status = db.Column(db.String(50), nullable=False)
+    region_id = db.Column(db.Integer, nullable=False)
+    discipline_id = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, index=True)
+    changed_by = db.Column(db.String(255), nullable=True)
+    # Time spent in from_status (NULL when the log does not go back to when the entry entered it) and since creation
+    seconds_in_state = db.Column(db.Integer, nullable=True)
+    seconds_open = db.Column(db.Integer, nullable=False)
+    __table_args__ = (db.Index('ix_rex_status_transition_entry_id_id', 'entry_id', 'id'),)
+    def __repr__(self): return f"<RexStatusTransition {self.entry_id} {self.from_status} -> {self.to_status}>"
+
+# Transition counts per from x to status x region x discipline x month of the transition, and
+# time-in-state histograms (see DURATION_BUCKETS) over the same dimensions. Both are updated with
+# every logged transition, so cycle-time percentiles and send-back rates never read the log.
+class RexTransitionSummary(db.Model):
+    __tablename__ = 'rex_transition_summary'
+    from_status = db.Column(db.String(50), primary_key=True)
+    to_status = db.Column(db.String(50), primary_key=True)
+    region_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    discipline_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)
+    transition_count = db.Column(db.Integer, nullable=False, default=0)
+    def __repr__(self): return f"<RexTransitionSummary {self.from_status}->{self.to_status} {self.region_id} {self.discipline_id} {self.month} = {self.transition_count}>"
+
+class RexDurationHistogram(db.Model):
+    __tablename__ = 'rex_duration_histogram'
+    # The status the time was spent in, or 'cycle' for creation to Closed
+    metric = db.Column(db.String(50), primary_key=True)
+    region_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    discipline_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    sample_count = db.Column(db.Integer, nullable=False, default=0)
+    def __repr__(self): return f"<RexDurationHistogram {self.metric} {self.region_id} {self.discipline_id} {self.month} [{self.bucket}] = {self.sample_count}>"
+
+# Metadata for an uploaded file. The bytes live once per distinct content under
+# UPLOAD_FOLDER/blobs/<sha256[:2]>/<sha256[2:4]>/<sha256>, so re-uploads share a blob.
+# Like the search document, entry_id may name an archived entry; deleting the entry clears it (unlink_entries).
+class Attachment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    original_name = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    mime_type = db.Column(db.String(255), nullable=False)
+    uploaded_by = db.Column(db.String(255), nullable=True)
+    entry_id = db.Column(db.Integer, nullable=True)
+    entry = db.relationship('Returnonexperienceentrymodel', primaryjoin='foreign(Attachment.entry_id) == Returnonexperienceentrymodel.id',
+                            backref=db.backref('attachments', lazy=True, passive_deletes=True))
+    __table_args__ = (
+        db.Index('ix_attachment_date_created_id', 'date_created', 'id'),
+        db.Index('ix_attachment_entry_id_date_created', 'entry_id', 'date_created', 'id'),
+    )
+    def __repr__(self): return f'<Attachment {self.id} "{self.original_name}">'
+
+# One row per kind of data ('entries', 'lookups'); version advances in the same transaction as any
+# write to that kind. Conditional GET builds its ETags from these.
+class DataVersion(db.Model):
+    __tablename__ = 'data_version'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    def __repr__(self): return f'<DataVersion {self.name}={self.version}>'
+
+# Slow work queued by request handlers and run by the JobRunner threads of each gunicorn worker.
+# status goes queued -> running -> done | failed; a failed attempt is queued again with a later run_after.
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.String(255), nullable=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (db.Index('ix_job_status_run_after_id', 'status', 'run_after', 'id'),)
+    def __repr__(self): return f'<Job {self.id} {self.kind} {self.status}>'
+
 # --- FORMS ---
+class LookupSelectField(SelectField):
+    """A select over a lookup table that renders only its current value.
+
+    The browser fetches other options from /lookup/<lookup> as the user types (static/js/lookup-select.js),
+    and a submitted id is checked against the in-memory lookup index instead of a full choice list.
+    """
+    def __init__(self, label=None, validators=None, lookup=None, **kwargs):
+        super(LookupSelectField, self).__init__(label, validators, **kwargs)
+        self.lookup = lookup
+
+    def current_choices(self):
+        choices = [("", "--- Nothing selected ---")]
+        if self.data not in (None, ''):
+            choices.append((self.data, lookup_index(LOOKUP_IMPORT_MODELS[self.lookup]).names.get(parse_int_arg(self.data), self.data)))
+        return choices
+
+    def iter_choices(self):
+        return self._choices_generator(self.current_choices())
+
+    def pre_validate(self, form):
+        if self.data not in (None, '') and parse_int_arg(self.data) not in lookup_index(LOOKUP_IMPORT_MODELS[self.lookup]).names:
+            raise ValidationError(self.gettext('Not a valid choice.'))
+
+    def __call__(self, **kwargs):
+        kwargs.setdefault('data-lookup-url', url_for('lookup_search', name=self.lookup))
+        return super(LookupSelectField, self).__call__(**kwargs)
+
 class ReturnOFExperienceForm(FlaskForm):
-    ProjectNameAndNumber = SelectField('Project No. & Name',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[DataRequired()])
+    ProjectNameAndNumber = LookupSelectField('Project No. & Name', lookup='projects',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[DataRequired()])
     Region = SelectField('Region',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[DataRequired()])
     REXInitiatingDiscipline = SelectField('REX Initiating Discipline',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[DataRequired()])
     REXOnDiscipline = SelectField('REX On Discipline',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'} , validators=[DataRequired()])
-    REXInitiator = SelectField('REX Initiator',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'},  validators=[DataRequired()])
+    REXInitiator = LookupSelectField('REX Initiator', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'},  validators=[DataRequired()])
     REXOnTopic = StringField('REX On Topic',render_kw = {'class':'form-control'}, validators=[DataRequired()])
     REXDescription = TextAreaField('REX Description', validators=[DataRequired(), Length(min=1, max=500)], render_kw={"placeholder": "Provide a detailed","class":"custom-select"})
     Impact = TextAreaField('Impact', validators=[DataRequired(), Length(min=1, max=500)], render_kw={"placeholder": "Provide a detailed","class":"custom-select","style":"min-height: 80px;"})
@@ -195,12 +614,12 @@ class RequiredIfYes(object):
 class RexCommitteeModelForm(FlaskForm):
     IsitREXChoice = [("", "--- Nothing selected ---"), ('Yes', 'Yes'), ('No', 'No'), ('Required more details', 'Required more details')]
     IsfurtheranalysisrequiredChoice = [("", "--- Nothing selected ---"), ('Required', 'Required'), ('NotRequired', 'NotRequired')]
-    ReviewCommiteeMember = SelectField('Review Commitee Member',render_kw = {'class':'custom-select selectpicker cust-select' ,'id':'ReviewCommiteeMember','data-live-search':'true'}, validators=[DataRequired()])
+    ReviewCommiteeMember = LookupSelectField('Review Commitee Member', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select' ,'id':'ReviewCommiteeMember','data-live-search':'true'}, validators=[DataRequired()])
     IsitREX = SelectField('Is it REX?',choices=IsitREXChoice,render_kw = {'data-live-search':'true'}, validators=[DataRequired()])
     Isfurtheranalysisrequired = SelectField('Is further analysis required',choices=IsfurtheranalysisrequiredChoice,render_kw = {'class':'custom-select selectpicker cust-select','id':'Isfurtheranalysisrequired' ,'data-live-search':'true'}, validators=[Optional()])
-    Mentor = SelectField('Mentor',render_kw = {'class':'custom-select selectpicker cust-select','id':'Mentor', 'data-live-search':'true'} , validators=[Optional(),RequiredIfYes('IsitREX', message="Mentor is mandatory for REX projects.")])
-    ActionBy = SelectField('ActionBy',render_kw = {'class':'custom-select selectpicker cust-select','id':'ActionBy', 'data-live-search':'true'},  validators=[Optional()])
-    QMSSpoc = SelectField('QMS Spoc',render_kw = {'class':'custom-select selectpicker cust-select','id':'QMSSpoc', 'data-live-search':'true'},  validators=[Optional()])
+    Mentor = LookupSelectField('Mentor', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select','id':'Mentor', 'data-live-search':'true'} , validators=[Optional(),RequiredIfYes('IsitREX', message="Mentor is mandatory for REX projects.")])
+    ActionBy = LookupSelectField('ActionBy', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select','id':'ActionBy', 'data-live-search':'true'},  validators=[Optional()])
+    QMSSpoc = LookupSelectField('QMS Spoc', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select','id':'QMSSpoc', 'data-live-search':'true'},  validators=[Optional()])
     Technology = SelectField('Technology',render_kw = {'class':'custom-select selectpicker cust-select','id':'Technology', 'data-live-search':'true'},  validators=[Optional()])
     REXCommitteeComments = TextAreaField('REX Committee Comments', validators=[DataRequired(), Length(min=1, max=500)], render_kw={"placeholder": "Provide a detailed","class":"custom-select",'id':'REXCommitteeComments'})
     submit = SubmitField('Submit',render_kw = {'class':'float-end'}) 
@@ -227,7 +646,7 @@ class RexCommitteeModelForm(FlaskForm):
         return is_valid
 
 class ActionPlanForm(FlaskForm):
-    AttendeesOfRootCause = SelectField('Attendees Of RootCause',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[Optional()])
+    AttendeesOfRootCause = LookupSelectField('Attendees Of RootCause', lookup='employees',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[Optional()])
     Date = DateField('Select a Date',render_kw = {'class':'form-control'}, format='%Y-%m-%d', validators=[Optional()])
     FrequesncyOfIssue = SelectField('Frequesncy Of Issue',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'}, validators=[Optional()])
     EHSRisk = SelectField('EHS Risk',render_kw = {'class':'custom-select selectpicker cust-select', 'data-live-search':'true'} , validators=[Optional()])
@@ -266,29 +685,730 @@ class ReviewByCommitteeForm(FlaskForm):
     submit_save = SubmitField('Submit',render_kw = {'class':'float-end'}) 
     submit_sendback = SubmitField('Send Back',render_kw = {'class':'float-end'}) 
 
+# --- Lookup choice cache ---
+# One cache per gunicorn worker, shared by its threads. Lists are rebuilt lazily after a TTL
+# or as soon as SQLAlchemy flushes/commits a write to the lookup model.
+LOOKUP_MODELS = [Projectlist, Regionlist, Employeelist, Disciplinelist, Technologylist, Frequencyofissuelist, Ehsrisklist, Documenttoupdatelist]
+
+class ChoiceCache(object):
+    def __init__(self, ttl=300, maxsize=32):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def get(self, key, build):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        # Only one thread rebuilds a given list; the others wait and reuse its result.
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    return entry[1]
+            value = build()
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None: self._entries.clear()
+            else: self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl)
+
+choice_cache = ChoiceCache(ttl=int(os.getenv("CHOICE_CACHE_TTL", 300)), maxsize=int(os.getenv("CHOICE_CACHE_MAXSIZE", 32)))
+
+def _invalidate_lookup(mapper, connection, target):
+    choice_cache.invalidate(type(target).__name__)
+    session = object_session(target)
+    if session is not None: session.info.setdefault('dirty_lookups', set()).add(type(target).__name__)
+
+for _lookup_model in LOOKUP_MODELS:
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_lookup_model, _event_name, _invalidate_lookup)
+
+# Drop again on commit so a list rebuilt by another thread between flush and commit is not kept.
+@event.listens_for(Session, 'after_commit')
+def _invalidate_lookups_on_commit(session):
+    for name in session.info.pop('dirty_lookups', ()):
+        choice_cache.invalidate(name)
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_lookups_on_rollback(session):
+    session.info.pop('dirty_lookups', None)
+
 # Helper functions for choices
+class ChoiceList(tuple):
+    # Cached (id, name) pairs; the digest lets fragment cache keys notice a renamed or added lookup.
+    def __new__(cls, items):
+        self = super(ChoiceList, cls).__new__(cls, items)
+        self.digest = hashlib.sha1(repr(tuple(self)).encode('utf-8')).hexdigest()[:16]
+        return self
+
+def load_choices(model):
+    with primary_reads():
+        return ChoiceList((item.id, item.name) for item in db.session.query(model.id, model.name).order_by(model.name).all())
+
+def choice_digest(model):
+    return choice_cache.get(model.__name__, lambda: load_choices(model)).digest
+
 def fetch_dynamic_choices(model):
     try:
-        return [("", "--- Nothing selected ---")] + [(item.id, item.name) for item in model.query.order_by(model.name).all()]
+        return [("", "--- Nothing selected ---")] + list(choice_cache.get(model.__name__, lambda: load_choices(model)))
     except Exception:
         # Prevents crash during database creation or if table empty
         return [("", "--- Nothing selected ---")]
 
+# --- Lookup typeahead ---
+# Large lookups (employees, projects) are searched through /lookup/<name> instead of being rendered
+# into every select. Each index is built from the cached choice list and rebuilt whenever that list's
+# digest changes, i.e. after a write to the table or when another worker's change outlives the TTL.
+LOOKUP_SEARCH_LIMIT = 20
+LOOKUP_SEARCH_MAX = 100
+
+class LookupIndex(object):
+    """Sorted, case-insensitive prefix index: every word of a name is a key, so "sha" finds "Priya Sharma"."""
+    def __init__(self, choices):
+        self.digest = choices.digest
+        self.names = dict(choices)
+        entries = sorted((name.casefold()[match.start():], id) for id, name in choices
+                         for match in re.finditer(r'\w+', name.casefold()))
+        self.keys = [key for key, _ in entries]
+        self.ids = [id for _, id in entries]
+
+    def search(self, q, limit=LOOKUP_SEARCH_LIMIT):
+        # Returns up to limit (id, name) pairs and whether there were more.
+        # Keys start at a word, so leading punctuation such as the "(" of "(E10000)" is dropped
+        prefix = re.sub(r'^\W+', '', ' '.join(q.split()).casefold())
+        if not prefix:
+            ids = list(self.names)[:limit + 1]
+        else:
+            ids, seen = [], set()
+            position = bisect.bisect_left(self.keys, prefix)
+            while position < len(self.keys) and self.keys[position].startswith(prefix) and len(ids) <= limit:
+                if self.ids[position] not in seen:
+                    seen.add(self.ids[position])
+                    ids.append(self.ids[position])
+                position += 1
+        matches = [(id, self.names[id]) for id in ids[:limit]]
+        # Names that start with the query first, then alphabetical
+        matches.sort(key=lambda match: (not match[1].casefold().startswith(prefix), match[1].casefold()))
+        return matches, len(ids) > limit
+
+lookup_indexes = {}
+
+def lookup_index(model):
+    choices = choice_cache.get(model.__name__, lambda: load_choices(model))
+    index = lookup_indexes.get(model.__name__)
+    if index is None or index.digest != choices.digest:
+        index = lookup_indexes[model.__name__] = LookupIndex(choices)
+    return index
+
 def get_projectname_choices(): return fetch_dynamic_choices(Projectlist)
 def get_region_choices(): return fetch_dynamic_choices(Regionlist)
-def get_rexinitiator_choices(): return fetch_dynamic_choices(Employeelist)
 def get_rexinitiatingdiscipline_choices(): return fetch_dynamic_choices(Disciplinelist)
 def get_rexondiscipline_choices(): return fetch_dynamic_choices(Disciplinelist)
-def get_reviewcommiteemember_choices(): return fetch_dynamic_choices(Employeelist)
-def get_mentor_choices(): return fetch_dynamic_choices(Employeelist)
-def get_actionby_choices(): return fetch_dynamic_choices(Employeelist)
-def get_qmsspoc_choices(): return fetch_dynamic_choices(Employeelist)
 def get_technology_choices(): return fetch_dynamic_choices(Technologylist)
-def get_attendeesofrootcause_choices(): return fetch_dynamic_choices(Employeelist)
 def get_frequencyofissue_choices(): return fetch_dynamic_choices(Frequencyofissuelist)
 def get_ehsrisk_choices(): return fetch_dynamic_choices(Ehsrisklist)
 def get_documenttoupdate_choices(): return fetch_dynamic_choices(Documenttoupdatelist)
 
+# --- Lookup bulk import ---
+LOOKUP_IMPORT_MODELS = {
+    'projects': Projectlist, 'regions': Regionlist, 'employees': Employeelist, 'disciplines': Disciplinelist,
+    'technologies': Technologylist, 'frequencies': Frequencyofissuelist, 'ehs-risks': Ehsrisklist,
+    'documents': Documenttoupdatelist,
+}
+IMPORT_BATCH_SIZE = 1000
+
+def lookup_insert_statement(model):
+    # Tables with a unique name let the database absorb races with concurrent writers.
+    table = model.__table__
+    if not table.c.name.unique: return sa_insert(table)
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update(name=stmt.inserted.name)
+    if dialect == 'sqlite':
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=['name'])
+    return sa_insert(table)
+
+def import_lookup_rows(model, rows, batch_size=IMPORT_BATCH_SIZE):
+    # Rows are dicts with "name" and an optional "id". A known id with a new name is a rename,
+    # a name that already exists (case-insensitively, as MySQL compares it) is skipped.
+    table = model.__table__
+    by_name = {name.strip().casefold(): id for id, name in db.session.query(model.id, model.name)}
+    by_id = {id: name for name, id in by_name.items()}
+    counts = dict(inserted=0, updated=0, skipped=0)
+    inserts, updates = [], []
+    rename = sa_update(table).where(table.c.id == bindparam('b_id')).values(name=bindparam('b_name'))
+
+    def flush():
+        if inserts: db.session.execute(lookup_insert_statement(model), inserts)
+        if updates: db.session.execute(rename, updates)
+        if inserts or updates: advance_data_versions(db.session.connection(), {'lookups'})
+        db.session.commit()
+        counts['inserted'] += len(inserts); counts['updated'] += len(updates)
+        inserts.clear(); updates.clear()
+
+    for row in rows:
+        name = (row.get('name') or '').strip()
+        key = name.casefold()
+        row_id = parse_int_arg(row.get('id'))
+        if not name or len(name) > table.c.name.type.length or key in by_name:
+            counts['skipped'] += 1
+            continue
+        if row_id is not None and row_id in by_id:
+            by_name.pop(by_id[row_id], None)
+            by_id[row_id] = key
+            updates.append(dict(b_id=row_id, b_name=name))
+        else:
+            inserts.append(dict(name=name))
+        by_name[key] = row_id
+        if len(inserts) + len(updates) >= batch_size: flush()
+    flush()
+    choice_cache.invalidate(model.__name__)
+    return counts
+
+def import_lookup_csv(model, text_stream, batch_size=IMPORT_BATCH_SIZE):
+    reader = csv.DictReader(text_stream)
+    if not reader.fieldnames or 'name' not in [f.strip().lower() for f in reader.fieldnames]:
+        raise ValueError('CSV must have a "name" header column')
+    rows = ({(k or '').strip().lower(): v for k, v in row.items()} for row in reader)
+    return import_lookup_rows(model, rows, batch_size)
+
+# --- Full-text search ---
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_TERMS = 12
+SNIPPET_START, SNIPPET_END = '\x02', '\x03'
+
+def index_rex_entry(entry):
+    # Called by every write route before commit, so the document changes in the same transaction.
+    committee = first_child(entry.rexcommitee)
+    plan = first_child(entry.actionplan)
+    doc = entry.search_document or RexSearchDocument()
+    doc.topic = entry.REXOnTopic or ''
+    doc.description = entry.REXDescription or ''
+    doc.impact = entry.Impact or ''
+    doc.recommendation = entry.Recommendation or ''
+    doc.committee_comments = (committee.REXCommitteeComments if committee else None) or ''
+    doc.root_cause = (plan.RootCause if plan else None) or ''
+    doc.corrective_action = (plan.CorrectiveAction if plan else None) or ''
+    entry.search_document = doc
+    return doc
+
+def search_terms(q):
+    return re.findall(r'\w+', (q or '').lower())[:SEARCH_MAX_TERMS]
+
+def make_snippet(texts, terms, width=160):
+    # MySQL has no snippet(); mark the first matching window of the document in Python instead.
+    content = ' … '.join(t for t in texts if t)
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(t) for t in terms) + r')\w*', re.IGNORECASE)
+    match = pattern.search(content)
+    start = max(0, match.start() - width // 3) if match else 0
+    window = content[start:start + width]
+    window = pattern.sub(lambda m: SNIPPET_START + m.group(0) + SNIPPET_END, window)
+    return ('…' if start else '') + window + ('…' if start + width < len(content) else '')
+
+def render_snippet(snippet):
+    return Markup(str(escape(snippet)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>'))
+
+def search_rex_entries(q, page=1, per_page=SEARCH_PAGE_SIZE):
+    terms = search_terms(q)
+    if not terms: return [], False
+    params = dict(limit=per_page + 1, offset=(page - 1) * per_page)
+    if db.session.get_bind().dialect.name == 'sqlite':
+        # bm25 weights follow SEARCH_COLUMNS: topic and recommendation count most.
+        rows = db.session.execute(text(
+            "SELECT rowid AS entry_id, bm25(rex_search_fts, 4.0, 2.0, 1.0, 2.0, 1.0, 1.0, 1.0) AS score, "
+            "snippet(rex_search_fts, -1, :start, :end, '…', 24) AS snippet "
+            "FROM rex_search_fts WHERE rex_search_fts MATCH :match ORDER BY score LIMIT :limit OFFSET :offset"),
+            dict(params, match=' '.join(f'"{t}"*' for t in terms), start=SNIPPET_START, end=SNIPPET_END)).all()
+        hits = [(row.entry_id, row.snippet) for row in rows]
+    else:
+        columns = ', '.join(SEARCH_COLUMNS)
+        rows = db.session.execute(text(
+            f"SELECT entry_id, {columns}, MATCH({columns}) AGAINST (:match IN BOOLEAN MODE) AS score "
+            f"FROM rex_search_document WHERE MATCH({columns}) AGAINST (:match IN BOOLEAN MODE) "
+            f"ORDER BY score DESC, entry_id DESC LIMIT :limit OFFSET :offset"),
+            dict(params, match=' '.join(f'+{t}*' for t in terms))).all()
+        hits = [(row.entry_id, make_snippet([getattr(row, c) for c in SEARCH_COLUMNS], terms)) for row in rows]
+    has_next = len(hits) > per_page
+    hits = hits[:per_page]
+    entries = {}
+    for model in (Returnonexperienceentrymodel, ArchivedEntry):
+        missing = [id for id, _ in hits if id not in entries]
+        if missing: entries.update({e.id: e for e in rex_listing_query({}, model).filter(model.id.in_(missing))})
+    return [dict(entry=entries[id], snippet=render_snippet(snippet)) for id, snippet in hits if id in entries], has_next
+
+# --- Workflow summary ---
+SUMMARY_DIMENSIONS = ['status', 'region', 'discipline', 'month']
+
+def summary_key(status, region_id, discipline_id, created):
+    if status is None or region_id in (None, '') or discipline_id in (None, '') or created is None: return None
+    return (status, int(region_id), int(discipline_id), date(created.year, created.month, 1))
+
+def entry_summary_key(entry, committed=False):
+    # committed=True reads the values as they were before this flush (attribute history).
+    def value(attr):
+        history = sa_inspect(entry).attrs[attr].history
+        if committed and history.deleted: return history.deleted[0]
+        return getattr(entry, attr)
+    return summary_key(value('status'), value('Region_id'), value('REXOnDiscipline_id'), value('date_created'))
+
+def increment_upsert_statement(connection, table, column):
+    # INSERT of counter rows that adds to the existing count when the key is already there
+    if connection.dialect.name == 'mysql':
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column]})
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(index_elements=[c.name for c in table.primary_key],
+                                      set_={column: table.c[column] + stmt.excluded[column]})
+
+def summary_upsert_statement(connection):
+    return increment_upsert_statement(connection, RexStatusSummary.__table__, 'entry_count')
+
+def apply_summary_deltas(connection, deltas):
+    # deltas: {summary_key: +n/-n}. Bulk Core writes that bypass the ORM must call this themselves.
+    rows = [dict(status=k[0], region_id=k[1], discipline_id=k[2], month=k[3], entry_count=n) for k, n in deltas.items() if k and n]
+    if rows: connection.execute(summary_upsert_statement(connection), rows)
+
+@event.listens_for(Session, 'after_flush')
+def _update_status_summary(session, flush_context):
+    deltas = Counter()
+    for entry in session.new:
+        if isinstance(entry, Returnonexperienceentrymodel): deltas[entry_summary_key(entry)] += 1
+    for entry in session.deleted:
+        if isinstance(entry, Returnonexperienceentrymodel): deltas[entry_summary_key(entry, committed=True)] -= 1
+    for entry in session.dirty:
+        if isinstance(entry, Returnonexperienceentrymodel) and entry not in session.deleted:
+            old, new = entry_summary_key(entry, committed=True), entry_summary_key(entry)
+            if old != new:
+                deltas[old] -= 1
+                deltas[new] += 1
+    apply_summary_deltas(session.connection(), deltas)
+
+# --- Status transitions ---
+# Every status an entry takes is logged to rex_status_transition in the transaction that sets it, with
+# the time spent in the previous status. The same write adds to rex_transition_summary and
+# rex_duration_histogram, which the cycle-time dashboard reads. The ORM hook below covers the routes;
+# bulk Core writes must call record_transitions themselves, like apply_summary_deltas.
+INITIAL_STATUS = 'RexCommitee'
+SEND_BACK = ('ReviewByCommittee', 'ActinPlan')
+# Upper bounds in seconds, four per doubling from one minute to about 4 years, so a percentile read
+# from them is off by less than one bucket (19%); only bucket 0 (under a minute) is interpolated
+# linearly. Changing them means re-bucketing rex_duration_histogram in a migration.
+DURATION_BUCKETS = tuple(int(60 * 2 ** (i / 4)) for i in range(85))
+CYCLE_TIME_WINDOW_MONTHS = 12
+CYCLE_TIME_PERCENTILES = (50, 75, 90, 95)
+
+def duration_bucket(seconds): return bisect.bisect_left(DURATION_BUCKETS, seconds)
+
+def transition_event(entry, from_status, to_status, changed_at, changed_by=None):
+    return dict(entry_id=entry.id, from_status=from_status, to_status=to_status, region_id=entry.Region_id,
+                discipline_id=entry.REXOnDiscipline_id, created=entry.date_created, changed_at=changed_at, changed_by=changed_by)
+
+def transition_stats(rows, counts=None, samples=None):
+    # Summary and histogram deltas for logged transitions (dicts or rows with the log's columns)
+    counts, samples = Counter() if counts is None else counts, Counter() if samples is None else samples
+    for row in rows:
+        month = date(row['changed_at'].year, row['changed_at'].month, 1)
+        dimensions = (row['region_id'], row['discipline_id'], month)
+        if row['from_status'] is None: continue
+        counts[(row['from_status'], row['to_status']) + dimensions] += 1
+        if row['seconds_in_state'] is not None:
+            samples[(row['from_status'],) + dimensions + (duration_bucket(row['seconds_in_state']),)] += 1
+        if row['to_status'] == 'Closed':
+            samples[('cycle',) + dimensions + (duration_bucket(row['seconds_open']),)] += 1
+    return counts, samples
+
+def apply_transition_stats(connection, counts, samples):
+    rows = [dict(from_status=k[0], to_status=k[1], region_id=k[2], discipline_id=k[3], month=k[4], transition_count=n)
+            for k, n in counts.items() if n]
+    if rows: connection.execute(increment_upsert_statement(connection, RexTransitionSummary.__table__, 'transition_count'), rows)
+    rows = [dict(metric=k[0], region_id=k[1], discipline_id=k[2], month=k[3], bucket=k[4], sample_count=n)
+            for k, n in samples.items() if n]
+    if rows: connection.execute(increment_upsert_statement(connection, RexDurationHistogram.__table__, 'sample_count'), rows)
+
+def entered_statuses(connection, events):
+    # {entry_id: (status, since)} for the entries whose first event here leaves a status: their last logged
+    # event, or creation for an entry still at its first status that the log does not reach back to.
+    log = RexStatusTransition.__table__
+    first = {}
+    for change in events: first.setdefault(change['entry_id'], change)
+    pending = {id: change for id, change in first.items() if change['from_status'] is not None}
+    if not pending: return {}
+    latest = (select(func.max(log.c.id).label('id')).where(log.c.entry_id.in_(pending)).group_by(log.c.entry_id)).subquery()
+    rows = connection.execute(select(log.c.entry_id, log.c.to_status, log.c.changed_at).join(latest, log.c.id == latest.c.id))
+    entered = {row.entry_id: (row.to_status, row.changed_at) for row in rows}
+    for id, change in pending.items():
+        if id not in entered and change['from_status'] == INITIAL_STATUS: entered[id] = (INITIAL_STATUS, change['created'])
+    return entered
+
+def record_transitions(connection, events):
+    # events: transition_event() dicts in the order they happened, several per entry allowed
+    if not events: return
+    entered = entered_statuses(connection, events)
+    rows = []
+    for change in events:
+        status, since = entered.get(change['entry_id'], (None, None))
+        in_state = change['changed_at'] - since if since and status == change['from_status'] else None
+        rows.append(dict(entry_id=change['entry_id'], from_status=change['from_status'], to_status=change['to_status'],
+                         region_id=int(change['region_id']), discipline_id=int(change['discipline_id']),
+                         changed_at=change['changed_at'], changed_by=change['changed_by'],
+                         seconds_in_state=max(int(in_state.total_seconds()), 0) if in_state is not None else None,
+                         seconds_open=max(int((change['changed_at'] - change['created']).total_seconds()), 0)))
+        entered[change['entry_id']] = (change['to_status'], change['changed_at'])
+    connection.execute(sa_insert(RexStatusTransition.__table__), rows)
+    apply_transition_stats(connection, *transition_stats(rows))
+
+@event.listens_for(Session, 'after_flush')
+def _log_status_transitions(session, flush_context):
+    model = Returnonexperienceentrymodel
+    now = datetime.utcnow()
+    changed_by = get_current_user_email() if has_request_context() else None
+    events = [transition_event(entry, None, entry.status, now, changed_by) for entry in session.new if isinstance(entry, model)]
+    for entry in session.dirty:
+        if isinstance(entry, model) and entry not in session.deleted:
+            history = sa_inspect(entry).attrs.status.history
+            if history.deleted and history.deleted[0] != entry.status:
+                events.append(transition_event(entry, history.deleted[0], entry.status, now, changed_by))
+    record_transitions(session.connection(), events)
+
+def recompute_transition_stats(batch_size=5000):
+    counts, samples = Counter(), Counter()
+    log = RexStatusTransition
+    stmt = select(log.from_status, log.to_status, log.region_id, log.discipline_id, log.changed_at, log.seconds_in_state, log.seconds_open)
+    for rows in db.session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+        transition_stats((row._mapping for row in rows), counts, samples)
+    return counts, samples
+
+def bucket_percentile(buckets, total, pct):
+    # buckets: sorted (index, count). Interpolates geometrically inside the bucket the rank falls in.
+    rank, running = pct / 100 * total, 0
+    for index, count in buckets:
+        if running + count >= rank:
+            if index >= len(DURATION_BUCKETS): return DURATION_BUCKETS[-1]
+            upper = DURATION_BUCKETS[index]
+            lower = DURATION_BUCKETS[index - 1] if index else 0
+            fraction = (rank - running) / count
+            return lower * (upper / lower) ** fraction if lower else upper * fraction
+        running += count
+    return None
+
+def read_cycle_times(group_by, filters, since):
+    dimensions = {'region': Regionlist.name, 'discipline': Disciplinelist.name}
+    def windowed(table, *columns, where=()):
+        stmt = (select(*[dimensions[d].label(d) for d in group_by], *columns)
+                .select_from(table)
+                .join(Regionlist, Regionlist.id == table.region_id)
+                .join(Disciplinelist, Disciplinelist.id == table.discipline_id)
+                .where(table.month >= since, *where))
+        if filters.get('region'): stmt = stmt.where(table.region_id == filters['region'])
+        if filters.get('discipline'): stmt = stmt.where(table.discipline_id == filters['discipline'])
+        if filters.get('date_to'): stmt = stmt.where(table.month <= filters['date_to'].date())
+        return stmt.group_by(*[dimensions[d] for d in group_by], *columns[:-1])
+    histogram, summary = RexDurationHistogram, RexTransitionSummary
+    groups = {}
+    def group(row): return groups.setdefault(tuple(row[d] for d in group_by), dict(buckets={}, reviews=0, sent_back=0))
+    for row in db.session.execute(windowed(histogram, histogram.metric, histogram.bucket, func.sum(histogram.sample_count).label('n'))
+                                  .order_by(histogram.bucket)):
+        group(row._mapping)['buckets'].setdefault(row.metric, []).append((row.bucket, int(row.n)))
+    for row in db.session.execute(windowed(summary, summary.to_status, func.sum(summary.transition_count).label('n'),
+                                           where=[summary.from_status == SEND_BACK[0]])):
+        stats = group(row._mapping)
+        stats['reviews'] += int(row.n)
+        if row.to_status == SEND_BACK[1]: stats['sent_back'] += int(row.n)
+    results = []
+    for key, stats in sorted(groups.items()):
+        metrics = {}
+        for metric, buckets in sorted(stats['buckets'].items()):
+            total = sum(n for _, n in buckets)
+            if not total: continue
+            metrics[metric] = dict(count=total, **{f'p{pct}': round(bucket_percentile(buckets, total, pct) / 3600, 1)
+                                                   for pct in CYCLE_TIME_PERCENTILES})
+        results.append(dict(zip(group_by, key), cycle=metrics.pop('cycle', None), time_in_state=metrics,
+                            reviews=stats['reviews'], sent_back=stats['sent_back'],
+                            send_back_rate=round(stats['sent_back'] / stats['reviews'], 4) if stats['reviews'] else None))
+    return results
+
+# --- Entry versioning ---
+# A flush that adds, changes or deletes an entry's committee/action plan/review rows, or changes the
+# entry itself, advances the entry's version. The increment runs in SQL so two concurrent writers
+# can never produce the same version. Core-level bulk writes bypass this and must bump it themselves.
+ENTRY_CHILD_MODELS = (RexCommitteeModel, ActionPlanModel, ReviewByCommitteeModel)
+
+@event.listens_for(Session, 'before_flush')
+def _bump_entry_versions(session, flush_context, instances):
+    model = Returnonexperienceentrymodel
+    touched = {}
+    with session.no_autoflush:
+        changed = [obj for obj in session.dirty if session.is_modified(obj)]
+        for obj in list(session.new) + list(session.deleted) + changed:
+            if isinstance(obj, ENTRY_CHILD_MODELS):
+                # A child removed from its entry's collection has already lost the backref
+                obj = obj.returnonexperienceentrymodel or (session.get(model, obj.parentid) if obj.parentid else None)
+            if isinstance(obj, model) and obj not in session.new and obj not in session.deleted:
+                touched[id(obj)] = obj
+    for entry in touched.values():
+        entry.version = model.version + 1
+        entry.updated_at = datetime.utcnow()
+
+# --- Conditional GET ---
+# The listing's ETag comes from the 'entries' and 'lookups' data versions, the update page's from the
+# entry's own version plus 'lookups'. Both include the user (the pages show it) and the session's CSRF
+# token. A matching If-None-Match gets a 304 from one primary-key read, before the view queries or renders.
+# Every entry write touches the same data_version row; workflow writes are rare enough for that.
+def data_version_upsert_statement(connection):
+    table = DataVersion.__table__
+    if connection.dialect.name == 'mysql':
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update(version=table.c.version + 1, updated_at=stmt.inserted.updated_at)
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(index_elements=['name'], set_=dict(version=table.c.version + 1, updated_at=stmt.excluded.updated_at))
+
+def advance_data_versions(connection, kinds):
+    # Bulk Core writes that bypass the ORM must call this themselves, like apply_summary_deltas.
+    if kinds:
+        now = datetime.utcnow()
+        connection.execute(data_version_upsert_statement(connection), [dict(name=kind, version=1, updated_at=now) for kind in sorted(kinds)])
+
+@event.listens_for(Session, 'after_flush')
+def _advance_data_versions(session, flush_context):
+    kinds = set()
+    changed = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in list(session.new) + list(session.deleted) + changed:
+        if isinstance(obj, (Returnonexperienceentrymodel,) + ENTRY_CHILD_MODELS): kinds.add('entries')
+        elif isinstance(obj, tuple(LOOKUP_MODELS)): kinds.add('lookups')
+    advance_data_versions(session.connection(), kinds)
+
+def read_data_versions():
+    rows = db.session.execute(select(DataVersion.name, DataVersion.version, DataVersion.updated_at)).all()
+    return {row.name: (row.version, row.updated_at) for row in rows}
+
+def page_etag(*parts):
+    # The CSRF token embedded in forms expires, so pages with forms stop matching after half its lifetime.
+    limit = app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    csrf_window = int(time.time() // (limit / 2)) if limit else 0
+    identity = (get_current_user_email(), flask_session.get('csrf_token'), csrf_window)
+    return hashlib.sha1(repr(parts + identity).encode('utf-8')).hexdigest()
+
+def listing_validators(**view_args):
+    versions = read_data_versions()
+    entries, lookups = versions.get('entries', (0, None)), versions.get('lookups', (0, None))
+    modified = max((stamp for _, stamp in (entries, lookups) if stamp), default=None)
+    return page_etag('listing', entries[0], lookups[0], request.query_string), modified
+
+def entry_validators(id, **view_args):
+    for model in (Returnonexperienceentrymodel, ArchivedEntry):
+        row = db.session.execute(select(model.version, model.updated_at).where(model.id == id)).first()
+        if row is not None: break
+    else:
+        return None, None  # let the view 404
+    lookups = read_data_versions().get('lookups', (0, None))
+    modified = max((stamp for stamp in (row.updated_at, lookups[1]) if stamp), default=None)
+    return page_etag('entry', id, row.version, lookups[0]), modified
+
+def conditional(validators):
+    """Answer GETs whose validators still match with 304, skipping the view entirely."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pending flash messages are shown by the next render, so that render must happen.
+            if request.method != 'GET' or flask_session.get('_flashes'): return view(*args, **kwargs)
+            etag, modified = validators(**kwargs)
+            if etag is None: return view(*args, **kwargs)
+            if request.if_none_match:
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                fresh = bool(modified and request.if_modified_since and modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since)
+            response = Response(status=304) if fresh else app.make_response(view(*args, **kwargs))
+            response.set_etag(etag, weak=True)
+            if modified: response.last_modified = modified.replace(tzinfo=timezone.utc)
+            # Per-user pages: browsers may keep them but must revalidate, shared caches must not store them
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+def recompute_status_summary(batch_size=5000):
+    # Archived entries keep their status and still count
+    counts = Counter()
+    for model in (Returnonexperienceentrymodel, ArchivedEntry):
+        stmt = select(model.status, model.Region_id, model.REXOnDiscipline_id, model.date_created)
+        for rows in db.session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+            for row in rows: counts[summary_key(*row)] += 1
+    counts.pop(None, None)
+    return counts
+
+def read_status_summary(group_by, filters):
+    table = RexStatusSummary
+    dimensions = {'status': table.status, 'region': Regionlist.name, 'discipline': Disciplinelist.name, 'month': table.month}
+    stmt = (select(*[dimensions[d].label(d) for d in group_by], func.sum(table.entry_count).label('count'))
+            .select_from(table)
+            .join(Regionlist, Regionlist.id == table.region_id)
+            .join(Disciplinelist, Disciplinelist.id == table.discipline_id)
+            .where(table.entry_count != 0))
+    if filters.get('status'): stmt = stmt.where(table.status == filters['status'])
+    if filters.get('region'): stmt = stmt.where(table.region_id == filters['region'])
+    if filters.get('discipline'): stmt = stmt.where(table.discipline_id == filters['discipline'])
+    if filters.get('date_from'): stmt = stmt.where(table.month >= date(filters['date_from'].year, filters['date_from'].month, 1))
+    if filters.get('date_to'): stmt = stmt.where(table.month <= filters['date_to'].date())
+    if group_by: stmt = stmt.group_by(*[dimensions[d] for d in group_by]).order_by(*[dimensions[d] for d in group_by])
+    return [dict(row._mapping, month=row.month.isoformat()) if 'month' in group_by else dict(row._mapping)
+            for row in db.session.execute(stmt)]
+
+# --- Read replica ---
+# With DATABASE_REPLICA_URL set, GET/HEAD requests to views decorated with @replica_reads read from
+# the replica; every other request, and any write, uses the primary. Those reads still go to the
+# primary when they fill a process-wide cache (primary_reads), for REPLICA_STICKY_SECONDS after the
+# user's last write (so the redirect after a save shows it), while the replica lags by more than
+# REPLICA_MAX_LAG_SECONDS, and for REPLICA_RETRY_SECONDS after a replica error. A view that fails on
+# the replica is run again on the primary.
+# Lag is read from data_version on both sides every REPLICA_LAG_CHECK_SECONDS: the 'heartbeat' row,
+# advanced by each JobRunner, measures it directly; any other row the replica has not caught up with
+# shows at least the time since that write.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 15))  # keep above REPLICA_MAX_LAG_SECONDS
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 10))
+REPLICA_LAG_CHECK_SECONDS = 5
+REPLICA_RETRY_SECONDS = 30
+REPLICA_HEARTBEAT_SECONDS = 5
+
+def read_versions(engine):
+    with engine.connect() as connection:
+        return {row.name: (row.version, row.updated_at)
+                for row in connection.execute(select(DataVersion.name, DataVersion.version, DataVersion.updated_at))}
+
+def measure_replica_lag():
+    primary = read_versions(db.engine)
+    try:
+        replica = read_versions(db.engines['replica'])
+    except sa_exc.DBAPIError:
+        return None
+    now, lag = datetime.utcnow(), 0.0
+    for name, (version, stamp) in primary.items():
+        seen, seen_stamp = replica.get(name, (0, None))
+        if seen >= version or stamp is None: continue
+        behind = stamp - seen_stamp if name == 'heartbeat' and seen_stamp else now - stamp
+        lag = max(lag, behind.total_seconds())
+    return lag
+
+def write_replica_heartbeat():
+    with db.engine.begin() as connection: advance_data_versions(connection, {'heartbeat'})
+
+class ReplicaMonitor(object):
+    # Per-process routing counters: reads served by the replica, and by the primary for each reason.
+    COUNTERS = ('replica', 'sticky', 'lagging', 'unavailable', 'error')
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lag = None
+        self.checked = self.down_until = 0.0
+        self._checking = False
+        self._lock = threading.Lock()
+
+    def incr(self, name):
+        with self._lock: self.counts[name] += 1
+
+    def mark_down(self):
+        with self._lock: self.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+
+    def refresh(self):
+        # One request thread at a time re-measures; the rest use the last reading.
+        now = time.monotonic()
+        with self._lock:
+            if self._checking or now - self.checked < REPLICA_LAG_CHECK_SECONDS: return
+            self._checking = True
+        try:
+            lag = measure_replica_lag()
+            if lag is None: self.mark_down()
+            with self._lock: self.lag = lag
+        except Exception as e:
+            app.logger.warning(json.dumps(dict(event='replica_lag_check_failed', error=type(e).__name__)))
+        finally:
+            with self._lock: self.checked, self._checking = time.monotonic(), False
+
+    def unusable(self):
+        # Why this request cannot use the replica, or None
+        if time.monotonic() < self.down_until: return 'unavailable'
+        self.refresh()
+        if self.lag is None: return 'unavailable'
+        if self.lag > REPLICA_MAX_LAG_SECONDS: return 'lagging'
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict({name: self.counts[name] for name in self.COUNTERS}, lag_seconds=self.lag,
+                        down=time.monotonic() < self.down_until)
+
+replica_monitor = ReplicaMonitor()
+
+def replica_sticky():
+    return flask_session.get('replica_sticky_until', 0) > time.time()
+
+@contextmanager
+def primary_reads():
+    # For reads whose result outlives the request (process-wide caches); a lagging replica must not fill them.
+    routed = has_request_context() and g.get('db_replica')
+    if routed: g.db_replica = False
+    try:
+        yield
+    finally:
+        if routed: g.db_replica = True
+
+def replica_reads(view):
+    """Serve GET/HEAD requests of this view from the read replica when one is configured and usable."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not DATABASE_REPLICA_URL or request.method not in ('GET', 'HEAD'): return view(*args, **kwargs)
+        reason = 'sticky' if replica_sticky() else replica_monitor.unusable()
+        if reason:
+            replica_monitor.incr(reason)
+            return view(*args, **kwargs)
+        g.db_replica = True
+        try:
+            response = view(*args, **kwargs)
+        except sa_exc.DBAPIError as e:
+            if not g.get('db_replica'): raise  # failed on the primary after switching to it
+            app.logger.warning(json.dumps(dict(event='replica_fallback', endpoint=request.endpoint, error=type(e).__name__)))
+            db.session.rollback()
+            g.db_replica = False
+            replica_monitor.mark_down()
+            replica_monitor.incr('error')
+            return view(*args, **kwargs)
+        replica_monitor.incr('replica')
+        return response
+    return wrapper
+
+@event.listens_for(Session, 'after_flush')
+def _remember_write(session, flush_context):
+    if has_request_context(): g.db_wrote = True
+
+@app.after_request
+def _stick_to_primary(response):
+    # After a user's write their reads stay on the primary until the replica has surely caught up.
+    if DATABASE_REPLICA_URL and response.status_code < 400 and (g.get('db_wrote') or request.method not in ('GET', 'HEAD', 'OPTIONS')):
+        flask_session['replica_sticky_until'] = int(time.time()) + REPLICA_STICKY_SECONDS
+    return response
+
 # --- IAP User Capture Helper ---
 def get_current_user_email():
     iap_email = request.headers.get('X-Goog-Authenticated-User-Email')
@@ -302,18 +1422,1269 @@ def get_current_user_email():
 def inject_global_vars():
     return dict(current_user_email=get_current_user_email())
 
+# --- Request instrumentation ---
+# Every request gets a RequestProfile in g: SQL statements are counted and timed through engine
+# events, templates through Flask's render signals. after_request turns it into a Server-Timing
+# header, per-endpoint histograms for /metrics, and log lines for slow requests and N+1 patterns.
+# Metrics are per gunicorn worker process; a scrape sees whichever worker answers it.
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 500))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+SQL_PARAM_LIST_RE = re.compile(r'\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)')
+
+def statement_shape(statement):
+    # Collapse whitespace and expanded IN (?, ?, ...) / VALUES lists so one query issued per id groups together.
+    return SQL_PARAM_LIST_RE.sub('(?...)', ' '.join(statement.split()))
+
+class RequestProfile(object):
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.queries = {}
+        self.template_starts = []
+
+    def record_query(self, statement, elapsed):
+        self.sql_count += 1
+        self.sql_time += elapsed
+        shape = statement_shape(statement)
+        stat = self.queries.get(shape)
+        if stat is None: self.queries[shape] = [1, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+
+    def top_queries(self, limit=5):
+        ranked = sorted(self.queries.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [dict(sql=shape[:300], count=count, ms=round(total * 1000, 2)) for shape, (count, total) in ranked]
+
+    def repeated_queries(self, threshold):
+        return [(shape, count) for shape, (count, total) in self.queries.items() if count > threshold]
+
+def current_profile():
+    return g.get('perf') if has_request_context() else None
+
+def instrument_queries(engine):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        context._perf_started = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile()
+        if profile is not None: profile.record_query(statement, time.perf_counter() - context._perf_started)
+
+@before_render_template.connect_via(app)
+def _template_started(sender, template, context, **extra):
+    profile = current_profile()
+    if profile is not None: profile.template_starts.append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def _template_finished(sender, template, context, **extra):
+    profile = current_profile()
+    if profile is not None and profile.template_starts:
+        profile.template_time += time.perf_counter() - profile.template_starts.pop()
+
+class RequestMetrics(object):
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, status, elapsed, profile, n_plus_one):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = dict(
+                    duration=LatencyHistogram(), sql=LatencyHistogram(), template=LatencyHistogram(),
+                    statuses=Counter(), queries=0, n_plus_one=0)
+            stats['statuses'][f'{status // 100}xx'] += 1
+            stats['queries'] += profile.sql_count
+            stats['n_plus_one'] += n_plus_one
+        stats['duration'].observe(elapsed)
+        stats['sql'].observe(profile.sql_time)
+        stats['template'].observe(profile.template_time)
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(stats, statuses=Counter(stats['statuses'])) for endpoint, stats in self._endpoints.items()}
+
+request_metrics = RequestMetrics()
+
+@app.before_request
+def _start_request_profile():
+    g.perf = RequestProfile()
+
+@app.after_request
+def _finish_request_profile(response):
+    # Streamed bodies (exports) are only timed up to the point the view returns.
+    profile = g.pop('perf', None)
+    if profile is None: return response
+    elapsed = time.perf_counter() - profile.started
+    endpoint = request.endpoint or 'unmatched'
+    repeated = profile.repeated_queries(N_PLUS_ONE_THRESHOLD)
+    request_metrics.observe(endpoint, response.status_code, elapsed, profile, len(repeated))
+    if SERVER_TIMING:
+        response.headers['Server-Timing'] = (
+            f'db;dur={profile.sql_time * 1000:.1f};desc="{profile.sql_count} queries", '
+            f'tpl;dur={profile.template_time * 1000:.1f}, app;dur={elapsed * 1000:.1f}')
+    for shape, count in repeated:
+        app.logger.warning(json.dumps(dict(event='n_plus_one', endpoint=endpoint, path=request.path, count=count, sql=shape[:300])))
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        app.logger.warning(json.dumps(dict(
+            event='slow_request', method=request.method, path=request.path, endpoint=endpoint, status=response.status_code,
+            duration_ms=round(elapsed * 1000, 1), sql_count=profile.sql_count, sql_ms=round(profile.sql_time * 1000, 1),
+            template_ms=round(profile.template_time * 1000, 1), top_queries=profile.top_queries())))
+    return response
+
+def prometheus_labels(labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}' if labels else ''
+
+def prometheus_histogram(lines, name, labels, snapshot):
+    for bound, count in snapshot['buckets']:
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{prometheus_labels(dict(labels, le=le))} {count}')
+    lines.append(f'{name}_sum{prometheus_labels(labels)} {snapshot["sum"]}')
+    lines.append(f'{name}_count{prometheus_labels(labels)} {snapshot["count"]}')
+
+def render_metrics():
+    lines = []
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+    endpoints = sorted(request_metrics.snapshot().items())
+    for key, name, help_text in (('duration', 'rex_request_duration_seconds', 'Time spent in the view, including SQL and templates.'),
+                                 ('sql', 'rex_request_sql_seconds', 'Time spent executing SQL per request.'),
+                                 ('template', 'rex_request_template_seconds', 'Time spent rendering templates per request.')):
+        family(name, 'histogram', help_text)
+        for endpoint, stats in endpoints:
+            prometheus_histogram(lines, name, dict(endpoint=endpoint), stats[key].snapshot())
+    family('rex_requests_total', 'counter', 'Requests by endpoint and status class.')
+    for endpoint, stats in endpoints:
+        for status, count in sorted(stats['statuses'].items()):
+            lines.append(f'rex_requests_total{prometheus_labels(dict(endpoint=endpoint, status=status))} {count}')
+    family('rex_request_sql_queries_total', 'counter', 'SQL statements executed.')
+    for endpoint, stats in endpoints:
+        lines.append(f'rex_request_sql_queries_total{prometheus_labels(dict(endpoint=endpoint))} {stats["queries"]}')
+    family('rex_request_n_plus_one_total', 'counter', f'Statement shapes repeated more than {N_PLUS_ONE_THRESHOLD} times in one request.')
+    for endpoint, stats in endpoints:
+        lines.append(f'rex_request_n_plus_one_total{prometheus_labels(dict(endpoint=endpoint))} {stats["n_plus_one"]}')
+    family('rex_db_pool_checkout_seconds', 'histogram', 'Time to check a connection out of the pool.')
+    prometheus_histogram(lines, 'rex_db_pool_checkout_seconds', {}, pool_metrics.checkout_wait.snapshot())
+    pool = pool_metrics.stats()
+    for name in PoolMetrics.COUNTERS:
+        family(f'rex_db_pool_{name}_total', 'counter', f'Pool {name.replace("_", " ")}.')
+        lines.append(f'rex_db_pool_{name}_total {pool[name]}')
+    state = pool_state(db.engine)
+    for name in ('checked_out', 'checked_in', 'overflow'):
+        if name in state:
+            family(f'rex_db_pool_{name}', 'gauge', f'Connections {name.replace("_", " ")}.')
+            lines.append(f'rex_db_pool_{name} {state[name]}')
+    cache = choice_cache.stats()
+    for name in ('hits', 'misses'):
+        family(f'rex_choice_cache_{name}_total', 'counter', f'Lookup choice cache {name}.')
+        lines.append(f'rex_choice_cache_{name}_total {cache[name]}')
+    fragments = fragment_cache.stats()
+    for name in ('hits', 'disk_hits', 'misses'):
+        family(f'rex_fragment_cache_{name}_total', 'counter', f'Template fragment cache {name.replace("_", " ")}.')
+        lines.append(f'rex_fragment_cache_{name}_total {fragments[name]}')
+    if isinstance(app.wsgi_app, CompressionMiddleware):
+        compression = app.wsgi_app.stats()
+        family('rex_compression_responses_total', 'counter', 'Compressible responses, by whether they were sent compressed.')
+        for name in ('compressed', 'uncompressed'):
+            lines.append(f'rex_compression_responses_total{prometheus_labels(dict(result=name))} {compression[name]}')
+        family('rex_compression_bytes_total', 'counter', 'Bytes of compressed responses before and after compression.')
+        for name in ('bytes_in', 'bytes_out'):
+            lines.append(f'rex_compression_bytes_total{prometheus_labels(dict(stage=name[6:]))} {compression[name]}')
+    jobs = job_runner.stats()
+    for name in JobRunner.COUNTERS:
+        family(f'rex_jobs_{name}_total', 'counter', f'Background jobs {name} by this worker.')
+        lines.append(f'rex_jobs_{name}_total {jobs[name]}')
+    family('rex_jobs_running', 'gauge', 'Background jobs running in this worker.')
+    lines.append(f'rex_jobs_running {jobs["running"]}')
+    if DATABASE_REPLICA_URL:
+        replica = replica_monitor.stats()
+        family('rex_replica_requests_total', 'counter', 'Requests to @replica_reads views, by where they read and why.')
+        for name in ReplicaMonitor.COUNTERS:
+            labels = dict(target='replica') if name == 'replica' else dict(target='primary', reason=name)
+            lines.append(f'rex_replica_requests_total{prometheus_labels(labels)} {replica[name]}')
+        if replica['lag_seconds'] is not None:
+            family('rex_replica_lag_seconds', 'gauge', 'Replica lag at the last check.')
+            lines.append(f"rex_replica_lag_seconds {replica['lag_seconds']:.3f}")
+    return '\n'.join(lines) + '\n'
+
+# --- Listing helpers (filters + keyset pagination) ---
+STATUS_CHOICES = ['RexCommitee', 'RexEntry', 'ActinPlan', 'ReviewByCommittee', 'Closed', 'Rejected']
+LISTING_PAGE_SIZE = 50
+LISTING_MAX_PAGE_SIZE = 200
+
+InitiatingDiscipline = aliased(Disciplinelist, name='initiating_discipline')
+OnTopicDiscipline = aliased(Disciplinelist, name='on_topic_discipline')
+
+# Sort key -> (leading ORDER BY column, how to read it off a loaded row); (date_created, id) is always the tie-breaker.
+# A string names a column of the entry model itself, which is either the live or the archived one.
+LISTING_SORTS = {
+    'date': (None, None),
+    'status': ('status', lambda e: e.status),
+    'region': (Regionlist.name, lambda e: e.region.name),
+    'project': (Projectlist.name, lambda e: e.project.name),
+    'discipline': (OnTopicDiscipline.name, lambda e: e.on_topic_discipline.name),
+}
+
+def parse_int_arg(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def parse_date_arg(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d') if value else None
+    except ValueError:
+        return None
+
+def parse_listing_filters(args):
+    status = args.get('status') or None
+    return dict(
+        status=status if status in STATUS_CHOICES else None,
+        region=parse_int_arg(args.get('region')),
+        project=parse_int_arg(args.get('project')),
+        discipline=parse_int_arg(args.get('discipline')),
+        date_from=parse_date_arg(args.get('date_from')),
+        date_to=parse_date_arg(args.get('date_to')),
+    )
+
+def parse_listing_order(args):
+    sort = args.get('sort') if args.get('sort') in LISTING_SORTS else 'date'
+    per_page = min(max(parse_int_arg(args.get('per_page')) or LISTING_PAGE_SIZE, 1), LISTING_MAX_PAGE_SIZE)
+    return sort, args.get('order', 'desc') != 'asc', per_page
+
+def apply_listing_filters(query, filters, model=Returnonexperienceentrymodel):
+    if filters.get('status'): query = query.filter(model.status == filters['status'])
+    if filters.get('region'): query = query.filter(model.Region_id == filters['region'])
+    if filters.get('project'): query = query.filter(model.ProjectNameAndNumber_id == filters['project'])
+    if filters.get('discipline'): query = query.filter(model.REXOnDiscipline_id == filters['discipline'])
+    if filters.get('date_from'): query = query.filter(model.date_created >= filters['date_from'])
+    if filters.get('date_to'): query = query.filter(model.date_created < filters['date_to'] + timedelta(days=1))
+    return query
+
+def listing_joins(query, model):
+    return (query
+            .join(model.project)
+            .join(model.region)
+            .join(model.initiator)
+            .join(OnTopicDiscipline, model.REXOnDiscipline_id == OnTopicDiscipline.id)
+            .outerjoin(InitiatingDiscipline, model.REXInitiatingDiscipline_id == InitiatingDiscipline.id))
+
+def rex_listing_query(filters, model=Returnonexperienceentrymodel):
+    # The five lookups home.html shows are joined and populated in the same SELECT (no lazy loads per row).
+    query = (listing_joins(model.query, model)
+             .options(contains_eager(model.project),
+                      contains_eager(model.region),
+                      contains_eager(model.initiator),
+                      contains_eager(model.on_topic_discipline.of_type(OnTopicDiscipline)),
+                      contains_eager(model.initiating_discipline.of_type(InitiatingDiscipline))))
+    return apply_listing_filters(query, filters, model)
+
+def listing_models(filters):
+    # Archived entries are all Closed or Rejected, so any other status filter skips the archive.
+    if filters.get('status') and filters['status'] not in ARCHIVE_STATUSES: return [Returnonexperienceentrymodel]
+    return [Returnonexperienceentrymodel, ArchivedEntry]
+
+def encode_cursor(values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, size):
+    # Cursor layout: [<sort value>..., date_created, id]; anything malformed just restarts at page one.
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != size: return None
+        values[-2] = datetime.fromisoformat(values[-2]) if values[-2] else None
+        return values
+    except (ValueError, TypeError):
+        return None
+
+def keyset_condition(columns, values, descending):
+    # (a, b, c) < (x, y, z) expanded to OR-of-ANDs so every backend can use the composite index.
+    clauses = []
+    for i, column in enumerate(columns):
+        head = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*head, column < values[i] if descending else column > values[i]))
+    return or_(*clauses)
+
+def keyset_query(query, columns, values=None, descending=True):
+    if values is not None:
+        query = query.filter(keyset_condition(columns, values, descending))
+    return query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+def paginate_keyset(query, columns, row_key, cursor=None, per_page=LISTING_PAGE_SIZE, descending=True):
+    values = decode_cursor(cursor, len(columns)) if cursor else None
+    items = keyset_query(query, columns, values, descending).limit(per_page + 1).all()
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(row_key(items[-1]))
+    return items, next_cursor
+
+def listing_sort_spec(sort, model=Returnonexperienceentrymodel):
+    column, getter = LISTING_SORTS.get(sort, (None, None))
+    if column is None:
+        return [model.date_created, model.id], lambda e: [e.date_created, e.id]
+    if isinstance(column, str): column = getattr(model, column)
+    return [column, model.date_created, model.id], lambda e: [getter(e), e.date_created, e.id]
+
+def listing_page_keys(filters, sort, cursor=None, per_page=LISTING_PAGE_SIZE, descending=True):
+    """(model, id) of each entry on one listing page, in order, and the next page's cursor; reads only sort keys."""
+    # Live and archive pages are merged in SQL, so the order follows the database's collation: each
+    # side returns its next per_page + 1 sort keys from its own index and the UNION ALL of both is
+    # sorted and cut again.
+    models = listing_models(filters)
+    columns, _ = listing_sort_spec(sort)
+    values = decode_cursor(cursor, len(columns)) if cursor else None
+    labels = [f'k{i}' for i in range(len(columns))]
+    sides = []
+    for number, model in enumerate(models):
+        model_columns, _ = listing_sort_spec(sort, model)
+        query = db.session.query(*[c.label(l) for c, l in zip(model_columns, labels)], literal(number).label('source'))
+        query = apply_listing_filters(listing_joins(query.select_from(model), model), filters, model)
+        sides.append(select(keyset_query(query, model_columns, values, descending).limit(per_page + 1).subquery()))
+    merged = union_all(*sides).subquery() if len(sides) > 1 else sides[0].subquery()
+    keys = [merged.c[l] for l in labels]
+    rows = db.session.execute(select(merged.c.source, *keys)
+                              .order_by(*[k.desc() if descending else k.asc() for k in keys]).limit(per_page + 1)).all()
+    next_cursor = encode_cursor(list(rows[per_page - 1][1:])) if len(rows) > per_page else None
+    return [(models[row.source], row[-1]) for row in rows[:per_page]], next_cursor
+
+def paginate_listing(filters, sort, cursor=None, per_page=LISTING_PAGE_SIZE, descending=True):
+    models = listing_models(filters)
+    if len(models) == 1:
+        columns, row_key = listing_sort_spec(sort, models[0])
+        return paginate_keyset(rex_listing_query(filters, models[0]), columns, row_key, cursor, per_page, descending)
+    # Only the winning rows are loaded with their lookups
+    keys, next_cursor = listing_page_keys(filters, sort, cursor, per_page, descending)
+    loaded = {}
+    for model in models:
+        ids = [id for key_model, id in keys if key_model is model]
+        if ids: loaded.update({(model, e.id): e for e in rex_listing_query({}, model).filter(model.id.in_(ids))})
+    return [loaded[key] for key in keys if key in loaded], next_cursor
+
+# --- Export ---
+EXPORT_BATCH_SIZE = 1000
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+def export_statement(filters):
+    # Flat column SELECT (no ORM entities) so rows stream straight from the cursor.
+    models = listing_models(filters)
+    statements = [export_source_statement(filters, *pairs) for pairs in ARCHIVE_MODEL_SETS[:len(models)]]
+    headers = [label for label, _ in statements[0].selected_columns.items()]
+    if len(statements) == 1:
+        stmt = statements[0].order_by(models[0].date_created.desc(), models[0].id.desc())
+    else:
+        merged = union_all(*statements).subquery()
+        stmt = select(merged).order_by(merged.c[headers[1]].desc(), merged.c[headers[0]].desc())
+    return headers, stmt
+
+def export_source_statement(filters, model, committee, plan, review):
+    Initiator, ReviewMember, Mentor, ActionBy, QMSSpoc, Attendee = [aliased(Employeelist) for _ in range(6)]
+    OnDiscipline, InitDiscipline = aliased(Disciplinelist), aliased(Disciplinelist)
+    columns = [
+        ('ID', model.id), ('Date Created', model.date_created), ('Status', model.status),
+        ('Project No. & Name', Projectlist.name), ('Region', Regionlist.name), ('REX Initiator', Initiator.name),
+        ('REX Initiating Discipline', InitDiscipline.name), ('REX On Discipline', OnDiscipline.name),
+        ('REX On Topic', model.REXOnTopic), ('REX Description', model.REXDescription), ('Impact', model.Impact),
+        ('Attachment Link', model.AttachmentLink), ('Recommendation', model.Recommendation),
+        ('Review Commitee Member', ReviewMember.name), ('Is it REX?', committee.IsitREX),
+        ('Is further analysis required', committee.Isfurtheranalysisrequired), ('Mentor', Mentor.name),
+        ('ActionBy', ActionBy.name), ('QMS Spoc', QMSSpoc.name), ('Technology', Technologylist.name),
+        ('REX Committee Comments', committee.REXCommitteeComments),
+        ('Attendees Of RootCause', Attendee.name), ('Action Plan Date', plan.Date),
+        ('Frequesncy Of Issue', Frequencyofissuelist.name), ('EHS Risk', Ehsrisklist.name),
+        ('Add Documents Link', plan.AddDocumentsLink), ('Root Cause', plan.RootCause),
+        ('Corrective Action', plan.CorrectiveAction), ('Documment To Update', Documenttoupdatelist.name),
+        ('Action Plan Remarks', plan.Remarks), ('Action Plan Attachment Link', plan.AttachmentLink),
+        ('Discussed with Mentor', plan.ReportingManagerConfirmation),
+        ('Review Remarks', review.Remarks),
+    ]
+    stmt = (select(*[column.label(label) for label, column in columns])
+            .select_from(model)
+            .join(Projectlist, model.ProjectNameAndNumber_id == Projectlist.id)
+            .join(Regionlist, model.Region_id == Regionlist.id)
+            .join(Initiator, model.REXInitiator_id == Initiator.id)
+            .join(OnDiscipline, model.REXOnDiscipline_id == OnDiscipline.id)
+            .outerjoin(InitDiscipline, model.REXInitiatingDiscipline_id == InitDiscipline.id)
+            .outerjoin(committee, committee.parentid == model.id)
+            .outerjoin(ReviewMember, committee.ReviewCommiteeMember == ReviewMember.id)
+            .outerjoin(Mentor, committee.Mentor == Mentor.id)
+            .outerjoin(ActionBy, committee.ActionBy == ActionBy.id)
+            .outerjoin(QMSSpoc, committee.QMSSpoc == QMSSpoc.id)
+            .outerjoin(Technologylist, committee.Technology == Technologylist.id)
+            .outerjoin(plan, plan.parentid == model.id)
+            .outerjoin(Attendee, plan.AttendeesOfRootCause == Attendee.id)
+            .outerjoin(Frequencyofissuelist, plan.FrequesncyOfIssue == Frequencyofissuelist.id)
+            .outerjoin(Ehsrisklist, plan.EHSRisk == Ehsrisklist.id)
+            .outerjoin(Documenttoupdatelist, plan.DocummentToUpdate == Documenttoupdatelist.id)
+            .outerjoin(review, review.parentid == model.id))
+    return apply_listing_filters(stmt, filters, model)
+
+def iter_export_rows(stmt, batch_size=EXPORT_BATCH_SIZE):
+    # yield_per keeps a server-side cursor open and only ever holds one batch of rows.
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield partition
+
+def generate_csv(headers, stmt):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for rows in iter_export_rows(stmt):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def generate_xlsx(headers, stmt, chunk_size=64 * 1024):
+    # XLSX is a zip, so it cannot be emitted row by row. constant_memory mode flushes each row
+    # to a temp file as it is written; the finished file is then streamed back in chunks.
+    import xlsxwriter
+    with tempfile.TemporaryFile() as handle:
+        workbook = xlsxwriter.Workbook(handle, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm', 'remove_timezone': True})
+        sheet = workbook.add_worksheet('REX')
+        sheet.write_row(0, 0, headers)
+        row_number = 1
+        for rows in iter_export_rows(stmt):
+            for row in rows:
+                sheet.write_row(row_number, 0, row)
+                row_number += 1
+        workbook.close()
+        handle.seek(0)
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk: break
+            yield chunk
+
+# --- Entry archive ---
+# Closed and Rejected entries untouched for ARCHIVE_AFTER_DAYS move, with their children, to the
+# rex_archive_* tables in batches of one transaction each: INSERT ... SELECT into the archive, then a
+# single DELETE of the entries that the database cascades to the children. The workflow summary is
+# unchanged (archived entries still count); purging archived entries removes them from it.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 180))
+ARCHIVE_BATCH_SIZE = 500
+
+def unlink_entries(connection, ids):
+    # Search documents, attachments and the transition log cover live and archived entries alike, so no
+    # foreign key cascades to them. The log's rows come out of the cycle-time aggregates as they go.
+    documents, attachments, log = RexSearchDocument.__table__, Attachment.__table__, RexStatusTransition.__table__
+    connection.execute(sa_delete(documents).where(documents.c.entry_id.in_(ids)))
+    connection.execute(sa_update(attachments).where(attachments.c.entry_id.in_(ids)).values(entry_id=None))
+    rows = connection.execute(select(log.c.from_status, log.c.to_status, log.c.region_id, log.c.discipline_id,
+                                     log.c.changed_at, log.c.seconds_in_state, log.c.seconds_open)
+                              .where(log.c.entry_id.in_(ids))).mappings()
+    counts, samples = transition_stats(rows)
+    apply_transition_stats(connection, {k: -n for k, n in counts.items()}, {k: -n for k, n in samples.items()})
+    connection.execute(sa_delete(log).where(log.c.entry_id.in_(ids)))
+
+def archivable_entry_ids(cutoff, limit):
+    model = Returnonexperienceentrymodel
+    return db.session.scalars(select(model.id)
+                              .where(model.status.in_(ARCHIVE_STATUSES), model.updated_at < cutoff)
+                              .order_by(model.id).limit(limit)).all()
+
+def move_to_archive(connection, ids, archived_at):
+    entries = Returnonexperienceentrymodel.__table__
+    for live, archived in ARCHIVE_MODELS:
+        source = live.__table__
+        names = [column.name for column in source.columns]
+        if live is Returnonexperienceentrymodel:
+            stmt = select(*source.columns, literal(archived_at, db.DateTime).label('archived_at')).where(
+                source.c.id.in_(ids), source.c.status.in_(ARCHIVE_STATUSES))
+            names.append('archived_at')
+        else:
+            stmt = select(*source.columns).where(source.c.parentid.in_(ids))
+        connection.execute(sa_insert(archived.__table__).from_select(names, stmt))
+    connection.execute(sa_delete(entries).where(entries.c.id.in_(ids), entries.c.status.in_(ARCHIVE_STATUSES)))
+
+def archive_entries(older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, progress=None):
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    moved = 0
+    while True:
+        ids = archivable_entry_ids(cutoff, batch_size)
+        if not ids: break
+        connection = db.session.connection()
+        move_to_archive(connection, ids, datetime.utcnow())
+        advance_data_versions(connection, {'entries'})
+        db.session.commit()
+        moved += len(ids)
+        if progress: progress(moved)
+    return moved
+
+def purge_archived_entries(older_than_days, batch_size=ARCHIVE_BATCH_SIZE, progress=None):
+    model = ArchivedEntry
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    purged = 0
+    while True:
+        rows = db.session.execute(select(model.id, model.status, model.Region_id, model.REXOnDiscipline_id, model.date_created)
+                                  .where(model.archived_at < cutoff).order_by(model.id).limit(batch_size)).all()
+        if not rows: break
+        ids = [row.id for row in rows]
+        deltas = Counter()
+        for row in rows: deltas[summary_key(*row[1:])] -= 1
+        connection = db.session.connection()
+        unlink_entries(connection, ids)
+        connection.execute(sa_delete(model.__table__).where(model.__table__.c.id.in_(ids)))
+        apply_summary_deltas(connection, deltas)
+        advance_data_versions(connection, {'entries'})
+        db.session.commit()
+        purged += len(ids)
+        if progress: progress(purged)
+    return purged
+
+# --- Background jobs ---
+# Handlers enqueue_job() slow work and return at once. Each gunicorn worker runs a JobRunner
+# (started by post_worker_init in gunicorn.conf.py; `flask run-jobs` locally) whose poller thread
+# claims due jobs into a small thread pool. The job table is the queue, so there is no broker, and
+# a job whose worker dies is claimed again once its lease runs out. On Cloud Run, jobs only make
+# progress between requests when CPU is always allocated (--no-cpu-throttling).
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 2))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 300))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", 30))
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", 3600))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", 7))
+JOB_HANDLERS = {}
+
+class JobError(Exception):
+    def __init__(self, message, retry=True):
+        super(JobError, self).__init__(message)
+        self.retry = retry
+
+def job_handler(kind):
+    def decorator(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+def enqueue_job(kind, payload=None, max_attempts=JOB_MAX_ATTEMPTS, delay=0):
+    if kind not in JOB_HANDLERS: raise ValueError(f'Unknown job kind "{kind}"')
+    job = Job(kind=kind, payload=json.dumps(payload or {}, default=str), max_attempts=max_attempts,
+              run_after=datetime.utcnow() + timedelta(seconds=delay),
+              created_by=get_current_user_email() if has_request_context() else None)
+    db.session.add(job)
+    db.session.commit()
+    job_runner.wake()
+    return job
+
+def due_jobs_condition(now):
+    # Queued jobs whose backoff has elapsed, and running ones whose worker stopped renewing the lease.
+    return or_(and_(Job.status == 'queued', Job.run_after <= now),
+               and_(Job.status == 'running', Job.locked_at < now - timedelta(seconds=JOB_LEASE_SECONDS)))
+
+def claim_jobs(worker_id, limit):
+    now = datetime.utcnow()
+    expired = now - timedelta(seconds=JOB_LEASE_SECONDS)
+    db.session.execute(sa_update(Job)
+                       .where(Job.status == 'running', Job.locked_at < expired, Job.attempts >= Job.max_attempts)
+                       .values(status='failed', error='Worker lost on the last attempt', finished_at=now, locked_by=None, locked_at=None)
+                       .execution_options(synchronize_session=False))
+    due = due_jobs_condition(now)
+    # FOR UPDATE SKIP LOCKED lets the pollers of other workers pass over the rows this one is claiming.
+    # SQLite has no row locks and drops the clause; the guarded UPDATE makes each claim exclusive there.
+    candidates = db.session.scalars(select(Job.id).where(due).order_by(Job.run_after, Job.id)
+                                    .limit(limit).with_for_update(skip_locked=True)).all()
+    claimed = []
+    for job_id in candidates:
+        result = db.session.execute(sa_update(Job).where(Job.id == job_id, due)
+                                    .values(status='running', locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+                                    .execution_options(synchronize_session=False))
+        if result.rowcount: claimed.append(job_id)
+    db.session.commit()
+    return claimed
+
+def renew_job_leases(worker_id, job_ids):
+    db.session.execute(sa_update(Job).where(Job.id.in_(job_ids), Job.locked_by == worker_id, Job.status == 'running')
+                       .values(locked_at=datetime.utcnow()).execution_options(synchronize_session=False))
+    db.session.commit()
+
+def purge_finished_jobs():
+    cutoff = datetime.utcnow() - timedelta(days=JOB_RETENTION_DAYS)
+    db.session.execute(sa_delete(Job).where(Job.status.in_(('done', 'failed')), Job.finished_at < cutoff)
+                       .execution_options(synchronize_session=False))
+    db.session.commit()
+
+def retry_delay(attempts):
+    # Exponential backoff with jitter, so jobs that failed together do not all retry together.
+    return min(JOB_RETRY_BASE * 2 ** (attempts - 1), JOB_RETRY_MAX) * random.uniform(0.5, 1.0)
+
+def finish_job(job, worker_id, result=None, error=None):
+    now = datetime.utcnow()
+    values = dict(locked_by=None, locked_at=None)
+    if error is None:
+        values.update(status='done', result=json.dumps(result, default=str), error=None, finished_at=now)
+    elif getattr(error, 'retry', True) and job.attempts < job.max_attempts:
+        values.update(status='queued', run_after=now + timedelta(seconds=retry_delay(job.attempts)), error=f'{type(error).__name__}: {error}'[:2000])
+    else:
+        values.update(status='failed', error=f'{type(error).__name__}: {error}'[:2000], finished_at=now)
+    # Only the lease holder records the outcome: a worker that lost its lease no longer owns the job.
+    updated = db.session.execute(sa_update(Job).where(Job.id == job.id, Job.locked_by == worker_id, Job.status == 'running')
+                                 .values(**values).execution_options(synchronize_session=False)).rowcount
+    db.session.commit()
+    return values['status'] if updated else None
+
+def run_job(job_id, worker_id):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        try:
+            handler = JOB_HANDLERS.get(job.kind)
+            if handler is None: raise JobError(f'Unknown job kind "{job.kind}"', retry=False)
+            result, error = handler(job, **json.loads(job.payload)), None
+        except Exception as e:
+            db.session.rollback()
+            result, error = None, e
+        outcome = finish_job(job, worker_id, result, error)
+        if error is not None:
+            app.logger.warning(json.dumps(dict(event='job_failed', id=job_id, kind=job.kind, attempt=job.attempts,
+                                               outcome=outcome, error=f'{type(error).__name__}: {error}'[:300])))
+        return outcome
+
+class JobRunner(object):
+    COUNTERS = ('claimed', 'done', 'retried', 'failed', 'lost', 'errors')
+    OUTCOMES = {'done': 'done', 'queued': 'retried', 'failed': 'failed', None: 'lost'}
+
+    def __init__(self, threads, poll_interval=JOB_POLL_INTERVAL):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.worker_id = None
+        self.counts = Counter()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._executor = None
+        self._poller = None
+
+    def start(self):
+        # Threads do not survive fork(): start this in each gunicorn worker, never in the preloading master.
+        if self._poller is not None or self.threads <= 0: return self
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'[-100:]
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='rex-job')
+        self._poller = threading.Thread(target=self._poll, name='rex-job-poller', daemon=True)
+        self._poller.start()
+        return self
+
+    def stop(self, timeout=30):
+        # Jobs still running after the timeout are picked up elsewhere when their lease expires.
+        if self._poller is None: return
+        self._stopping.set()
+        self._wake.set()
+        self._poller.join(timeout)
+        with self._lock: futures = list(self._running.values())
+        wait_futures(futures, timeout)
+        self._executor.shutdown(wait=False)
+        self._poller = self._executor = None
+
+    def wake(self): self._wake.set()
+
+    def stats(self):
+        with self._lock:
+            return dict({name: self.counts[name] for name in self.COUNTERS},
+                        running=len(self._running), threads=self.threads, worker=self.worker_id)
+
+    def _finished(self, job_id, future):
+        with self._lock:
+            self._running.pop(job_id, None)
+            self.counts['errors' if future.exception() else self.OUTCOMES[future.result()]] += 1
+        self._wake.set()
+
+    def _poll(self):
+        renewed = purged = beat = time.monotonic()
+        while not self._stopping.is_set():
+            self._wake.clear()
+            claimed = []
+            try:
+                with app.app_context():
+                    with self._lock: running = list(self._running)
+                    if len(running) < self.threads: claimed = claim_jobs(self.worker_id, self.threads - len(running))
+                    now = time.monotonic()
+                    if running and now - renewed >= JOB_LEASE_SECONDS / 3:
+                        renew_job_leases(self.worker_id, running)
+                        renewed = now
+                    if now - purged >= 3600:
+                        purge_finished_jobs()
+                        purged = now
+                    if DATABASE_REPLICA_URL and now - beat >= REPLICA_HEARTBEAT_SECONDS:
+                        write_replica_heartbeat()
+                        beat = now
+            except Exception as e:
+                app.logger.warning(json.dumps(dict(event='job_poll_failed', error=type(e).__name__)))
+            for job_id in claimed:
+                with self._lock:
+                    self.counts['claimed'] += 1
+                    self._running[job_id] = future = self._executor.submit(run_job, job_id, self.worker_id)
+                future.add_done_callback(functools.partial(self._finished, job_id))
+            # Either every thread is busy or nothing else is due; a finished job or enqueue_job wakes us early.
+            self._wake.wait(self.poll_interval)
+
+job_runner = JobRunner(JOB_WORKER_THREADS)
+
+def job_queue_depth():
+    rows = db.session.execute(select(Job.status, func.count()).where(Job.status.in_(('queued', 'running'))).group_by(Job.status))
+    return dict(dict(queued=0, running=0), **{status: count for status, count in rows})
+
+def job_status_dict(job):
+    result = json.loads(job.result) if job.result else None
+    status = dict(id=job.id, kind=job.kind, status=job.status, attempts=job.attempts, max_attempts=job.max_attempts,
+                  created=job.date_created, run_after=job.run_after if job.status == 'queued' else None,
+                  finished=job.finished_at, error=job.error, result=result, status_url=url_for('job_status', id=job.id))
+    if isinstance(result, dict) and 'sha256' in result: status['download_url'] = url_for('uploaded_file', filename=result['sha256'])
+    return status
+
+def job_accepted(job):
+    return jsonify(job_status_dict(job)), 202, {'Location': url_for('job_status', id=job.id)}
+
+@job_handler('export')
+def export_job(job, args, file_format, filename):
+    headers, stmt = export_statement(parse_listing_filters(args))
+    if file_format == 'xlsx':
+        chunks = generate_xlsx(headers, stmt)
+    else:
+        chunks = (part.encode('utf-8') for part in generate_csv(headers, stmt))
+    # Kept as an attachment, so the download is served (and deduplicated) like any other upload.
+    with tempfile.TemporaryFile() as handle:
+        for chunk in chunks: handle.write(chunk)
+        handle.seek(0)
+        attachment = create_attachment([handle], filename, uploaded_by=job.created_by)
+    return dict(attachment_id=attachment.id, sha256=attachment.sha256, name=attachment.original_name, size=attachment.size)
+
+# --- Fragment cache ---
+# `{% cache key %}...{% endcache %}` renders its body once per key. Keys embed the entry's version
+# plus whatever lookup data the fragment shows, so a write or rename simply produces a new key and
+# superseded fragments age out of the LRU. FRAGMENT_CACHE_DIR adds a directory shared by the
+# gunicorn workers on one instance, so a fragment rendered by one worker serves the others.
+class FragmentCache(object):
+    def __init__(self, max_bytes, directory=None, max_files=20000):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_files = max_files
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get_or_render(self, key, render):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        with self._lock:
+            html = self._entries.get(digest)
+            if html is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return html
+        html = self._read(digest)
+        if html is None:
+            html = str(render())
+            self._write(digest, html)
+            with self._lock: self.misses += 1
+        else:
+            with self._lock: self.disk_hits += 1
+        self._remember(digest, html)
+        return html
+
+    def _remember(self, digest, html):
+        # Sizes are in characters, which is bytes for this ASCII-heavy HTML. A single fragment may not take
+        # more than an eighth of the budget, so one huge page section cannot flush everything else.
+        if len(html) > self.max_bytes // 8: return
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None: self.size -= len(old)
+            self._entries[digest] = html
+            self.size += len(html)
+            while self.size > self.max_bytes:
+                self.size -= len(self._entries.popitem(last=False)[1])
+
+    def _path(self, digest): return os.path.join(self.directory, f'{digest}.html')
+
+    def _read(self, digest):
+        if not self.directory: return None
+        try:
+            with open(self._path(digest), encoding='utf-8') as handle: return handle.read()
+        except OSError:
+            return None
+
+    def _write(self, digest, html):
+        if not self.directory: return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{self._path(digest)}.{uuid.uuid4().hex}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as handle: handle.write(html)
+            os.replace(tmp_path, self._path(digest))
+        except OSError:
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % 256 == 0
+        if due: self.prune()
+
+    def prune(self):
+        # Oldest first by mtime; other workers may be pruning the same directory concurrently.
+        files = []
+        for item in os.scandir(self.directory):
+            try: files.append((item.stat().st_mtime, item.path))
+            except OSError: pass
+        for _, path in sorted(files)[:max(len(files) - self.max_files, 0)]:
+            try: os.remove(path)
+            except OSError: pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(hits=self.hits, disk_hits=self.disk_hits, misses=self.misses, entries=len(self._entries),
+                        size=self.size, max_bytes=self.max_bytes, directory=self.directory)
+
+fragment_cache = FragmentCache(max_bytes=int(os.getenv("FRAGMENT_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+                               directory=os.getenv("FRAGMENT_CACHE_DIR") or None)
+
+class FragmentCacheExtension(Extension):
+    # A falsy key renders the body uncached (e.g. editable sections, POST re-renders).
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [key]), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, caller):
+        if not key: return caller()
+        return Markup(fragment_cache.get_or_render(key, caller))
+
+app.jinja_env.add_extension(FragmentCacheExtension)
+
+@app.template_global()
+def row_cache_key(entry):
+    # The listing query already joins these names, so a rename changes the key with no extra bookkeeping.
+    return ('home-row', entry.id, entry.version, entry.status, entry.project.name, entry.region.name,
+            entry.initiator.name, entry.on_topic_discipline.name,
+            entry.initiating_discipline.name if entry.initiating_discipline else None)
+
+# (section, the status in which it is an editable form, lookups its selects list)
+UPDATE_SECTIONS = [
+    ('entry', 'RexEntry', (Projectlist, Regionlist, Employeelist, Disciplinelist)),
+    ('committee', 'RexCommitee', (Employeelist, Technologylist)),
+    ('actionplan', 'ActinPlan', (Employeelist, Frequencyofissuelist, Ehsrisklist, Documenttoupdatelist)),
+    ('review', 'ReviewByCommittee', ()),
+]
+
+def update_section_keys(entry):
+    # Editable sections carry the user's CSRF token, so only the read-only ones are cached.
+    return {name: None if entry.status == editable else
+            ('update', name, entry.id, entry.version, entry.status) + tuple(choice_digest(lookup) for lookup in lookups)
+            for name, editable, lookups in UPDATE_SECTIONS}
+
+# --- Static assets ---
+# `flask --app app build-assets` copies only what the templates load through asset_url() (plus the
+# fonts and images their stylesheets point at) into ASSET_BUILD_DIR under content-hashed names, with
+# precompressed .gz/.br siblings and a manifest. Without a manifest asset_url() falls back to /static.
+ASSET_BUILD_DIR = os.path.join(app.root_path, 'build', 'assets')
+ASSET_MANIFEST_PATH = os.path.join(ASSET_BUILD_DIR, 'manifest.json')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+ASSET_COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.ttf', '.eot', '.ico', '.map'}
+ASSET_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]  # server preference order
+ASSET_REF_RE = re.compile(r"""asset_url\(\s*['"]([^'"]+)['"]\s*\)""")
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+mimetypes.add_type('font/woff', '.woff')
+mimetypes.add_type('font/woff2', '.woff2')
+
+def load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, encoding='utf-8') as handle: return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+asset_manifest = load_asset_manifest()
+
+@app.template_global()
+def asset_url(filename):
+    built = asset_manifest.get(filename)
+    if built: return url_for('built_asset', filename=built)
+    return url_for('static', filename=filename)
+
+def template_asset_refs():
+    refs = set()
+    for root, _, names in os.walk(os.path.join(app.root_path, app.template_folder)):
+        for name in names:
+            with open(os.path.join(root, name), encoding='utf-8') as handle:
+                refs.update(ASSET_REF_RE.findall(handle.read()))
+    return refs
+
+def css_url_target(stylesheet, raw):
+    # Relative url() in a stylesheet -> (static-relative path, trailing ?query/#fragment), or None.
+    raw = raw.strip()
+    if not raw or raw.startswith(('data:', '/', '#')) or '://' in raw: return None
+    path = re.split(r'[?#]', raw, 1)[0]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(stylesheet), path)), raw[len(path):]
+
+def rewrite_css_urls(stylesheet, css, manifest):
+    # Built files keep their directory, so a relative path from the stylesheet's own directory still works.
+    def replace(match):
+        target = css_url_target(stylesheet, match.group(2))
+        if target is None or target[0] not in manifest: return match.group(0)
+        relative = posixpath.relpath(manifest[target[0]], posixpath.dirname(stylesheet))
+        return f'url({match.group(1)}{relative}{target[1]}{match.group(1)})'
+    return CSS_URL_RE.sub(replace, css)
+
+def fingerprint_name(filename, data):
+    stem, ext = posixpath.splitext(filename)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+def write_built_asset(built, data, brotli=None):
+    path = os.path.join(ASSET_BUILD_DIR, *built.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as handle: handle.write(data)
+    if posixpath.splitext(built)[1].lower() not in ASSET_COMPRESSIBLE: return
+    variants = [('.gz', gzip.compress(data, 9, mtime=0))]
+    if brotli is not None: variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, encoded in variants:
+        # Not worth a Content-Encoding round trip unless it saves at least 10%
+        if len(encoded) < len(data) * 0.9:
+            with open(path + suffix, 'wb') as handle: handle.write(encoded)
+
+def build_assets():
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    def source(filename): return os.path.join(app.static_folder, *filename.split('/'))
+    entries = template_asset_refs()
+    nested = set()
+    for stylesheet in (f for f in entries if f.endswith('.css') and os.path.isfile(source(f))):
+        with open(source(stylesheet), encoding='utf-8') as handle:
+            for match in CSS_URL_RE.finditer(handle.read()):
+                target = css_url_target(stylesheet, match.group(2))
+                if target: nested.add(target[0])
+    shutil.rmtree(ASSET_BUILD_DIR, ignore_errors=True)
+    manifest, missing, sizes = {}, [], Counter()
+    # Fonts/images first so stylesheets can be rewritten to their hashed names before being hashed themselves.
+    for filename in sorted(entries | nested, key=lambda f: (f.endswith('.css'), f)):
+        if not os.path.isfile(source(filename)):
+            missing.append(filename)
+            continue
+        with open(source(filename), 'rb') as handle: data = handle.read()
+        if filename.endswith('.css'):
+            data = rewrite_css_urls(filename, data.decode('utf-8'), manifest).encode('utf-8')
+        manifest[filename] = fingerprint_name(filename, data)
+        write_built_asset(manifest[filename], data, brotli)
+        sizes['files'] += 1
+        sizes['bytes'] += len(data)
+    tmp_path = ASSET_MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as handle: json.dump(manifest, handle, indent=1, sort_keys=True)
+    os.replace(tmp_path, ASSET_MANIFEST_PATH)
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    return dict(files=sizes['files'], bytes=sizes['bytes'], missing=sorted(missing), brotli=brotli is not None)
+
+# --- Streaming pages ---
+# With STREAM_PAGES=1 the listing and update pages are sent with stream_template: the view still runs
+# its queries first, then the layout head and the first rows go out while the rest renders. Jinja
+# yields many small strings, which are joined into STREAM_CHUNK_SIZE pieces. The session cookie is
+# sent before the body, so a page with pending flash messages renders buffered and the CSRF token
+# the forms embed is created before streaming starts.
+app.config['STREAM_PAGES'] = os.getenv("STREAM_PAGES", "0") == "1"
+STREAM_CHUNK_SIZE = 8 * 1024
+
+def coalesce_chunks(chunks, size=STREAM_CHUNK_SIZE):
+    buffer, buffered = [], 0
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= size:
+                yield ''.join(buffer)
+                buffer, buffered = [], 0
+        if buffer: yield ''.join(buffer)
+    finally:
+        # Ends stream_with_context, which releases the request and the database session
+        if hasattr(chunks, 'close'): chunks.close()
+
+def render_page(template, **context):
+    if not app.config['STREAM_PAGES'] or flask_session.get('_flashes'): return render_template(template, **context)
+    generate_csrf()
+    return Response(coalesce_chunks(stream_template(template, **context)), mimetype='text/html')
+
+# --- Response compression ---
+# CompressionMiddleware (installed by create_app unless COMPRESS_RESPONSES=0) compresses text
+# responses of at least COMPRESS_MIN_SIZE bytes with brotli or gzip, whichever the client accepts
+# (brotli first). A buffered body is compressed in one piece. A streamed body is flushed after every
+# chunk so the browser can render each part as it arrives. Responses that already carry a
+# Content-Encoding (built assets) or support ranges (send_file, which only says so when the request
+# has a Range header, so its file body is checked too) pass through untouched.
+COMPRESS_RESPONSES = os.getenv("COMPRESS_RESPONSES", "1") == "1"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+COMPRESSIBLE_TYPES = {'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'text/xml',
+                      'application/javascript', 'application/json', 'application/xml', 'image/svg+xml'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 11 is for build-assets; per-request compression has to be fast
+
+class CompressionMiddleware(object):
+    COUNTERS = ('compressed', 'uncompressed', 'bytes_in', 'bytes_out')
+
+    def __init__(self, wsgi_app, min_size=COMPRESS_MIN_SIZE):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        self.brotli = brotli
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def incr(self, **counts):
+        with self._lock:
+            for name, n in counts.items(): self._counters[name] += n
+
+    def stats(self):
+        with self._lock: return dict(self._counters, brotli=self.brotli is not None, min_size=self.min_size)
+
+    def negotiate(self, environ):
+        accepted = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        for encoding in ('br', 'gzip'):
+            if accepted[encoding] and (encoding != 'br' or self.brotli): return encoding
+        return None
+
+    @staticmethod
+    def sends_file(environ, body):
+        # The server's wsgi.file_wrapper may be a function (uWSGI) rather than a class
+        wrapper = environ.get('wsgi.file_wrapper')
+        return isinstance(body, FileWrapper) or (isinstance(wrapper, type) and isinstance(body, wrapper))
+
+    def compressor(self, encoding):
+        # (compress one chunk and flush it, finish the stream)
+        if encoding == 'br':
+            compressor = self.brotli.Compressor(quality=BROTLI_QUALITY)
+            return lambda data: compressor.process(data) + compressor.flush(), compressor.finish
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        return lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def __call__(self, environ, start_response):
+        started = []
+        def defer_start_response(status, headers, exc_info=None):
+            started[:] = [status, headers, exc_info]
+            return None  # Werkzeug never uses the write() callable
+        body = self.wsgi_app(environ, defer_start_response)
+        status, headers, exc_info = started
+        headers = Headers(headers)
+        mimetype = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if (not status.startswith('200') or mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in headers
+                or 'Content-Range' in headers or 'Accept-Ranges' in headers or 'no-transform' in headers.get('Cache-Control', '')
+                or self.sends_file(environ, body)):
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body
+        vary = [v.strip() for v in headers.get('Vary', '').split(',') if v.strip()]
+        if 'Accept-Encoding' not in vary: headers['Vary'] = ', '.join(vary + ['Accept-Encoding'])
+        encoding = self.negotiate(environ) if environ.get('REQUEST_METHOD') != 'HEAD' else None
+        length = headers.get('Content-Length', type=int)
+        if encoding is None or (length is not None and length < self.min_size):
+            self.incr(uncompressed=1)
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body
+        return self.compress(body, status, headers, exc_info, encoding, start_response)
+
+    def compress(self, body, status, headers, exc_info, encoding, start_response):
+        chunks, buffered, size = iter(body), [], 0
+        try:
+            # Read up to the threshold first: a streamed body that turns out short is sent as it is.
+            for chunk in chunks:
+                buffered.append(chunk)
+                size += len(chunk)
+                if size >= self.min_size: break
+            else:
+                self.incr(uncompressed=1)
+                headers['Content-Length'] = str(size)
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                yield b''.join(buffered)
+                return
+            compress, finish = self.compressor(encoding)
+            headers['Content-Encoding'] = encoding
+            if 'Content-Length' in headers:
+                data = b''.join(buffered) + b''.join(chunks)
+                encoded = compress(data) + finish()
+                headers['Content-Length'] = str(len(encoded))
+                self.incr(compressed=1, bytes_in=len(data), bytes_out=len(encoded))
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                yield encoded
+                return
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            self.incr(compressed=1)
+            for chunk in itertools.chain([b''.join(buffered)], chunks):
+                if not chunk: continue
+                encoded = compress(chunk)
+                self.incr(bytes_in=len(chunk), bytes_out=len(encoded))
+                yield encoded
+            encoded = finish()
+            self.incr(bytes_out=len(encoded))
+            yield encoded
+        finally:
+            if hasattr(body, 'close'): body.close()
+
+# --- JSON API ---
+# /api/v1/entries serves entries with their committee, action plan and review rows to scripts and
+# integrations. Rows go from Core SELECTs straight into dicts without ORM objects. A page or an ids=
+# batch costs one query per table (live, then the archive for ids not found there), plus the same
+# for each relationship named in fields=, however many entries it holds. Lookup names are joined
+# into the entry query only when requested. Field names belong to the API, so the columns behind
+# v1 can change.
+API_MAX_IDS = 200
+# API field -> entry column
+API_ENTRY_FIELDS = {
+    'id': 'id', 'status': 'status', 'date_created': 'date_created', 'updated_at': 'updated_at', 'version': 'version',
+    'project_id': 'ProjectNameAndNumber_id', 'region_id': 'Region_id', 'initiator_id': 'REXInitiator_id',
+    'discipline_id': 'REXOnDiscipline_id', 'initiating_discipline_id': 'REXInitiatingDiscipline_id',
+    'topic': 'REXOnTopic', 'description': 'REXDescription', 'impact': 'Impact',
+    'attachment_link': 'AttachmentLink', 'recommendation': 'Recommendation',
+}
+# API field -> (lookup model, entry column); the value is the lookup's name
+API_LOOKUP_FIELDS = {
+    'project': (Projectlist, 'ProjectNameAndNumber_id'), 'region': (Regionlist, 'Region_id'),
+    'initiator': (Employeelist, 'REXInitiator_id'), 'discipline': (Disciplinelist, 'REXOnDiscipline_id'),
+    'initiating_discipline': (Disciplinelist, 'REXInitiatingDiscipline_id'),
+}
+# API field -> (position in ARCHIVE_MODEL_SETS, {child field: column}); the entry's first row, or null
+API_CHILD_FIELDS = {
+    'committee': (1, {'id': 'id', 'date_created': 'date_created', 'member_id': 'ReviewCommiteeMember', 'decision': 'IsitREX',
+                      'further_analysis': 'Isfurtheranalysisrequired', 'mentor_id': 'Mentor', 'action_by_id': 'ActionBy',
+                      'qms_spoc_id': 'QMSSpoc', 'technology_id': 'Technology', 'comments': 'REXCommitteeComments'}),
+    'action_plan': (2, {'id': 'id', 'date_created': 'date_created', 'attendee_id': 'AttendeesOfRootCause', 'date': 'Date',
+                        'frequency_id': 'FrequesncyOfIssue', 'ehs_risk_id': 'EHSRisk', 'documents_link': 'AddDocumentsLink',
+                        'root_cause': 'RootCause', 'corrective_action': 'CorrectiveAction', 'document_to_update_id': 'DocummentToUpdate',
+                        'remarks': 'Remarks', 'attachment_link': 'AttachmentLink', 'manager_confirmed': 'ReportingManagerConfirmation'}),
+    'review': (3, {'id': 'id', 'date_created': 'date_created', 'remarks': 'Remarks'}),
+}
+API_DEFAULT_FIELDS = list(API_ENTRY_FIELDS) + ['archived']
+API_FIELDS = set(API_DEFAULT_FIELDS) | set(API_LOOKUP_FIELDS) | set(API_CHILD_FIELDS)
+
+def parse_api_fields(value):
+    if not value: return API_DEFAULT_FIELDS
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in API_FIELDS]
+    if unknown: raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(['id'] + fields))
+
+def api_value(value): return value.isoformat() if isinstance(value, date) else value
+
+def api_entry_statement(model, fields):
+    table = model.__table__
+    stmt = select(*[table.c[API_ENTRY_FIELDS[field]].label(field) for field in fields if field in API_ENTRY_FIELDS]).select_from(table)
+    for field in fields:
+        if field in API_LOOKUP_FIELDS:
+            lookup, column = API_LOOKUP_FIELDS[field]
+            alias = lookup.__table__.alias(f'api_{field}')
+            stmt = stmt.add_columns(alias.c.name.label(field)).outerjoin(alias, alias.c.id == table.c[column])
+    return stmt
+
+def read_api_entries(ids, fields):
+    """{id: serialized entry} for those of ids that exist, live or archived."""
+    entries, sources = {}, {}
+    for number, models in enumerate(ARCHIVE_MODEL_SETS):
+        missing = [id for id in ids if id not in entries]
+        if not missing: break
+        stmt = api_entry_statement(models[0], fields).where(models[0].__table__.c.id.in_(missing))
+        for row in db.session.execute(stmt):
+            entries[row.id] = {field: api_value(value) for field, value in row._mapping.items()}
+            sources[row.id] = number
+    for field in fields:
+        if field == 'archived':
+            for id, entry in entries.items(): entry[field] = sources[id] == 1
+        if field not in API_CHILD_FIELDS: continue
+        position, columns = API_CHILD_FIELDS[field]
+        for entry in entries.values(): entry[field] = None
+        for number, models in enumerate(ARCHIVE_MODEL_SETS):
+            parents = [id for id, source in sources.items() if source == number]
+            if not parents: continue
+            table = models[position].__table__
+            stmt = (select(table.c.parentid, *[table.c[column].label(name) for name, column in columns.items()])
+                    .where(table.c.parentid.in_(parents)).order_by(table.c.id))
+            for row in db.session.execute(stmt):
+                entry = entries[row.parentid]
+                if entry[field] is None: entry[field] = {name: api_value(row._mapping[name]) for name in columns}
+    return {id: {field: entry[field] for field in fields} for id, entry in entries.items()}
+
 # --- ROUTES ---
 @app.route('/')
+@replica_reads
+@conditional(listing_validators)
 def home():
-    ReturnOFExperienceList = Returnonexperienceentrymodel.query.order_by(Returnonexperienceentrymodel.date_created.desc()).all()
-    return render_template('home.html', ReturnOFExperienceList=ReturnOFExperienceList)
+    filters = parse_listing_filters(request.args)
+    sort, descending, per_page = parse_listing_order(request.args)
+    ReturnOFExperienceList, next_cursor = paginate_listing(
+        filters, sort, cursor=request.args.get('cursor'), per_page=per_page, descending=descending)
+    return render_page('home.html', ReturnOFExperienceList=ReturnOFExperienceList,
+                       next_cursor=next_cursor, filters=filters, sort=sort,
+                       order='desc' if descending else 'asc', status_choices=STATUS_CHOICES,
+                       region_choices=get_region_choices(), project_choices=get_projectname_choices(),
+                       discipline_choices=get_rexondiscipline_choices())
+
+@app.route('/export')
+@replica_reads
+def export():
+    file_format = request.args.get('format', 'csv')
+    if file_format not in ('csv', 'xlsx'): return 'Unsupported export format', 400
+    filename = f"rex_export_{datetime.utcnow():%Y%m%d_%H%M%S}.{file_format}"
+    if request.args.get('background') == '1':
+        return job_accepted(enqueue_job('export', dict(args=request.args.to_dict(), file_format=file_format, filename=filename)))
+    headers, stmt = export_statement(parse_listing_filters(request.args))
+    if file_format == 'xlsx':
+        body, mimetype = generate_xlsx(headers, stmt), XLSX_MIMETYPE
+    else:
+        body, mimetype = generate_csv(headers, stmt), 'text/csv'
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@app.route('/dashboard/summary')
+@replica_reads
+def dashboard_summary():
+    group_by = [d for d in request.args.get('group_by', ','.join(SUMMARY_DIMENSIONS)).split(',') if d in SUMMARY_DIMENSIONS]
+    filters = parse_listing_filters(request.args)
+    return jsonify(group_by=group_by, rows=read_status_summary(group_by, filters))
+
+@app.route('/dashboard/cycle-times')
+@replica_reads
+def dashboard_cycle_times():
+    """Time-in-state and creation-to-Closed percentiles (hours) and send-back rates over the last N months of transitions."""
+    group_by = [d for d in request.args.get('group_by', 'region,discipline').split(',') if d in ('region', 'discipline')]
+    filters = parse_listing_filters(request.args)
+    months = min(max(parse_int_arg(request.args.get('months')) or CYCLE_TIME_WINDOW_MONTHS, 1), 120)
+    if filters.get('date_from'):
+        since = date(filters['date_from'].year, filters['date_from'].month, 1)
+    else:
+        today = date.today()
+        start = today.year * 12 + today.month - months
+        since = date(start // 12, start % 12 + 1, 1)
+    return jsonify(group_by=group_by, since=since.isoformat(), unit='hours', rows=read_cycle_times(group_by, filters, since))
+
+@app.route('/search')
+@replica_reads
+def search():
+    q = request.args.get('q', '').strip()
+    page = max(parse_int_arg(request.args.get('page')) or 1, 1)
+    results, has_next = search_rex_entries(q, page)
+    if request.args.get('format') == 'json':
+        return jsonify(q=q, page=page, has_next=has_next,
+                       results=[dict(id=r['entry'].id, status=r['entry'].status, topic=r['entry'].REXOnTopic,
+                                     snippet=r['snippet'].striptags()) for r in results])
+    return render_template('search.html', q=q, page=page, has_next=has_next, results=results)
 
 @app.route('/create', methods=['GET', 'POST'])
 def Add():
     form = ReturnOFExperienceForm()
-    form.ProjectNameAndNumber.choices = get_projectname_choices()
     form.Region.choices = get_region_choices()
-    form.REXInitiator.choices = get_rexinitiator_choices()
     form.REXInitiatingDiscipline.choices = get_rexinitiatingdiscipline_choices()
     form.REXOnDiscipline.choices = get_rexondiscipline_choices()
     if request.method == 'POST':
@@ -331,6 +2702,7 @@ def Add():
                Recommendation=form.Recommendation.data
             )
             db.session.add(returnonexperienceentrymodel)
+            index_rex_entry(returnonexperienceentrymodel)
             db.session.commit()
             flash(f'Success! Your form has been submitted.', 'success')
             return redirect(url_for('home'))
@@ -341,8 +2713,36 @@ def Add():
     else:
         return render_template('Add.html', title="Return on Experience", form=form)
 
-def returnonexperiencedatalist(id):
-    Returnonexperience_item = Returnonexperienceentrymodel.query.get_or_404(id)
+# --- Update page aggregate ---
+def rex_aggregate_options():
+    model = Returnonexperienceentrymodel
+    return [
+        joinedload(model.project), joinedload(model.region), joinedload(model.initiator),
+        joinedload(model.initiating_discipline), joinedload(model.on_topic_discipline),
+        joinedload(model.rexcommitee).options(
+            joinedload(RexCommitteeModel.fourth_employeelist), joinedload(RexCommitteeModel.Mentor_employeelist),
+            joinedload(RexCommitteeModel.ActionBy_employeelist), joinedload(RexCommitteeModel.QMSSpoc_employeelist),
+            joinedload(RexCommitteeModel.technology)),
+        joinedload(model.actionplan).options(
+            joinedload(ActionPlanModel.AttendeesOfRootCause_employeelist), joinedload(ActionPlanModel.frequencyofissue),
+            joinedload(ActionPlanModel.ehsrisklist), joinedload(ActionPlanModel.documenttoupdatelist)),
+        joinedload(model.reviewByCommitteeModel),
+    ]
+
+def load_rex_aggregate(id, archived=False):
+    # Entry + its committee/action plan/review children and their lookups in a single SELECT.
+    # archived=True falls back to the (read-only) archive; the write routes leave it False.
+    entry = Returnonexperienceentrymodel.query.options(*rex_aggregate_options()).filter(Returnonexperienceentrymodel.id == id).first()
+    if entry is None and archived:
+        model = ArchivedEntry
+        entry = (model.query.options(joinedload(model.rexcommitee), joinedload(model.actionplan), joinedload(model.reviewByCommitteeModel))
+                 .filter(model.id == id).first())
+    if entry is None: abort(404)
+    return entry
+
+def first_child(children): return children[0] if children else None
+
+def returnonexperiencedatalist(Returnonexperience_item):
     returnOFExperienceform = ReturnOFExperienceForm(
         ProjectNameAndNumber=Returnonexperience_item.ProjectNameAndNumber_id,
         Region=Returnonexperience_item.Region_id,
@@ -355,53 +2755,48 @@ def returnonexperiencedatalist(id):
         AttachmentLink=Returnonexperience_item.AttachmentLink,
         Recommendation=Returnonexperience_item.Recommendation,
     ) 
-    returnOFExperienceform.ProjectNameAndNumber.choices =get_projectname_choices()
     returnOFExperienceform.Region.choices =get_region_choices()
-    returnOFExperienceform.REXInitiator.choices = get_rexinitiator_choices()
     returnOFExperienceform.REXInitiatingDiscipline.choices =get_rexinitiatingdiscipline_choices()
     returnOFExperienceform.REXOnDiscipline.choices = get_rexondiscipline_choices()
     return returnOFExperienceform
 
-def rexCommitteedatalist(id):
-    RexCommitteeModel_item = RexCommitteeModel.query.filter_by(parentid=id).first()
+def rexCommitteedatalist(Returnonexperience_item):
+    RexCommitteeModel_item = first_child(Returnonexperience_item.rexcommitee)
     rexCommitteeModelForm = RexCommitteeModelForm(obj=RexCommitteeModel_item) if RexCommitteeModel_item else RexCommitteeModelForm()
-    rexCommitteeModelForm.ReviewCommiteeMember.choices =get_reviewcommiteemember_choices()
-    rexCommitteeModelForm.Mentor.choices =get_mentor_choices()
-    rexCommitteeModelForm.ActionBy.choices =get_actionby_choices()
-    rexCommitteeModelForm.QMSSpoc.choices =get_qmsspoc_choices()
     rexCommitteeModelForm.Technology.choices =get_technology_choices()
     return rexCommitteeModelForm
 
-def actionplandatalist(id):
-    ActionPlanModel_item = ActionPlanModel.query.filter_by(parentid=id).first()
+def actionplandatalist(Returnonexperience_item):
+    ActionPlanModel_item = first_child(Returnonexperience_item.actionplan)
     actionPlanModelForm = ActionPlanForm(obj=ActionPlanModel_item) if ActionPlanModel_item else ActionPlanForm()
-    actionPlanModelForm.AttendeesOfRootCause.choices =get_attendeesofrootcause_choices()
     actionPlanModelForm.FrequesncyOfIssue.choices = get_frequencyofissue_choices()
     actionPlanModelForm.EHSRisk.choices = get_ehsrisk_choices()
     actionPlanModelForm.DocummentToUpdate.choices = get_documenttoupdate_choices()
     return actionPlanModelForm
 
-def reviewByCommitteedatalist(id):
-    ReviewByCommittee_item = ReviewByCommitteeModel.query.filter_by(parentid=id).first()
+def reviewByCommitteedatalist(Returnonexperience_item):
+    ReviewByCommittee_item = first_child(Returnonexperience_item.reviewByCommitteeModel)
     return ReviewByCommitteeForm(obj=ReviewByCommittee_item) if ReviewByCommittee_item else ReviewByCommitteeForm()
 
 @app.route('/update/<int:id>', methods=['GET', 'POST'])
+@replica_reads
+@conditional(entry_validators)
 def update(id):
-    Returnonexperience_item = Returnonexperienceentrymodel.query.get_or_404(id)
-    return render_template('Update.html', 
-                           returnOFExperienceform=returnonexperiencedatalist(id),
-                           rexCommitteeModelForm=rexCommitteedatalist(id),
-                           actionPlanModelForm=actionplandatalist(id),
-                           reviewByCommitteeForm=reviewByCommitteedatalist(id),
-                           status = Returnonexperience_item.status,id=id)
+    Returnonexperience_item = load_rex_aggregate(id, archived=True)
+    return render_page('Update.html',
+                       returnOFExperienceform=returnonexperiencedatalist(Returnonexperience_item),
+                       rexCommitteeModelForm=rexCommitteedatalist(Returnonexperience_item),
+                       actionPlanModelForm=actionplandatalist(Returnonexperience_item),
+                       reviewByCommitteeForm=reviewByCommitteedatalist(Returnonexperience_item),
+                       status = Returnonexperience_item.status,id=id,
+                       # A POST binds the forms to request.form, which must never be cached
+                       section_keys=update_section_keys(Returnonexperience_item) if request.method == 'GET' else {})
 
 @app.route('/updateRexEntry/<int:id>', methods=['POST'])
 def updateRexEntry(id):
-    RexCommitteeModel_item = Returnonexperienceentrymodel.query.get_or_404(id) 
+    RexCommitteeModel_item = load_rex_aggregate(id)
     returnOFExperienceform = ReturnOFExperienceForm()
-    returnOFExperienceform.ProjectNameAndNumber.choices =get_projectname_choices()
     returnOFExperienceform.Region.choices =get_region_choices()
-    returnOFExperienceform.REXInitiator.choices = get_rexinitiator_choices()
     returnOFExperienceform.REXInitiatingDiscipline.choices =get_rexinitiatingdiscipline_choices()
     returnOFExperienceform.REXOnDiscipline.choices = get_rexondiscipline_choices()
 
@@ -418,6 +2813,7 @@ def updateRexEntry(id):
             RexCommitteeModel_item.AttachmentLink = returnOFExperienceform.AttachmentLink.data
             RexCommitteeModel_item.Recommendation = returnOFExperienceform.Recommendation.data
             RexCommitteeModel_item.status = "RexCommitee"
+            index_rex_entry(RexCommitteeModel_item)
         try:
             db.session.commit()
             flash(f'Success! Your form has been submitted.', 'success')
@@ -429,21 +2825,16 @@ def updateRexEntry(id):
     else:
         print("Form not validated or GET request.")
         flash(f'Please fill required field.', 'danger')
-        Returnonexperience_item = Returnonexperienceentrymodel.query.get_or_404(id)
-        return render_template('update.html', rexCommitteeModelForm=rexCommitteedatalist(id),returnOFExperienceform=returnOFExperienceform,actionPlanModelForm=actionplandatalist(id),reviewByCommitteeForm=reviewByCommitteedatalist(id),status = Returnonexperience_item.status,id=id)
+        return render_template('Update.html', rexCommitteeModelForm=rexCommitteedatalist(RexCommitteeModel_item),returnOFExperienceform=returnOFExperienceform,actionPlanModelForm=actionplandatalist(RexCommitteeModel_item),reviewByCommitteeForm=reviewByCommitteedatalist(RexCommitteeModel_item),status = RexCommitteeModel_item.status,id=id)
 
 @app.route('/updateRexCommittee/<int:id>', methods=['POST'])
 def updateRexCommittee(id):
-    returnonexperienceentrymodel = Returnonexperienceentrymodel.query.get_or_404(id) 
+    returnonexperienceentrymodel = load_rex_aggregate(id)
     rexCommitteeModelForm = RexCommitteeModelForm()
-    rexCommitteeModelForm.ReviewCommiteeMember.choices =get_reviewcommiteemember_choices()
-    rexCommitteeModelForm.Mentor.choices =get_mentor_choices()
-    rexCommitteeModelForm.ActionBy.choices =get_actionby_choices()
-    rexCommitteeModelForm.QMSSpoc.choices =get_qmsspoc_choices()
     rexCommitteeModelForm.Technology.choices =get_technology_choices()
 
     if rexCommitteeModelForm.validate_on_submit():
-        RexCommitteeModel_item = RexCommitteeModel.query.filter_by(parentid=id).first()
+        RexCommitteeModel_item = first_child(returnonexperienceentrymodel.rexcommitee)
         def get_data_or_none(field_data): return field_data if field_data not in ('', None) else None
 
         Isfurtheranalysisrequired = get_data_or_none(rexCommitteeModelForm.Isfurtheranalysisrequired.data)
@@ -474,6 +2865,7 @@ def updateRexCommittee(id):
                REXCommitteeComments = rexCommitteeModelForm.REXCommitteeComments.data,
             )
             db.session.add(RexCommittee_item)
+        index_rex_entry(returnonexperienceentrymodel)
             
         if rexCommitteeModelForm.IsitREX.data == 'Yes': returnonexperienceentrymodel.status = 'ActinPlan'
         elif rexCommitteeModelForm.IsitREX.data == 'No': returnonexperienceentrymodel.status = 'Rejected'
@@ -490,23 +2882,21 @@ def updateRexCommittee(id):
     else:
         print("Form not validated.")
         flash(f'Please fill required field.', 'danger')
-        Returnonexperience_item = Returnonexperienceentrymodel.query.get_or_404(id)
-        return render_template('update.html', rexCommitteeModelForm=rexCommitteeModelForm,returnOFExperienceform=returnonexperiencedatalist(id),actionPlanModelForm=actionplandatalist(id),reviewByCommitteeForm=reviewByCommitteedatalist(id),status = Returnonexperience_item.status,id=id)
+        return render_template('Update.html', rexCommitteeModelForm=rexCommitteeModelForm,returnOFExperienceform=returnonexperiencedatalist(returnonexperienceentrymodel),actionPlanModelForm=actionplandatalist(returnonexperienceentrymodel),reviewByCommitteeForm=reviewByCommitteedatalist(returnonexperienceentrymodel),status = returnonexperienceentrymodel.status,id=id)
 
 @app.route('/updatActionPlan/<int:id>', methods=['POST'])
 def updatActionPlan(id):
-    returnonexperienceentrymodel = Returnonexperienceentrymodel.query.get_or_404(id) 
-    RexCommitteeModel_item = RexCommitteeModel.query.filter_by(parentid=id).first()
+    returnonexperienceentrymodel = load_rex_aggregate(id)
+    RexCommitteeModel_item = first_child(returnonexperienceentrymodel.rexcommitee)
     Isfurtheranalysisrequired = RexCommitteeModel_item.Isfurtheranalysisrequired
     actionPlanModelForm = ActionPlanForm(external_Isfurtheranalysisrequired_Plan = Isfurtheranalysisrequired,formdata=request.form) 
 
-    actionPlanModelForm.AttendeesOfRootCause.choices =get_attendeesofrootcause_choices()
     actionPlanModelForm.FrequesncyOfIssue.choices = get_frequencyofissue_choices()
     actionPlanModelForm.EHSRisk.choices = get_ehsrisk_choices()
     actionPlanModelForm.DocummentToUpdate.choices = get_documenttoupdate_choices()
     
     if actionPlanModelForm.validate_on_submit():
-        ActionPlanModel_item = ActionPlanModel.query.filter_by(parentid=id).first()
+        ActionPlanModel_item = first_child(returnonexperienceentrymodel.actionplan)
         def get_data_or_none(field_data): return field_data if field_data not in ('', None) else None
         AttendeesOfRootCause = get_data_or_none(actionPlanModelForm.AttendeesOfRootCause.data)
         FrequesncyOfIssue = get_data_or_none(actionPlanModelForm.FrequesncyOfIssue.data)
@@ -541,6 +2931,7 @@ def updatActionPlan(id):
                ReportingManagerConfirmation = actionPlanModelForm.ReportingManagerConfirmation.data
             )
             db.session.add(ActionPlan_item)
+        index_rex_entry(returnonexperienceentrymodel)
         try:
             returnonexperienceentrymodel.status = 'ReviewByCommittee'
             db.session.commit()
@@ -553,8 +2944,7 @@ def updatActionPlan(id):
     else:
         print("Form not validated.")
         flash(f'Please fill required field.', 'danger')
-        Returnonexperience_item = Returnonexperienceentrymodel.query.get_or_404(id)
-        return render_template('update.html', rexCommitteeModelForm=rexCommitteedatalist(id),returnOFExperienceform=returnonexperiencedatalist(id),actionPlanModelForm=actionPlanModelForm,reviewByCommitteeForm=reviewByCommitteedatalist(id),status = Returnonexperience_item.status,id=id)
+        return render_template('Update.html', rexCommitteeModelForm=rexCommitteedatalist(returnonexperienceentrymodel),returnOFExperienceform=returnonexperiencedatalist(returnonexperienceentrymodel),actionPlanModelForm=actionPlanModelForm,reviewByCommitteeForm=reviewByCommitteedatalist(returnonexperienceentrymodel),status = returnonexperienceentrymodel.status,id=id)
 
 @app.route('/updatReviewByCommittee/<int:id>', methods=['POST'])
 def updatReviewByCommittee(id):
@@ -583,15 +2973,207 @@ def updatReviewByCommittee(id):
     else:
         return render_template('Update.html')    
 
+# --- Bulk workflow transitions ---
+# Committees decide many entries after a meeting. Each item is checked with the same form and
+# validation rules as the single-entry routes. Choice lists are read once per batch, and the entries
+# and their child rows come from two queries. Every valid item is then written with executemany
+# statements in one transaction. Core writes skip the ORM flush hooks, so this code updates the
+# summary, transition log, search document, entry version and data version itself.
+BULK_MAX_ITEMS = 200
+COMMITTEE_DECISIONS = {'Yes': 'ActinPlan', 'No': 'Rejected', 'Required more details': 'RexEntry'}
+REVIEW_DECISIONS = {'close': 'Closed', 'sendback': 'ActinPlan'}
+
+def bulk_item_formdata(item):
+    return MultiDict({key: '' if value is None else str(value) for key, value in item.items() if key != 'id'})
+
+def committee_transition(item):
+    form = RexCommitteeModelForm(formdata=bulk_item_formdata(item), meta=dict(csrf=False))
+    form.Technology.choices = get_technology_choices()
+    if not form.validate(): return None, form.errors
+    def id_or_none(value): return int(value) if value not in ('', None) else None
+    return COMMITTEE_DECISIONS[form.IsitREX.data], dict(
+        ReviewCommiteeMember=int(form.ReviewCommiteeMember.data), IsitREX=form.IsitREX.data,
+        Isfurtheranalysisrequired=form.Isfurtheranalysisrequired.data or None, Mentor=id_or_none(form.Mentor.data),
+        ActionBy=id_or_none(form.ActionBy.data), QMSSpoc=id_or_none(form.QMSSpoc.data),
+        Technology=id_or_none(form.Technology.data), REXCommitteeComments=form.REXCommitteeComments.data)
+
+def review_transition(item):
+    form = ReviewByCommitteeForm(formdata=bulk_item_formdata(dict(Remarks=item.get('Remarks'))), meta=dict(csrf=False))
+    errors = {} if form.validate() else dict(form.errors)
+    if item.get('decision') not in REVIEW_DECISIONS: errors['decision'] = [f"Must be one of: {', '.join(REVIEW_DECISIONS)}."]
+    if errors: return None, errors
+    return REVIEW_DECISIONS[item['decision']], dict(Remarks=form.Remarks.data)
+
+# stage: (status the entry must be in, child model, relationship to it, transition, {search column: child field})
+BULK_STAGES = {
+    'committee': ('RexCommitee', RexCommitteeModel, 'rexcommitee', committee_transition, {'committee_comments': 'REXCommitteeComments'}),
+    'review': ('ReviewByCommittee', ReviewByCommitteeModel, 'reviewByCommitteeModel', review_transition, {}),
+}
+
+def parse_bulk_items(body):
+    items, defaults = body.get('items'), body.get('defaults') or {}
+    if not isinstance(items, list) or not items: raise ValueError('"items" must be a non-empty list')
+    if len(items) > BULK_MAX_ITEMS: raise ValueError(f'At most {BULK_MAX_ITEMS} items per request')
+    if not isinstance(defaults, dict) or not all(isinstance(item, dict) for item in items):
+        raise ValueError('"defaults" and every item must be JSON objects')
+    # Shared fields (the committee member, a common comment) can be sent once in "defaults"
+    return [dict(defaults, **item) for item in items]
+
+def apply_bulk_transitions(stage, items, changed_by=None):
+    expected, child_model, relationship, transition, search_fields = BULK_STAGES[stage]
+    model = Returnonexperienceentrymodel
+    ids = [parse_int_arg(str(item.get('id', ''))) for item in items]
+    # Locked until the commit on MySQL, so the status checked below is the one the UPDATE changes
+    entries = {e.id: e for e in model.query.options(selectinload(getattr(model, relationship)))
+               .filter(model.id.in_([id for id in ids if id is not None])).with_for_update()}
+    now = datetime.utcnow()
+    results, seen = [], set()
+    inserts, updates, transitions, documents, events = [], [], [], [], []
+    deltas = Counter()
+    for entry_id, item in zip(ids, items):
+        entry = entries.get(entry_id)
+        if entry_id is None or entry_id in seen: errors = {'id': ['Missing or repeated entry id.']}
+        elif entry is None: errors = {'id': ['Entry not found.']}
+        elif entry.status != expected: errors = {'id': [f'Entry is at {entry.status}, not {expected}.']}
+        else:
+            status, values = transition(item)
+            errors = None if status else values
+        seen.add(entry_id)
+        if errors:
+            results.append(dict(id=entry_id, ok=False, errors=errors))
+            continue
+        child = first_child(getattr(entry, relationship))
+        if child: updates.append(dict({'b_' + name: value for name, value in values.items()}, b_id=child.id))
+        else: inserts.append(dict(values, parentid=entry.id, date_created=now))
+        transitions.append(dict(b_id=entry.id, b_expected=expected, b_status=status, b_now=now))
+        events.append(transition_event(entry, entry.status, status, now, changed_by))
+        if search_fields: documents.append(dict({'b_' + column: values[field] for column, field in search_fields.items()}, b_id=entry.id))
+        deltas[entry_summary_key(entry)] -= 1
+        deltas[summary_key(status, entry.Region_id, entry.REXOnDiscipline_id, entry.date_created)] += 1
+        results.append(dict(id=entry_id, ok=True, status=status))
+    if transitions:
+        connection = db.session.connection()
+        child_table, entry_table, document_table = child_model.__table__, model.__table__, RexSearchDocument.__table__
+        # SQLite takes no row locks, so an entry can still have moved on since it was read: then nothing is written
+        moved = connection.execute(sa_update(entry_table).where(entry_table.c.id == bindparam('b_id'), entry_table.c.status == bindparam('b_expected'))
+                                   .values(status=bindparam('b_status'), version=entry_table.c.version + 1, updated_at=bindparam('b_now')), transitions)
+        if moved.rowcount not in (-1, len(transitions)):
+            db.session.rollback()
+            conflict = {'id': [f'Entry left {expected} while the batch was saved; retry.']}
+            results = [dict(id=r['id'], ok=False, errors=conflict) if r['ok'] else r for r in results]
+            return dict(stage=stage, applied=0, failed=len(results), results=results)
+        if inserts: connection.execute(sa_insert(child_table), inserts)
+        if updates:
+            columns = [name[2:] for name in updates[0] if name != 'b_id']
+            connection.execute(sa_update(child_table).where(child_table.c.id == bindparam('b_id'))
+                               .values({name: bindparam('b_' + name) for name in columns}), updates)
+        if documents:
+            connection.execute(sa_update(document_table).where(document_table.c.entry_id == bindparam('b_id'))
+                               .values({column: bindparam('b_' + column) for column in search_fields}), documents)
+        apply_summary_deltas(connection, deltas)
+        record_transitions(connection, events)
+        advance_data_versions(connection, {'entries'})
+    db.session.commit()
+    applied = len(transitions)
+    return dict(stage=stage, applied=applied, failed=len(results) - applied, results=results)
+
+@job_handler('bulk_transition')
+def bulk_transition_job(job, stage, items):
+    return apply_bulk_transitions(stage, items, changed_by=job.created_by)
+
+@app.route('/bulk/<stage>', methods=['POST'])
+def bulk_transition(stage):
+    """Apply committee decisions or review closures to many entries; see BULK_STAGES for the item fields."""
+    if stage not in BULK_STAGES: return jsonify(error=f'Unknown stage "{stage}"'), 404
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict): return jsonify(error='Expected a JSON object'), 400
+    if app.config.get('WTF_CSRF_ENABLED', True):
+        try:
+            validate_csrf(request.headers.get('X-CSRFToken') or body.get('csrf_token'))
+        except ValidationError as e:
+            return jsonify(error=str(e)), 400
+    try:
+        items = parse_bulk_items(body)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    if body.get('background'): return job_accepted(enqueue_job('bulk_transition', dict(stage=stage, items=items)))
+    try:
+        return jsonify(apply_bulk_transitions(stage, items, changed_by=get_current_user_email()))
+    except Exception:
+        db.session.rollback()
+        app.logger.exception(json.dumps(dict(event='bulk_transition_failed', stage=stage, items=len(items))))
+        return jsonify(error='There was an issue saving to the database.'), 500
+
 @app.route('/delete/<int:id>')
 def delete(id):
     task = Returnonexperienceentrymodel.query.get_or_404(id) 
     try:
+        # One DELETE: the database cascades to the committee, action plan and review rows
         db.session.delete(task)
+        unlink_entries(db.session.connection(), [id])
         db.session.commit()
         return redirect(url_for('home'))
     except Exception: return 'There was a problem deleting'
 
+@app.route('/admin/import/<lookup>', methods=['POST'])
+def import_lookup(lookup):
+    model = LOOKUP_IMPORT_MODELS.get(lookup)
+    if model is None: return jsonify(error=f'Unknown lookup "{lookup}"'), 404
+    if 'file' not in request.files: return jsonify(error='No file part'), 400
+    try:
+        counts = import_lookup_csv(model, io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig'))
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return jsonify(error=str(e)), 400
+    except Exception:
+        db.session.rollback()
+        app.logger.exception(json.dumps(dict(event='lookup_import_failed', lookup=lookup)))
+        return jsonify(error='There was an issue importing the file'), 500
+    return jsonify(lookup=lookup, **counts)
+
+@app.route('/lookup/<name>')
+@replica_reads
+def lookup_search(name):
+    model = LOOKUP_IMPORT_MODELS.get(name)
+    if model is None: return jsonify(error=f'Unknown lookup "{name}"'), 404
+    limit = min(parse_int_arg(request.args.get('limit')) or LOOKUP_SEARCH_LIMIT, LOOKUP_SEARCH_MAX)
+    matches, more = lookup_index(model).search(request.args.get('q', ''), limit)
+    response = jsonify(results=[dict(id=id, name=label) for id, label in matches], more=more)
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
+
+@app.route('/api/v1/entries')
+@replica_reads
+def api_entries():
+    """Entries as JSON: ids=1,2,3 fetches a batch, otherwise the listing's filters, sort and cursor apply."""
+    try:
+        fields = parse_api_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    if request.args.get('ids'):
+        ids = [parse_int_arg(value) for value in request.args['ids'].split(',')]
+        if None in ids: return jsonify(error='"ids" must be comma-separated integers'), 400
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > API_MAX_IDS: return jsonify(error=f'At most {API_MAX_IDS} ids per request'), 400
+        entries = read_api_entries(ids, fields)
+        return jsonify(data=[entries[id] for id in ids if id in entries], missing=[id for id in ids if id not in entries])
+    sort, descending, per_page = parse_listing_order(request.args)
+    keys, next_cursor = listing_page_keys(parse_listing_filters(request.args), sort, request.args.get('cursor'), per_page, descending)
+    entries = read_api_entries([id for _, id in keys], fields)
+    return jsonify(data=[entries[id] for _, id in keys if id in entries], next_cursor=next_cursor)
+
+@app.route('/api/v1/entries/<int:id>')
+@replica_reads
+def api_entry(id):
+    try:
+        fields = parse_api_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    entry = read_api_entries([id], fields).get(id)
+    if entry is None: return jsonify(error='Entry not found'), 404
+    return jsonify(data=entry)
+
 @app.route('/upload', methods=['GET'])
 def upload_view(): return render_template('upload.html')
 
@@ -601,25 +3183,266 @@ def upload_file():
     file = request.files['file']
     if file.filename == '': flash('No selected file'); return redirect(request.url)
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
         # WARNING: This saves to ephemeral storage!
-        file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+        attachment = create_attachment([file.stream], file.filename, entry_id=parse_int_arg(request.form.get('entry_id')))
         flash('File uploaded successfully')
-        return render_template('upload.html', filename=file.filename)
+        return render_template('upload.html', attachment=attachment)
     else:
         flash('Invalid file type'); return redirect(request.url)
 
+# --- Attachment store ---
+ATTACHMENT_PAGE_SIZE = 50
+ATTACHMENT_MAX_AGE = 365 * 24 * 60 * 60
+# Only these are shown in the browser; every other upload is sent as a download
+ATTACHMENT_INLINE_TYPES = {'image/png', 'image/jpeg', 'image/gif'}
+
+def blob_root(): return os.path.join(app.config['UPLOAD_FOLDER'], 'blobs')
+
+def blob_path(sha256): return os.path.join(blob_root(), sha256[:2], sha256[2:4], sha256)
+
+def store_blob(sources):
+    # Hash while copying to a temp file; the digest names the blob, so identical content is kept once.
+    os.makedirs(blob_root(), exist_ok=True)
+    tmp_path = os.path.join(blob_root(), f'.{uuid.uuid4().hex}.tmp')
+    digest, size = hashlib.sha256(), 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            for source in sources:
+                while True:
+                    block = source.read(FLOW_COPY_BUFFER)
+                    if not block: break
+                    digest.update(block)
+                    size += len(block)
+                    out.write(block)
+        sha256 = digest.hexdigest()
+        path = blob_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return sha256, size
+    finally:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+def attachment_mime_type(name):
+    # From the (whitelisted) extension, never from the Content-Type the client declared
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+def create_attachment(sources, original_name, entry_id=None, expected_size=None, uploaded_by=None):
+    sha256, size = store_blob(sources)
+    if expected_size is not None and size != expected_size: raise ValueError('Assembled size mismatch')
+    if entry_id is not None and db.session.get(Returnonexperienceentrymodel, entry_id) is None and db.session.get(ArchivedEntry, entry_id) is None:
+        entry_id = None
+    attachment = Attachment(
+        sha256=sha256, original_name=original_name[:255], size=size,
+        mime_type=attachment_mime_type(original_name),
+        uploaded_by=uploaded_by or get_current_user_email(), entry_id=entry_id)
+    db.session.add(attachment)
+    db.session.commit()
+    return attachment
+
+# --- Chunked uploads (flow.js protocol) ---
+# GET tests whether a chunk is already stored; POST stores one chunk (multipart or raw "octet" body);
+# the request that completes the set assembles the file. Chunks live under
+# UPLOAD_FOLDER/.chunks/<hash of the user and flowIdentifier>.
+FLOW_COPY_BUFFER = 64 * 1024
+
+class FlowError(Exception):
+    def __init__(self, message, status=400):
+        super(FlowError, self).__init__(message)
+        self.status = status
+
+def flow_upload_key(identifier):
+    # flow.js builds identifiers from the file's size and name, so they are only unique per user
+    return hashlib.sha256(f'{get_current_user_email()}\0{identifier}'.encode('utf-8')).hexdigest()
+
+def flow_chunk_name(number): return f'{number:06d}.part'
+
+def flow_chunk_dir(key):
+    return os.path.join(app.config['UPLOAD_FOLDER'], '.chunks', key)
+
+def flow_chunk_path(key, number):
+    return os.path.join(flow_chunk_dir(key), flow_chunk_name(number))
+
+def parse_flow_params(values):
+    identifier = re.sub(r'[^\w.-]', '', values.get('flowIdentifier', ''))[:128]
+    filename = values.get('flowFilename', '')
+    chunk_number = parse_int_arg(values.get('flowChunkNumber'))
+    total_chunks = parse_int_arg(values.get('flowTotalChunks'))
+    total_size = parse_int_arg(values.get('flowTotalSize'))
+    chunk_size = parse_int_arg(values.get('flowCurrentChunkSize'))
+    if not identifier or not filename or None in (chunk_number, total_chunks, total_size, chunk_size):
+        raise FlowError('Missing flow.js parameters')
+    if not allowed_file(filename): raise FlowError('Invalid file type', 415)
+    if total_size > app.config['UPLOAD_MAX_FILE_SIZE']: raise FlowError('File too large', 413)
+    if not 1 <= chunk_number <= total_chunks or chunk_size < 0 or chunk_size > app.config['MAX_CONTENT_LENGTH']:
+        raise FlowError('Invalid chunk')
+    return dict(key=flow_upload_key(identifier), filename=filename, chunk_number=chunk_number,
+                total_chunks=total_chunks, total_size=total_size, chunk_size=chunk_size,
+                entry_id=parse_int_arg(values.get('entry_id')))
+
+def write_flow_chunk(params, source):
+    # Copy through a small buffer into a temp name, then rename: a dropped connection never
+    # leaves a truncated chunk that a later GET test would report as present.
+    os.makedirs(flow_chunk_dir(params['key']), exist_ok=True)
+    path = flow_chunk_path(params['key'], params['chunk_number'])
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            while True:
+                block = source.read(FLOW_COPY_BUFFER)
+                if not block: break
+                written += len(block)
+                if written > params['chunk_size']: raise FlowError('Chunk larger than declared')
+                out.write(block)
+        if written != params['chunk_size']: raise FlowError('Incomplete chunk')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+def assemble_flow_upload(params):
+    chunk_dir = flow_chunk_dir(params['key'])
+    parts = [flow_chunk_name(number) for number in range(1, params['total_chunks'] + 1)]
+    stored = {name for name in os.listdir(chunk_dir) if name.endswith('.part')}
+    if not stored.issuperset(parts): return None
+    if len(stored) > len(parts):
+        # Chunks of an earlier attempt that declared more of them: the file cannot be trusted
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        raise FlowError('Chunks do not match flowTotalChunks; upload the file again')
+    # O_EXCL lock file: only one thread/worker assembles even if the last chunks arrive together.
+    try:
+        os.close(os.open(os.path.join(chunk_dir, '.assembling'), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return None
+    try:
+        with ExitStack() as stack:
+            sources = [stack.enter_context(open(os.path.join(chunk_dir, name), 'rb')) for name in parts]
+            return create_attachment(sources, params['filename'], entry_id=params.get('entry_id'),
+                                     expected_size=params['total_size'])
+    except ValueError as e:
+        raise FlowError(str(e))
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+def purge_stale_flow_chunks():
+    root = os.path.join(app.config['UPLOAD_FOLDER'], '.chunks')
+    cutoff = time.time() - app.config['UPLOAD_CHUNK_TTL']
+    for name in os.listdir(root) if os.path.isdir(root) else []:
+        path = os.path.join(root, name)
+        if os.path.getmtime(path) < cutoff: shutil.rmtree(path, ignore_errors=True)
+
+@app.route('/upload/chunk', methods=['GET', 'POST'])
+def upload_chunk():
+    try:
+        if request.method == 'GET':
+            params = parse_flow_params(request.args)
+            exists = os.path.exists(flow_chunk_path(params['key'], params['chunk_number']))
+            return ('', 200) if exists else ('', 204)
+        if request.mimetype == 'multipart/form-data':
+            params = parse_flow_params(request.form)
+            if 'file' not in request.files: raise FlowError('No file part')
+            source = request.files['file'].stream
+        else:
+            params = parse_flow_params(request.args)
+            source = request.stream
+        if params['chunk_number'] == 1: purge_stale_flow_chunks()
+        write_flow_chunk(params, source)
+        attachment = assemble_flow_upload(params)
+    except FlowError as e:
+        return jsonify(error=str(e)), e.status
+    if attachment is None: return jsonify(complete=False, filename=None)
+    return jsonify(complete=True, filename=attachment.sha256, name=attachment.original_name, id=attachment.id)
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    if not re.fullmatch(r'[0-9a-f]{64}', filename):
+        # Files saved by name before the content-addressed store
+        response = send_from_directory(app.config['UPLOAD_FOLDER'], filename,
+                                       as_attachment=attachment_mime_type(filename) not in ATTACHMENT_INLINE_TYPES)
+        response.headers['X-Content-Type-Options'] = 'nosniff'
+        return response
+    # The first upload of the content names it, so later uploads of the same bytes never change a link
+    attachment = Attachment.query.filter_by(sha256=filename).order_by(Attachment.id).first_or_404()
+    path = blob_path(filename)
+    if not os.path.exists(path): abort(404)
+    # The type comes from the name again, so rows stored with a client-declared type are served safely too
+    mime_type = attachment_mime_type(attachment.original_name)
+    # Content never changes for a given hash: strong ETag, Range via conditional=True, cache for a year.
+    # Uploads are users' files, so only the browser keeps them, never a shared cache.
+    response = send_file(path, mimetype=mime_type, download_name=attachment.original_name,
+                         as_attachment=mime_type not in ATTACHMENT_INLINE_TYPES,
+                         etag=filename, conditional=True, max_age=ATTACHMENT_MAX_AGE)
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.cache_control.public = False  # send_file sets it along with max_age
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/assets/<path:filename>')
+def built_asset(filename):
+    path = safe_join(ASSET_BUILD_DIR, filename)
+    if path is None or not os.path.isfile(path): abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[name] and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, name
+            break
+    # Names are content-hashed, so a given URL never changes: cache for a year and skip revalidation.
+    response = send_file(path, mimetype=mimetype, conditional=True, max_age=ASSET_MAX_AGE)
+    if encoding: response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/view_files')
+@replica_reads
 def view_files():
+    entry_id = parse_int_arg(request.args.get('entry_id'))
+    query = Attachment.query.filter_by(entry_id=entry_id) if entry_id else Attachment.query
+    files, next_cursor = paginate_keyset(query, [Attachment.date_created, Attachment.id], lambda a: [a.date_created, a.id],
+                                         cursor=request.args.get('cursor'), per_page=ATTACHMENT_PAGE_SIZE)
+    return render_template('view_files.html', files=files, next_cursor=next_cursor, entry_id=entry_id)
+
+@app.route('/metrics')
+def metrics():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/healthz/db')
+def db_health():
+    state = dict(pool=pool_state(db.engine), metrics=pool_metrics.stats(),
+                 workers=GUNICORN_WORKERS, threads=GUNICORN_THREADS)
+    started = time.perf_counter()
     try:
-        files = os.listdir(app.config['UPLOAD_FOLDER'])
-    except:
-        files = []
-    return render_template('view_files.html', files=files)
+        with db.engine.connect() as connection: connection.execute(text('SELECT 1'))
+    except Exception as e:
+        return jsonify(ok=False, error=type(e).__name__, **state), 503
+    ping_ms = round((time.perf_counter() - started) * 1000, 2)
+    if DATABASE_REPLICA_URL:
+        # A failing replica only degrades reads to the primary, so it does not fail the check.
+        state['replica'] = replica_monitor.stats()
+    return jsonify(ok=True, ping_ms=ping_ms, **state)
+
+@app.route('/jobs')
+def list_jobs():
+    query = Job.query.filter_by(created_by=get_current_user_email())
+    if request.args.get('status'): query = query.filter_by(status=request.args['status'])
+    return jsonify(jobs=[job_status_dict(job) for job in query.order_by(Job.id.desc()).limit(50)])
+
+@app.route('/jobs/<int:id>')
+def job_status(id):
+    job = Job.query.get_or_404(id)
+    response = jsonify(job_status_dict(job))
+    if job.status in ('queued', 'running'): response.headers['Retry-After'] = str(max(1, round(JOB_POLL_INTERVAL)))
+    response.cache_control.no_store = True
+    return response
+
+@app.route('/healthz/jobs')
+def job_health(): return jsonify(runner=job_runner.stats(), queue=job_queue_depth())
+
+@app.route('/healthz/cache')
+def cache_stats(): return jsonify(choices=choice_cache.stats(), fragments=fragment_cache.stats())
 
 @app.errorhandler(404)
 def not_found_error(error): return render_template('404.html'), 404
@@ -629,7 +3452,361 @@ def internal_error(error):
     db.session.rollback()
     return render_template('500.html'), 500
 
+@app.cli.command('import-lookup')
+@click.argument('lookup', type=click.Choice(sorted(LOOKUP_IMPORT_MODELS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True)
+def import_lookup_command(lookup, path, batch_size):
+    """Bulk-load a lookup table from a CSV with a "name" (and optional "id") column."""
+    started = time.perf_counter()
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        counts = import_lookup_csv(LOOKUP_IMPORT_MODELS[lookup], handle, batch_size)
+    print(f"{lookup}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} skipped in {time.perf_counter() - started:.2f}s")
+
+@app.cli.command('rebuild-workflow-summary')
+@click.option('--check', is_flag=True, help='Only compare the summary with a full recompute.')
+def rebuild_workflow_summary_command(check):
+    """Recompute rex_status_summary from the live and archived entries and report any drift."""
+    expected = recompute_status_summary()
+    stored = Counter({(r.status, r.region_id, r.discipline_id, r.month): r.entry_count
+                      for r in RexStatusSummary.query.filter(RexStatusSummary.entry_count != 0)})
+    drift = {key: (stored.get(key, 0), expected.get(key, 0)) for key in set(stored) | set(expected) if stored.get(key, 0) != expected.get(key, 0)}
+    for key, (have, want) in sorted(drift.items(), key=lambda item: str(item[0])):
+        print(f"{key}: summary={have} actual={want}")
+    print(f"{len(drift)} mismatched cells out of {len(expected)}")
+    if check:
+        if drift: raise SystemExit(1)
+        return
+    db.session.execute(sa_delete(RexStatusSummary.__table__))
+    apply_summary_deltas(db.session.connection(), expected)
+    db.session.commit()
+    print("Summary rebuilt")
+
+@app.cli.command('rebuild-transition-stats')
+@click.option('--check', is_flag=True, help='Only compare the stored aggregates with a recompute from the log.')
+def rebuild_transition_stats_command(check):
+    """Recompute rex_transition_summary and rex_duration_histogram from the transition log and report any drift."""
+    expected_counts, expected_samples = recompute_transition_stats()
+    summary, histogram = RexTransitionSummary, RexDurationHistogram
+    stored_counts = Counter({(r.from_status, r.to_status, r.region_id, r.discipline_id, r.month): r.transition_count
+                             for r in summary.query.filter(summary.transition_count != 0)})
+    stored_samples = Counter({(r.metric, r.region_id, r.discipline_id, r.month, r.bucket): r.sample_count
+                              for r in histogram.query.filter(histogram.sample_count != 0)})
+    drift = 0
+    for stored, expected in ((stored_counts, expected_counts), (stored_samples, expected_samples)):
+        for key in sorted(set(stored) | set(expected), key=str):
+            if stored.get(key, 0) != expected.get(key, 0):
+                drift += 1
+                print(f"{key}: stored={stored.get(key, 0)} actual={expected.get(key, 0)}")
+    print(f"{drift} mismatched cells out of {len(expected_counts) + len(expected_samples)}")
+    if check:
+        if drift: raise SystemExit(1)
+        return
+    db.session.execute(sa_delete(summary.__table__))
+    db.session.execute(sa_delete(histogram.__table__))
+    apply_transition_stats(db.session.connection(), expected_counts, expected_samples)
+    db.session.commit()
+    print("Transition stats rebuilt")
+
+@app.cli.command('rebuild-search-index')
+@click.option('--batch-size', default=500, show_default=True)
+def rebuild_search_index_command(batch_size):
+    """Recreate every search document from its live or archived entry (run after restoring data)."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        for ddl in SQLITE_SEARCH_DDL: db.session.execute(text(ddl))
+    total = 0
+    for model in (Returnonexperienceentrymodel, ArchivedEntry):
+        last_id = 0
+        while True:
+            batch = (model.query.options(selectinload(model.rexcommitee), selectinload(model.actionplan), selectinload(model.search_document))
+                     .filter(model.id > last_id).order_by(model.id).limit(batch_size).all())
+            if not batch: break
+            for entry in batch: index_rex_entry(entry)
+            db.session.commit()
+            last_id, total = batch[-1].id, total + len(batch)
+    if db.session.get_bind().dialect.name == 'sqlite':
+        db.session.execute(text("INSERT INTO rex_search_fts(rex_search_fts) VALUES ('rebuild')"))
+        db.session.commit()
+    print(f"Indexed {total} entries")
+
+@app.cli.command('archive-entries')
+@click.option('--older-than-days', default=ARCHIVE_AFTER_DAYS, show_default=True, help='Days since the entry last changed.')
+@click.option('--batch-size', default=ARCHIVE_BATCH_SIZE, show_default=True)
+def archive_entries_command(older_than_days, batch_size):
+    """Move Closed and Rejected entries and their children to the archive tables."""
+    started = time.perf_counter()
+    moved = archive_entries(older_than_days, batch_size, progress=lambda n: print(f"  {n} archived", end='\r'))
+    print(f"Archived {moved} entries in {time.perf_counter() - started:.1f}s")
+
+@app.cli.command('purge-archive')
+@click.option('--older-than-days', type=int, required=True, help='Days since the entry was archived.')
+@click.option('--batch-size', default=ARCHIVE_BATCH_SIZE, show_default=True)
+def purge_archive_command(older_than_days, batch_size):
+    """Delete archived entries (their children cascade) and their search documents for good."""
+    started = time.perf_counter()
+    purged = purge_archived_entries(older_than_days, batch_size, progress=lambda n: print(f"  {n} purged", end='\r'))
+    print(f"Purged {purged} archived entries in {time.perf_counter() - started:.1f}s")
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Fingerprint and precompress the static files the templates reference (run at image build)."""
+    result = build_assets()
+    for filename in result['missing']: print(f"missing: {filename}")
+    print(f"Built {result['files']} assets ({result['bytes'] / 1024:.0f} KiB) into {ASSET_BUILD_DIR}"
+          f"{'' if result['brotli'] else ' (brotli not installed: .gz only)'}")
+
+@app.cli.command('run-jobs')
+@click.option('--threads', default=max(JOB_WORKER_THREADS, 1), show_default=True)
+def run_jobs_command(threads):
+    """Run a background job worker in the foreground (for `flask run`, which starts none)."""
+    runner = JobRunner(threads).start()
+    print(f"Job worker {runner.worker_id} running {threads} threads; Ctrl+C to stop")
+    try:
+        while True: time.sleep(1)
+    except KeyboardInterrupt:
+        runner.stop()
+
+# --- Query plan check ---
+# Run with `flask --app app check-query-plans` against a migrated database. Each check explains the
+# statement a route actually issues and fails if the expected index does not appear in the plan.
+def explain_plan(statement):
+    connection = db.session.connection()
+    dialect = connection.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        return [row.detail for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql)]
+    rows = connection.exec_driver_sql('EXPLAIN ' + sql).mappings().all()
+    return [f"{row['table']}: type={row['type']} key={row['key']}" for row in rows]
+
+def listing_plan_statement(filters, sort='date', cursor_values=None, model=Returnonexperienceentrymodel):
+    columns, _ = listing_sort_spec(sort, model)
+    return keyset_query(rex_listing_query(filters, model), columns, cursor_values).limit(LISTING_PAGE_SIZE + 1).statement
+
+def query_plan_checks():
+    model, log = Returnonexperienceentrymodel, RexStatusTransition.__table__
+    children = ['ix_rex_committee_model_parentid', 'ix_action_plan_model_parentid', 'ix_review_by_committee_model_parentid']
+    return [
+        ('home', 'first page', listing_plan_statement({}), ['ix_rex_date_created_id']),
+        ('home', 'next page', listing_plan_statement({}, cursor_values=[datetime.utcnow(), 1]), ['ix_rex_date_created_id']),
+        ('home', 'status filter', listing_plan_statement({'status': 'Closed'}), ['ix_rex_status_date_created_id']),
+        ('home', 'region filter', listing_plan_statement({'region': 1}), ['ix_returnonexperienceentrymodel_Region_id']),
+        ('home', 'project filter', listing_plan_statement({'project': 1}), ['ix_returnonexperienceentrymodel_ProjectNameAndNumber_id']),
+        ('home', 'discipline filter', listing_plan_statement({'discipline': 1}), ['ix_returnonexperienceentrymodel_REXOnDiscipline_id']),
+        ('update', 'aggregate', model.query.options(*rex_aggregate_options()).filter(model.id == 1).limit(1).statement, children),
+        ('updatReviewByCommittee', 'review lookup', ReviewByCommitteeModel.query.filter_by(parentid=1).statement, children[2:]),
+        ('delete', 'committee cascade', RexCommitteeModel.query.filter_by(parentid=1).statement, children[:1]),
+        ('delete', 'action plan cascade', ActionPlanModel.query.filter_by(parentid=1).statement, children[1:2]),
+        ('home', 'archive first page', listing_plan_statement({}, model=ArchivedEntry), ['ix_rex_archive_entry_date_created_id']),
+        ('home', 'archive status filter', listing_plan_statement({'status': 'Closed'}, model=ArchivedEntry),
+         ['ix_rex_archive_entry_status_date_created_id']),
+        ('purge-archive', 'committee cascade', ArchivedCommittee.query.filter_by(parentid=1).statement, ['ix_rex_archive_committee_parentid']),
+        ('updateRexCommittee', 'last transition', select(func.max(log.c.id)).where(log.c.entry_id.in_([1, 2])).group_by(log.c.entry_id),
+         ['ix_rex_status_transition_entry_id_id']),
+    ]
+
+def check_query_plans():
+    results = []
+    for route, label, statement, expected in query_plan_checks():
+        plan = explain_plan(statement)
+        text_plan = '\n'.join(plan)
+        missing = [name for name in expected if name not in text_plan]
+        results.append(dict(route=route, check=label, ok=not missing, missing=missing, plan=plan))
+    return results
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    failed = 0
+    for result in check_query_plans():
+        print(f"[{'PASS' if result['ok'] else 'FAIL'}] {result['route']}: {result['check']}")
+        for line in result['plan']: print(f"    {line}")
+        if not result['ok']:
+            failed += 1
+            print(f"    missing index: {', '.join(result['missing'])}")
+    if failed: raise SystemExit(1)
+
+# --- Synthetic data ---
+# `flask seed-data` fills the database with production-sized data for local benchmarking
+# (bench_routes.py); the same --seed always produces the same rows. Rows go in through Core
+# executemany with preassigned ids, so the bookkeeping the ORM hooks would do is done here instead:
+# summary deltas, the transition log, search documents and the 'entries' data version.
+SEED_STATUS_WEIGHTS = [('RexCommitee', 15), ('RexEntry', 5), ('ActinPlan', 20), ('ReviewByCommittee', 10), ('Closed', 40), ('Rejected', 10)]
+SEED_WORDS = ('pump valve cable tray transformer breaker substation commissioning scaffold crane lifting permit '
+              'isolation torque flange gasket leak weld inspection drawing revision vendor delay rework trench '
+              'foundation rebar concrete pour curing survey clash model handover punch snag insulation earthing '
+              'panel relay test procedure supervisor contractor schedule material shortage damaged delivery site '
+              'access traffic barrier hazard near miss incident training toolbox talk checklist audit quality '
+              'design review specification tolerance clearance corrosion coating pipe support duct fire alarm').split()
+SEED_FIRST_NAMES = 'Aarav Priya Rahul Ananya Vikram Meera Arjun Kavya Rohan Sneha John Maria David Sarah Ahmed Fatima Wei Ling Carlos Elena'.split()
+SEED_LAST_NAMES = 'Sharma Iyer Patel Reddy Nair Kumar Singh Das Smith Garcia Brown Khan Chen Lopez Rossi Muller Silva Tan Okafor Novak'.split()
+SEED_SITES = 'Riverside Northgate Harbour Lakeview Summit Eastfield Westbrook Kingsway Meadow Central'.split()
+SEED_SCOPES = ['Substation', 'Metro Depot', 'Data Centre', 'Water Treatment Plant', 'Hospital Block', 'Bridge Retrofit', 'Solar Farm', 'Office Tower']
+SEED_LOOKUPS = {
+    'regions': ['North', 'South', 'East', 'West', 'Central', 'Middle East', 'Europe', 'Asia Pacific'],
+    'disciplines': ['Civil', 'Structural', 'Mechanical', 'Electrical', 'Instrumentation', 'Piping', 'HSE', 'Quality',
+                    'Procurement', 'Planning', 'Architecture', 'Commissioning'],
+    'technologies': ['BIM', 'SCADA', 'PLC', 'GIS', 'Drones', 'Laser Scanning', 'IoT Sensors', 'ERP'],
+    'frequencies': ['First occurrence', 'Occasional', 'Frequent', 'Recurring on every project'],
+    'ehs-risks': ['None', 'Low', 'Medium', 'High', 'Critical'],
+    'documents': ['Method Statement', 'Inspection Test Plan', 'Design Basis', 'Lessons Learned Register', 'Procedure', 'Checklist'],
+}
+
+def seed_sentence(rnd, min_words, max_words, limit=500):
+    return ' '.join(rnd.choice(SEED_WORDS) for _ in range(rnd.randint(min_words, max_words))).capitalize()[:limit]
+
+def seed_lookups(rnd, employees, projects):
+    # Names are unique so a second run skips them; returns the ids of every lookup table.
+    names = dict(SEED_LOOKUPS,
+                 employees=[f'{rnd.choice(SEED_FIRST_NAMES)} {rnd.choice(SEED_LAST_NAMES)} (E{10000 + i})' for i in range(employees)],
+                 projects=[f'P{20000 + i} {rnd.choice(SEED_SITES)} {rnd.choice(SEED_SCOPES)}' for i in range(projects)])
+    for key, values in names.items():
+        import_lookup_rows(LOOKUP_IMPORT_MODELS[key], [dict(name=name) for name in values])
+    return {key: db.session.scalars(select(model.id)).all() for key, model in LOOKUP_IMPORT_MODELS.items()}
+
+def seed_entry_rows(rnd, entry_id, ids, created):
+    # One entry plus the child rows its status implies; children use the same keys every time (executemany).
+    status = rnd.choices([s for s, _ in SEED_STATUS_WEIGHTS], [w for _, w in SEED_STATUS_WEIGHTS])[0]
+    employee = lambda: rnd.choice(ids['employees'])
+    entry = dict(id=entry_id, date_created=created, updated_at=created, version=1, status=status,
+                 ProjectNameAndNumber_id=rnd.choice(ids['projects']), Region_id=rnd.choice(ids['regions']),
+                 REXInitiator_id=employee(), REXOnDiscipline_id=rnd.choice(ids['disciplines']),
+                 REXInitiatingDiscipline_id=rnd.choice(ids['disciplines'] + [None]),
+                 REXOnTopic=seed_sentence(rnd, 3, 10), REXDescription=seed_sentence(rnd, 15, 70),
+                 Impact=seed_sentence(rnd, 5, 30), AttachmentLink=f'https://docs.example.com/rex/{entry_id}',
+                 Recommendation=seed_sentence(rnd, 5, 40))
+    committee = plan = review = None
+    if status != 'RexCommitee':
+        verdict = {'RexEntry': 'Required more details', 'Rejected': 'No'}.get(status, 'Yes')
+        rex = verdict == 'Yes'
+        committee = dict(parentid=entry_id, date_created=created + timedelta(days=rnd.randint(1, 14)),
+                         ReviewCommiteeMember=employee(), IsitREX=verdict,
+                         Isfurtheranalysisrequired=rnd.choice(['Required', 'NotRequired']) if rex else None,
+                         Mentor=employee() if rex else None, ActionBy=employee() if rex else None,
+                         QMSSpoc=employee() if rex else None, Technology=rnd.choice(ids['technologies']) if rex else None,
+                         REXCommitteeComments=seed_sentence(rnd, 5, 40))
+    # An ActinPlan entry with a plan and review was sent back by the review committee
+    sent_back = status == 'ActinPlan' and rnd.random() < 0.2
+    if status in ('ReviewByCommittee', 'Closed') or sent_back:
+        planned = committee['date_created'] + timedelta(days=rnd.randint(1, 30))
+        plan = dict(parentid=entry_id, date_created=planned, AttendeesOfRootCause=employee(), Date=planned,
+                    FrequesncyOfIssue=rnd.choice(ids['frequencies']), EHSRisk=rnd.choice(ids['ehs-risks']),
+                    AddDocumentsLink=f'https://docs.example.com/rex/{entry_id}/plan', RootCause=seed_sentence(rnd, 5, 40),
+                    CorrectiveAction=seed_sentence(rnd, 5, 40), DocummentToUpdate=rnd.choice(ids['documents']),
+                    Remarks=seed_sentence(rnd, 3, 20), AttachmentLink=f'https://docs.example.com/rex/{entry_id}/rca',
+                    ReportingManagerConfirmation=True)
+    if status == 'Closed' or sent_back:
+        review = dict(parentid=entry_id, date_created=plan['date_created'] + timedelta(days=rnd.randint(1, 21)),
+                      Remarks=seed_sentence(rnd, 3, 25))
+    return entry, committee, plan, review
+
+def seed_search_row(entry, committee, plan, review):
+    # Same fields as index_rex_entry()
+    return dict(entry_id=entry['id'], topic=entry['REXOnTopic'], description=entry['REXDescription'], impact=entry['Impact'],
+                recommendation=entry['Recommendation'], committee_comments=committee['REXCommitteeComments'] if committee else '',
+                root_cause=plan['RootCause'] if plan else '', corrective_action=plan['CorrectiveAction'] if plan else '')
+
+def seed_transitions(entry, committee, plan, review):
+    # The status changes the child rows' dates imply, in order
+    def change(from_status, to_status, at):
+        return dict(entry_id=entry['id'], from_status=from_status, to_status=to_status, region_id=entry['Region_id'],
+                    discipline_id=entry['REXOnDiscipline_id'], created=entry['date_created'], changed_at=at, changed_by=None)
+    events = [change(None, INITIAL_STATUS, entry['date_created'])]
+    if committee: events.append(change(INITIAL_STATUS, COMMITTEE_DECISIONS[committee['IsitREX']], committee['date_created']))
+    if plan: events.append(change('ActinPlan', 'ReviewByCommittee', plan['date_created']))
+    if review: events.append(change('ReviewByCommittee', entry['status'], review['date_created']))
+    return events
+
+def seed_entries(count, seed=0, employees=3000, projects=2000, days=3 * 365, batch_size=5000, progress=None):
+    rnd = random.Random(seed)
+    ids = seed_lookups(rnd, employees, projects)
+    model = Returnonexperienceentrymodel
+    # Archived entries keep their ids, so new ones start after the highest id in either table
+    first_id = max(db.session.scalar(select(func.max(table.id))) or 0 for table in (model, ArchivedEntry)) + 1
+    # Oldest first, so ids follow date_created as they do for real inserts
+    now = datetime.utcnow()
+    ages = sorted((rnd.random() * days * 86400 for _ in range(count)), reverse=True)
+    for start in range(0, count, batch_size):
+        batch = [seed_entry_rows(rnd, first_id + i, ids, now - timedelta(seconds=ages[i])) for i in range(start, min(count, start + batch_size))]
+        connection = db.session.connection()
+        connection.execute(sa_insert(model.__table__), [rows[0] for rows in batch])
+        for position, child in enumerate(ENTRY_CHILD_MODELS, 1):
+            children = [rows[position] for rows in batch if rows[position]]
+            if children: connection.execute(sa_insert(child.__table__), children)
+        connection.execute(sa_insert(RexSearchDocument.__table__), [seed_search_row(*rows) for rows in batch])
+        record_transitions(connection, [change for rows in batch for change in seed_transitions(*rows)])
+        apply_summary_deltas(connection, Counter(summary_key(e['status'], e['Region_id'], e['REXOnDiscipline_id'], e['date_created'])
+                                                 for e, _, _, _ in batch))
+        advance_data_versions(connection, {'entries'})
+        db.session.commit()
+        if progress: progress(start + len(batch))
+    return count
+
+@app.cli.command('seed-data')
+@click.option('--entries', default=100000, show_default=True)
+@click.option('--employees', default=3000, show_default=True)
+@click.option('--projects', default=2000, show_default=True)
+@click.option('--days', default=3 * 365, show_default=True, help='Spread creation dates over this many days.')
+@click.option('--seed', default=0, show_default=True, help='Random seed; the same seed gives the same data.')
+@click.option('--batch-size', default=5000, show_default=True)
+def seed_data_command(entries, employees, projects, days, seed, batch_size):
+    """Add synthetic entries (with committee, action plan and review rows) and lookups for benchmarking."""
+    started = time.perf_counter()
+    db.create_all()
+    seed_entries(entries, seed=seed, employees=employees, projects=projects, days=days, batch_size=batch_size,
+                 progress=lambda done: print(f"{done}/{entries} entries", end='\r'))
+    print(f"Seeded {entries} entries in {time.perf_counter() - started:.1f}s")
+
+# --- Application factory ---
+# Importing this module only defines models, forms and routes. create_app() does the rest: the
+# upload folder, the engine and its instrumentation, response compression, and Flask-Migrate
+# (imported only for the flask CLI, since alembic is the largest single import). gunicorn loads
+# `app:create_app()` once in the master with preload_app (see gunicorn.conf.py); workers fork from
+# it copy-on-write.
+def create_app():
+    if 'sqlalchemy' in app.extensions: return app
+    # Cloud Run starts with an empty filesystem
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    db.init_app(app)
+    with app.app_context():
+        instrument_pool(db.engine)
+        for engine in db.engines.values():
+            instrument_queries(engine)
+            if engine.dialect.name == 'sqlite': event.listen(engine, 'connect', enable_sqlite_foreign_keys)
+    if COMPRESS_RESPONSES: app.wsgi_app = CompressionMiddleware(app.wsgi_app)
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    return app
+
+def warm_up():
+    """Do the first request's one-off work ahead of time; returns the seconds spent.
+
+    Configured mappers, compiled templates and cached lookup choices are plain process memory:
+    warmed once in the gunicorn master they are shared by every forked worker, where this call
+    then only opens the worker's own pooled connection.
+    """
+    started = time.perf_counter()
+    with app.app_context():
+        try:
+            configure_mappers()
+            for name in app.jinja_env.list_templates(): app.jinja_env.get_template(name)
+            for model in LOOKUP_MODELS: fetch_dynamic_choices(model)
+            with db.engine.connect() as connection: connection.execute(text('SELECT 1'))
+        except Exception as e:
+            # A cold database must not stop the worker from booting; the first request retries.
+            app.logger.warning(json.dumps(dict(event='warmup_failed', error=type(e).__name__)))
+    return time.perf_counter() - started
+
+def release_connections(close=True):
+    # The master closes its connections before forking; a worker drops (close=False) any it inherited
+    # without touching the sockets, which still belong to the parent.
+    with app.app_context():
+        for engine in db.engines.values(): engine.dispose(close=close)
+
+# The flask CLI (`flask --app app ...`) loads the module-level app directly, so finish setting it up now.
+if click.get_current_context(silent=True) is not None: create_app()
+
 if __name__ == '__main__':
+    create_app()
     with app.app_context():
         # Only create tables if needed. 
         # For Cloud SQL, it is better to use the script I gave you earlier, 
@@ -0,0 +1,81 @@
+"""Time-to-first-byte and bytes-on-the-wire benchmark for the listing and update pages.
+
+Renders each page buffered and streamed (STREAM_PAGES) with each Accept-Encoding the compression
+middleware negotiates, through the Flask test client, and reports p50/p95 time to the first body
+chunk, p50 time to the last one and the body size as sent. Everything runs in-process, so network
+time is left out; --link-kbps adds an estimate of the transfer time on a slow site link.
+
+    python bench_pages.py --entries 100000
+    DATABASE_URL=mysql+pymysql://... python bench_pages.py --pages update --requests 200
+"""
+import argparse
+import random
+import time
+
+from bench_routes import Targets, load_app, percentile
+
+PAGES = ['home', 'update']
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+def measure(client, url, encoding):
+    started = time.perf_counter()
+    response = client.get(url, headers={'Accept-Encoding': encoding}, buffered=False)
+    chunks, first, size = iter(response.response), None, 0
+    try:
+        for chunk in chunks:
+            if first is None: first = time.perf_counter() - started
+            size += len(chunk)
+    finally:
+        response.close()
+    total = time.perf_counter() - started
+    return response, first if first is not None else total, total, size
+
+
+def run_mode(client, targets, page, encoding, requests, warmup):
+    ttfb, total, sizes, chunks, sent = [], [], [], [], None
+    for number in range(warmup + requests):
+        _, url, _ = targets.request(page)
+        response, first, last, size = measure(client, url, encoding)
+        if response.status_code != 200: raise SystemExit(f'{url} answered {response.status_code}')
+        if number < warmup: continue
+        ttfb.append(first * 1000)
+        total.append(last * 1000)
+        sizes.append(size)
+        sent = response.headers.get('Content-Encoding', 'identity')
+    return dict(ttfb_p50=percentile(ttfb, 50), ttfb_p95=percentile(ttfb, 95), total_p50=percentile(total, 50),
+                bytes=int(percentile(sizes, 50)), encoding=sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50, help='Timed requests per page and mode.')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--pages', default=','.join(PAGES))
+    parser.add_argument('--entries', type=int, default=0, help='Seed a fresh SQLite database with this many entries.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--link-kbps', type=float, default=2000, help='Link speed for the transfer time estimate.')
+    args = parser.parse_args()
+    pages = [page for page in args.pages.split(',') if page]
+    unknown = set(pages) - set(PAGES)
+    if unknown: parser.error(f"unknown pages: {', '.join(sorted(unknown))}")
+
+    rex = load_app(args)
+    if not isinstance(rex.app.wsgi_app, rex.CompressionMiddleware):
+        print('warning: COMPRESS_RESPONSES=0, every mode is sent uncompressed')
+    targets = Targets(rex, random.Random(args.seed))
+    client = rex.app.test_client()
+    print(f"{'page':<8} {'mode':<9} {'encoding':<9} {'ttfb p50':>9} {'ttfb p95':>9} {'total p50':>10} {'bytes':>9} {'on link':>9}")
+    for page in pages:
+        for streamed in (False, True):
+            rex.app.config['STREAM_PAGES'] = streamed
+            for encoding in ENCODINGS:
+                result = run_mode(client, targets, page, encoding, args.requests, args.warmup)
+                transfer = result['bytes'] * 8 / 1000 / args.link_kbps * 1000
+                print(f"{page:<8} {'streamed' if streamed else 'buffered':<9} {result['encoding']:<9} "
+                      f"{result['ttfb_p50']:>7.1f}ms {result['ttfb_p95']:>7.1f}ms {result['total_p50']:>8.1f}ms "
+                      f"{result['bytes']:>9} {transfer:>7.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""Route-level benchmark through the Flask test client.
+
+Drives the listing, update page, committee and action-plan submissions, uploads, the file list and
+the JSON API (a listing page and an ids= batch, both with every relationship), and reports p50/p95 latency, SQL statements per request and peak Python memory per request
+(tracemalloc, measured in a separate shorter pass). The POST routes write: run it against a scratch
+database, either one seeded with `flask --app app seed-data` (point DATABASE_URL at it) or a fresh
+SQLite file built by --entries.
+
+    python bench_routes.py --entries 100000 --save-baseline bench_baseline.json
+    python bench_routes.py --entries 100000 --baseline bench_baseline.json
+
+With --baseline the run is compared metric by metric and exits 1 if a p95 or query count regressed
+by more than --tolerance.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROUTES = ['home', 'home_filtered', 'update', 'updateRexCommittee', 'updatActionPlan', 'upload', 'view_files', 'api_list', 'api_batch']
+API_FIELDS = 'id,status,region,discipline,topic,committee,action_plan,review'
+# Regressions smaller than these are noise, whatever the ratio
+ABSOLUTE_FLOOR = dict(p50_ms=1.0, p95_ms=2.0, queries=0.5, peak_kib=64)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def load_app(args):
+    # app.py reads its settings at import time. The tracemalloc pass is slow by design, so keep it
+    # out of the slow-request log.
+    os.environ.setdefault('SLOW_REQUEST_MS', '60000')
+    if args.entries:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='rex-bench-'), 'bench.db')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app as rex
+    rex.create_app()
+    rex.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=tempfile.mkdtemp(prefix='rex-bench-uploads-'))
+    if args.entries:
+        with rex.app.app_context():
+            rex.db.create_all()
+            started = time.perf_counter()
+            rex.seed_entries(args.entries, seed=args.seed)
+            print(f"Seeded {args.entries} entries in {time.perf_counter() - started:.1f}s")
+    return rex
+
+
+class Targets(object):
+    """Entry ids each route works on; the POST routes consume entries in the status they expect."""
+
+    def __init__(self, rex, rnd):
+        from sqlalchemy import select
+        model = rex.Returnonexperienceentrymodel
+        with rex.app.app_context():
+            ids = lambda status: rex.db.session.scalars(select(model.id).where(model.status == status)).all()
+            self.entries = rex.db.session.scalars(select(model.id)).all()
+            self.committee = ids('RexCommitee')
+            self.action_plan = ids('ActinPlan')
+            lookup = lambda m: rex.db.session.scalars(select(m.id).limit(50)).all()
+            self.employees, self.technologies = lookup(rex.Employeelist), lookup(rex.Technologylist)
+            self.documents = lookup(rex.Documenttoupdatelist)
+            self.frequencies, self.risks = lookup(rex.Frequencyofissuelist), lookup(rex.Ehsrisklist)
+        if not self.entries: raise SystemExit('No entries: seed the database first (flask --app app seed-data or --entries)')
+        self.rnd = rnd
+        rnd.shuffle(self.committee)
+        rnd.shuffle(self.action_plan)
+
+    def take(self, pool, name):
+        if not pool: raise SystemExit(f'Ran out of entries for {name}; seed more or lower --requests')
+        return pool.pop()
+
+    def request(self, route):
+        rnd, pick = self.rnd, self.rnd.choice
+        if route == 'home': return 'GET', '/', {}
+        if route == 'home_filtered': return 'GET', f"/?status={pick(['Closed', 'ActinPlan', 'RexCommitee'])}", {}
+        if route == 'update': return 'GET', f'/update/{pick(self.entries)}', {}
+        if route == 'updateRexCommittee':
+            data = dict(ReviewCommiteeMember=pick(self.employees), IsitREX='Yes', Isfurtheranalysisrequired='NotRequired',
+                        Mentor=pick(self.employees), ActionBy=pick(self.employees), QMSSpoc=pick(self.employees),
+                        Technology=pick(self.technologies), REXCommitteeComments='Benchmark committee review')
+            return 'POST', f"/updateRexCommittee/{self.take(self.committee, route)}", dict(data=data)
+        if route == 'updatActionPlan':
+            data = dict(AttendeesOfRootCause=pick(self.employees), Date='2026-01-15', FrequesncyOfIssue=pick(self.frequencies),
+                        EHSRisk=pick(self.risks), AddDocumentsLink='https://docs.example.com/bench', RootCause='Benchmark root cause',
+                        CorrectiveAction='Benchmark corrective action', DocummentToUpdate=pick(self.documents),
+                        Remarks='Benchmark remarks', AttachmentLink='https://docs.example.com/bench/rca', ReportingManagerConfirmation='y')
+            return 'POST', f"/updatActionPlan/{self.take(self.action_plan, route)}", dict(data=data)
+        if route == 'upload':
+            # Distinct content every time, so each request stores a new blob
+            content = rnd.randbytes(64 * 1024)
+            return 'POST', '/upload', dict(data=dict(file=(io.BytesIO(content), 'bench.txt'), entry_id=str(pick(self.entries))),
+                                           content_type='multipart/form-data')
+        if route == 'view_files': return 'GET', '/view_files', {}
+        if route == 'api_list': return 'GET', f'/api/v1/entries?per_page=100&fields={API_FIELDS}', {}
+        if route == 'api_batch':
+            ids = ','.join(str(id) for id in rnd.sample(self.entries, min(100, len(self.entries))))
+            return 'GET', f'/api/v1/entries?ids={ids}&fields={API_FIELDS}', {}
+        raise ValueError(route)
+
+
+class QueryCounter(object):
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._executed)
+
+    def _executed(self, *args):
+        self.count += 1
+
+
+def run_route(client, targets, counter, route, requests, warmup, memory_requests):
+    timings, queries, statuses = [], [], {}
+    for number in range(warmup + requests):
+        method, url, kwargs = targets.request(route)
+        before = counter.count
+        started = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        if number < warmup: continue
+        timings.append(elapsed * 1000)
+        queries.append(counter.count - before)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(memory_requests):
+            method, url, kwargs = targets.request(route)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            client.open(url, method=method, **kwargs).get_data()
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+    return dict(n=len(timings), p50_ms=round(percentile(timings, 50), 2), p95_ms=round(percentile(timings, 95), 2),
+                queries=round(sum(queries) / len(queries), 2), peak_kib=round(max(peaks), 1) if peaks else None,
+                statuses={str(code): count for code, count in sorted(statuses.items())})
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\n{'route':<20} {'metric':<9} {'baseline':>10} {'now':>10} {'change':>8}")
+    for route, now in results.items():
+        before = baseline.get('routes', {}).get(route)
+        if before is None: continue
+        for metric in ('p50_ms', 'p95_ms', 'queries', 'peak_kib'):
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None: continue
+            change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+            regressed = metric in ('p95_ms', 'queries') and change > tolerance and new - old > ABSOLUTE_FLOOR[metric]
+            if regressed: regressions.append((route, metric))
+            print(f"{route:<20} {metric:<9} {old:>10} {new:>10} {change:>+7.0%}{'  REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=100, help='Timed requests per route.')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--memory-requests', type=int, default=5, help='Requests per route measured with tracemalloc.')
+    parser.add_argument('--routes', default=','.join(ROUTES))
+    parser.add_argument('--entries', type=int, default=0, help='Seed a fresh SQLite database with this many entries.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='Compare against this results file.')
+    parser.add_argument('--save-baseline', help='Write this run\'s results here.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95/query growth before failing (0.2 = 20%%).')
+    args = parser.parse_args()
+    routes = [route for route in args.routes.split(',') if route]
+    unknown = set(routes) - set(ROUTES)
+    if unknown: parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    rex = load_app(args)
+    targets = Targets(rex, random.Random(args.seed))
+    with rex.app.app_context():
+        counter = QueryCounter(rex.db.engine)
+    client = rex.app.test_client()
+    results = {}
+    print(f"{'route':<20} {'n':>5} {'p50':>9} {'p95':>9} {'queries':>8} {'peak':>10}  statuses")
+    for route in routes:
+        result = results[route] = run_route(client, targets, counter, route, args.requests, args.warmup, args.memory_requests)
+        print(f"{route:<20} {result['n']:>5} {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms {result['queries']:>8.1f} "
+              f"{result['peak_kib'] or 0:>7.0f}KiB  {result['statuses']}")
+    print(f"max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    with rex.app.app_context():
+        entries = rex.db.session.query(rex.Returnonexperienceentrymodel).count()
+        backend = rex.db.engine.dialect.name
+    run = dict(created=datetime.utcnow().isoformat(timespec='seconds'), entries=entries, database=backend,
+               python=platform.python_version(), requests=args.requests, routes=results)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as handle: json.dump(run, handle, indent=1, sort_keys=True)
+        print(f"Saved results to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle: baseline = json.load(handle)
+        if baseline.get('entries') != entries or baseline.get('database') != backend:
+            print(f"warning: baseline ran on {baseline.get('entries')} entries ({baseline.get('database')}), this run on {entries} ({backend})")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Time-to-first-response benchmark for the gunicorn entry point.
+
+Starts `gunicorn --config gunicorn.conf.py` the way the container does, polls one URL until it
+answers, and stops the server; repeats for each preload/warmup combination. Point DATABASE_URL at
+the database to test against (it must already have the tables).
+
+    python bench_startup.py --runs 5 --path /
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+MODES = [
+    ('preload+warmup', dict(GUNICORN_PRELOAD='1', WARMUP='1')),
+    ('preload', dict(GUNICORN_PRELOAD='1', WARMUP='0')),
+    ('per-worker import', dict(GUNICORN_PRELOAD='0', WARMUP='0')),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_response(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except OSError:
+            time.sleep(0.01)
+    return None
+
+
+def run_once(env, path, timeout):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), **env)
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py'], env=env,
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        status = first_response(f'http://127.0.0.1:{port}{path}', started + timeout)
+        # The first request after warmup is what a scale-from-zero user sees; time a second one too.
+        second = time.perf_counter()
+        first_response(f'http://127.0.0.1:{port}{path}', second + timeout)
+        return status, second - started, time.perf_counter() - second
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+    print(f"{'mode':<20} {'status':>6} {'ttfr p50':>9} {'ttfr max':>9} {'next req':>9}")
+    for name, env in MODES:
+        results = [run_once(env, args.path, args.timeout) for _ in range(args.runs)]
+        ttfr = [r[1] * 1000 for r in results]
+        statuses = ','.join(sorted({str(r[0]) for r in results}))
+        print(f"{name:<20} {statuses:>6} {statistics.median(ttfr):>7.0f}ms {max(ttfr):>7.0f}ms "
+              f"{statistics.median(r[2] * 1000 for r in results):>7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
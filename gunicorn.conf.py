@@ -0,0 +1,39 @@
+# gunicorn settings for Cloud Run: `gunicorn --config gunicorn.conf.py` (see Dockerfile).
+# GUNICORN_WORKERS/GUNICORN_THREADS are also read by app.py to size the database pool.
+import os
+
+wsgi_app = 'app:create_app()'
+bind = f":{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 0
+# Import the app once in the master and fork workers from it instead of importing it in each worker.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+warmup = os.environ.get('WARMUP', '1') == '1'
+
+
+def when_ready(server):
+    # Runs in the master before workers are spawned; with preload_app the app is already loaded.
+    if server.cfg.preload_app and warmup:
+        import app
+        server.log.info('Master warmup took %.3fs', app.warm_up())
+        app.release_connections()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import app
+        app.release_connections(close=False)
+
+
+def post_worker_init(worker):
+    import app
+    if warmup:
+        worker.log.info('Worker warmup took %.3fs', app.warm_up())
+    # Background job threads (JOB_WORKER_THREADS, 0 disables them) must start after the fork.
+    app.job_runner.start()
+
+
+def worker_exit(server, worker):
+    import app
+    app.job_runner.stop(timeout=server.cfg.graceful_timeout)
@@ -0,0 +1,114 @@
+"""Base schema: lookup, entry and workflow child tables
+
+Revision ID: 0b4d7e2f9a61
+Revises:
+Create Date: 2026-10-17 08:00:00.000000
+
+The tables db.create_all() made before the app had migrations. A fresh database is built with
+`flask db upgrade` alone. Every revision skips tables, columns and indexes that already exist, so
+a database made by create_all() (`python app.py`, `flask seed-data`) upgrades as well, whichever
+version of the app created it.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b4d7e2f9a61'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# name, length, unique
+LOOKUPS = [
+    ('projectlist', 100, True),
+    ('regionlist', 200, True),
+    ('employeelist', 200, False),
+    ('disciplinelist', 200, False),
+    ('frequencyofissuelist', 200, True),
+    ('ehsrisklist', 200, True),
+    ('technologylist', 200, True),
+    ('documenttoupdatelist', 200, True),
+]
+
+
+def _parent_fk():
+    return sa.ForeignKey('returnonexperienceentrymodel.id')
+
+
+def _tables():
+    # Parents first
+    for name, length, unique in LOOKUPS:
+        yield name, [
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=length), nullable=False, unique=unique),
+            sa.PrimaryKeyConstraint('id'),
+        ]
+    yield 'returnonexperienceentrymodel', [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date_created', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('ProjectNameAndNumber_id', sa.Integer(), sa.ForeignKey('projectlist.id'), nullable=False),
+        sa.Column('Region_id', sa.Integer(), sa.ForeignKey('regionlist.id'), nullable=False),
+        sa.Column('REXInitiator_id', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=False),
+        sa.Column('REXOnDiscipline_id', sa.Integer(), sa.ForeignKey('disciplinelist.id'), nullable=False),
+        sa.Column('REXInitiatingDiscipline_id', sa.Integer(), sa.ForeignKey('disciplinelist.id'), nullable=True),
+        sa.Column('REXOnTopic', sa.String(length=500), nullable=False),
+        sa.Column('REXDescription', sa.String(length=500), nullable=False),
+        sa.Column('Impact', sa.String(length=500), nullable=False),
+        sa.Column('AttachmentLink', sa.String(length=500), nullable=False),
+        sa.Column('Recommendation', sa.String(length=500), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+    yield 'rex_committee_model', [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parentid', sa.Integer(), _parent_fk(), nullable=False),
+        sa.Column('date_created', sa.DateTime(), nullable=True),
+        sa.Column('ReviewCommiteeMember', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+        sa.Column('IsitREX', sa.String(length=100), nullable=False),
+        sa.Column('Isfurtheranalysisrequired', sa.String(length=500), nullable=True),
+        sa.Column('Mentor', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+        sa.Column('ActionBy', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+        sa.Column('QMSSpoc', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+        sa.Column('Technology', sa.Integer(), sa.ForeignKey('technologylist.id'), nullable=True),
+        sa.Column('REXCommitteeComments', sa.String(length=500), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+    yield 'action_plan_model', [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parentid', sa.Integer(), _parent_fk(), nullable=False),
+        sa.Column('date_created', sa.DateTime(), nullable=True),
+        sa.Column('AttendeesOfRootCause', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+        sa.Column('Date', sa.DateTime(), nullable=True),
+        sa.Column('FrequesncyOfIssue', sa.Integer(), sa.ForeignKey('frequencyofissuelist.id'), nullable=True),
+        sa.Column('EHSRisk', sa.Integer(), sa.ForeignKey('ehsrisklist.id'), nullable=True),
+        sa.Column('AddDocumentsLink', sa.String(length=500), nullable=True),
+        sa.Column('RootCause', sa.String(length=500), nullable=True),
+        sa.Column('CorrectiveAction', sa.String(length=500), nullable=True),
+        sa.Column('DocummentToUpdate', sa.Integer(), sa.ForeignKey('documenttoupdatelist.id'), nullable=True),
+        sa.Column('Remarks', sa.String(length=500), nullable=True),
+        sa.Column('AttachmentLink', sa.String(length=500), nullable=True),
+        sa.Column('ReportingManagerConfirmation', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+    yield 'review_by_committee_model', [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parentid', sa.Integer(), _parent_fk(), nullable=False),
+        sa.Column('date_created', sa.DateTime(), nullable=True),
+        sa.Column('Remarks', sa.String(length=500), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, columns in _tables():
+        if not inspector.has_table(name):
+            op.create_table(name, *columns)
+
+
+def downgrade():
+    for name, _ in reversed(list(_tables())):
+        op.drop_table(name)
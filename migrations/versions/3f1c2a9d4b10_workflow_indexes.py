@@ -0,0 +1,69 @@
+"""Index the workflow's hot predicates
+
+Revision ID: 3f1c2a9d4b10
+Revises: 0b4d7e2f9a61
+Create Date: 2026-10-17 09:00:00.000000
+
+Only adds indexes, and skips any that already exist (a fresh create_all() now creates them).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d4b10'
+down_revision = '0b4d7e2f9a61'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Listing: keyset order and status-filtered listing
+    ('ix_rex_date_created_id', 'returnonexperienceentrymodel', ['date_created', 'id']),
+    ('ix_rex_status_date_created_id', 'returnonexperienceentrymodel', ['status', 'date_created', 'id']),
+    # Listing joins/filters on lookup tables
+    ('ix_returnonexperienceentrymodel_ProjectNameAndNumber_id', 'returnonexperienceentrymodel', ['ProjectNameAndNumber_id']),
+    ('ix_returnonexperienceentrymodel_Region_id', 'returnonexperienceentrymodel', ['Region_id']),
+    ('ix_returnonexperienceentrymodel_REXInitiator_id', 'returnonexperienceentrymodel', ['REXInitiator_id']),
+    ('ix_returnonexperienceentrymodel_REXOnDiscipline_id', 'returnonexperienceentrymodel', ['REXOnDiscipline_id']),
+    ('ix_returnonexperienceentrymodel_REXInitiatingDiscipline_id', 'returnonexperienceentrymodel', ['REXInitiatingDiscipline_id']),
+    # Child tables are always reached through parentid
+    ('ix_rex_committee_model_parentid', 'rex_committee_model', ['parentid']),
+    ('ix_action_plan_model_parentid', 'action_plan_model', ['parentid']),
+    ('ix_review_by_committee_model_parentid', 'review_by_committee_model', ['parentid']),
+    # Child FK columns joined to lookups
+    ('ix_rex_committee_model_ReviewCommiteeMember', 'rex_committee_model', ['ReviewCommiteeMember']),
+    ('ix_rex_committee_model_Mentor', 'rex_committee_model', ['Mentor']),
+    ('ix_rex_committee_model_ActionBy', 'rex_committee_model', ['ActionBy']),
+    ('ix_rex_committee_model_QMSSpoc', 'rex_committee_model', ['QMSSpoc']),
+    ('ix_rex_committee_model_Technology', 'rex_committee_model', ['Technology']),
+    ('ix_action_plan_model_AttendeesOfRootCause', 'action_plan_model', ['AttendeesOfRootCause']),
+    ('ix_action_plan_model_FrequesncyOfIssue', 'action_plan_model', ['FrequesncyOfIssue']),
+    ('ix_action_plan_model_EHSRisk', 'action_plan_model', ['EHSRisk']),
+    ('ix_action_plan_model_DocummentToUpdate', 'action_plan_model', ['DocummentToUpdate']),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {ix['name'] for ix in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(inspector, table)
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    # On MySQL, InnoDB may have reused one of these as the index backing a FK; drop the FK first in that case.
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
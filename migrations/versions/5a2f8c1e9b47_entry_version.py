@@ -0,0 +1,35 @@
+"""Entry version and updated_at for fragment cache keys
+
+Revision ID: 5a2f8c1e9b47
+Revises: e1a6b3f9c7d2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a2f8c1e9b47'
+down_revision = 'e1a6b3f9c7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('returnonexperienceentrymodel')}
+    if {'version', 'updated_at'} <= existing:
+        return
+    with op.batch_alter_table('returnonexperienceentrymodel') as batch_op:
+        if 'version' not in existing:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+        if 'updated_at' not in existing:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    if 'updated_at' not in existing:
+        op.execute('UPDATE returnonexperienceentrymodel SET updated_at = date_created')
+
+
+def downgrade():
+    with op.batch_alter_table('returnonexperienceentrymodel') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,75 @@
+"""Full-text search document table
+
+Revision ID: 8b7e41c0d2a5
+Revises: 3f1c2a9d4b10
+Create Date: 2026-10-17 10:00:00.000000
+
+MySQL gets a FULLTEXT index on rex_search_document; SQLite gets an external-content
+FTS5 table kept in sync by triggers. Existing entries get their documents here, with the
+same fields as app.index_rex_entry(): the first committee row and action plan of each.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b7e41c0d2a5'
+down_revision = '3f1c2a9d4b10'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ['topic', 'description', 'impact', 'recommendation', 'committee_comments', 'root_cause', 'corrective_action']
+
+
+def _sqlite_ddl():
+    cols = ', '.join(COLUMNS)
+    new = ', '.join('new.' + c for c in COLUMNS)
+    old = ', '.join('old.' + c for c in COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS rex_search_fts USING fts5({cols}, content='rex_search_document', content_rowid='entry_id')",
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_ai AFTER INSERT ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rowid, {cols}) VALUES (new.entry_id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_ad AFTER DELETE ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {cols}) VALUES ('delete', old.entry_id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_au AFTER UPDATE ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {cols}) VALUES ('delete', old.entry_id, {old}); "
+        f"INSERT INTO rex_search_fts(rowid, {cols}) VALUES (new.entry_id, {new}); END",
+    ]
+
+
+BACKFILL = f"""
+INSERT INTO rex_search_document (entry_id, {', '.join(COLUMNS)})
+SELECT e.id, COALESCE(e.REXOnTopic, ''), COALESCE(e.REXDescription, ''), COALESCE(e.Impact, ''),
+       COALESCE(e.Recommendation, ''), COALESCE(c.REXCommitteeComments, ''), COALESCE(p.RootCause, ''),
+       COALESCE(p.CorrectiveAction, '')
+FROM returnonexperienceentrymodel e
+LEFT JOIN rex_committee_model c ON c.id = (SELECT min(id) FROM rex_committee_model WHERE parentid = e.id)
+LEFT JOIN action_plan_model p ON p.id = (SELECT min(id) FROM action_plan_model WHERE parentid = e.id)
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    created = not sa.inspect(bind).has_table('rex_search_document')
+    if created:
+        op.create_table(
+            'rex_search_document',
+            sa.Column('entry_id', sa.Integer(), sa.ForeignKey('returnonexperienceentrymodel.id', ondelete='CASCADE'), primary_key=True, autoincrement=False),
+            *[sa.Column(name, sa.String(length=500), nullable=False) for name in COLUMNS],
+        )
+        if bind.dialect.name == 'mysql':
+            op.create_index('ix_rex_search_fulltext', 'rex_search_document', COLUMNS, mysql_prefix='FULLTEXT')
+    if bind.dialect.name == 'sqlite':
+        for ddl in _sqlite_ddl():
+            op.execute(ddl)
+    if created:
+        # After the triggers, which fill the FTS5 table from these rows
+        op.execute(BACKFILL)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS rex_search_fts')
+    op.drop_table('rex_search_document')
@@ -0,0 +1,32 @@
+"""Data version counters for conditional GET
+
+Revision ID: 9d3b6e2a7c15
+Revises: 5a2f8c1e9b47
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3b6e2a7c15'
+down_revision = '5a2f8c1e9b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('data_version'):
+        return
+    op.create_table(
+        'data_version',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')
@@ -0,0 +1,172 @@
+"""Entry archive tables and cascading entry deletes
+
+Revision ID: a7d3c9e51b28
+Revises: c4e7a1d8f302
+Create Date: 2026-10-17 17:00:00.000000
+
+Adds rex_archive_entry and its committee/action plan/review children (filled by
+`flask archive-entries`). The live child tables get ON DELETE CASCADE on parentid.
+rex_search_document and attachment lose their foreign key to the entry table,
+since their rows now outlive the move of an entry to the archive.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c9e51b28'
+down_revision = 'c4e7a1d8f302'
+branch_labels = None
+depends_on = None
+
+
+PARENT = 'returnonexperienceentrymodel'
+# Gives SQLite's unnamed foreign keys a name batch mode can drop them by
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+SEARCH_COLUMNS = ['topic', 'description', 'impact', 'recommendation', 'committee_comments', 'root_cause', 'corrective_action']
+
+
+def _sqlite_search_triggers():
+    cols = ', '.join(SEARCH_COLUMNS)
+    new = ', '.join('new.' + c for c in SEARCH_COLUMNS)
+    old = ', '.join('old.' + c for c in SEARCH_COLUMNS)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_ai AFTER INSERT ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rowid, {cols}) VALUES (new.entry_id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_ad AFTER DELETE ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {cols}) VALUES ('delete', old.entry_id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS rex_search_au AFTER UPDATE ON rex_search_document BEGIN "
+        f"INSERT INTO rex_search_fts(rex_search_fts, rowid, {cols}) VALUES ('delete', old.entry_id, {old}); "
+        f"INSERT INTO rex_search_fts(rowid, {cols}) VALUES (new.entry_id, {new}); END",
+    ]
+
+
+def _parent_fk(table):
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk['referred_table'] == PARENT:
+            return fk
+    return None
+
+
+def _replace_parent_fk(table, column, ondelete, keep=True):
+    # keep=False only drops the foreign key. Nothing happens if the table already has the wanted one.
+    existing = _parent_fk(table)
+    if existing is None and not keep:
+        return
+    if existing is not None and keep and existing.get('options', {}).get('ondelete') == ondelete:
+        return
+    name = f'fk_{table}_{column}_{PARENT}'
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite cannot alter a constraint; batch mode rebuilds the table (dropping its triggers).
+        with op.batch_alter_table(table, recreate='always', naming_convention=NAMING_CONVENTION) as batch:
+            if existing:
+                batch.drop_constraint(existing['name'] or name, type_='foreignkey')
+            if keep:
+                batch.create_foreign_key(name, PARENT, [column], ['id'], ondelete=ondelete)
+        if table == 'rex_search_document':
+            for ddl in _sqlite_search_triggers():
+                op.execute(ddl)
+        return
+    if existing:
+        op.drop_constraint(existing['name'], table, type_='foreignkey')
+    if keep:
+        op.create_foreign_key(name, table, PARENT, [column], ['id'], ondelete=ondelete)
+
+
+def _archive_children_fk():
+    return sa.ForeignKey('rex_archive_entry.id', ondelete='CASCADE')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('rex_archive_entry'):
+        op.create_table(
+            'rex_archive_entry',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('ProjectNameAndNumber_id', sa.Integer(), sa.ForeignKey('projectlist.id'), nullable=False),
+            sa.Column('Region_id', sa.Integer(), sa.ForeignKey('regionlist.id'), nullable=False),
+            sa.Column('REXInitiator_id', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=False),
+            sa.Column('REXOnDiscipline_id', sa.Integer(), sa.ForeignKey('disciplinelist.id'), nullable=False),
+            sa.Column('REXInitiatingDiscipline_id', sa.Integer(), sa.ForeignKey('disciplinelist.id'), nullable=True),
+            sa.Column('REXOnTopic', sa.String(length=500), nullable=False),
+            sa.Column('REXDescription', sa.String(length=500), nullable=False),
+            sa.Column('Impact', sa.String(length=500), nullable=False),
+            sa.Column('AttachmentLink', sa.String(length=500), nullable=False),
+            sa.Column('Recommendation', sa.String(length=500), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('archived_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        for column in ['ProjectNameAndNumber_id', 'Region_id', 'REXInitiator_id', 'REXOnDiscipline_id', 'REXInitiatingDiscipline_id', 'archived_at']:
+            op.create_index(f'ix_rex_archive_entry_{column}', 'rex_archive_entry', [column])
+        op.create_index('ix_rex_archive_entry_date_created_id', 'rex_archive_entry', ['date_created', 'id'])
+        op.create_index('ix_rex_archive_entry_status_date_created_id', 'rex_archive_entry', ['status', 'date_created', 'id'])
+    if not inspector.has_table('rex_archive_committee'):
+        op.create_table(
+            'rex_archive_committee',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('parentid', sa.Integer(), _archive_children_fk(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=True),
+            sa.Column('ReviewCommiteeMember', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+            sa.Column('IsitREX', sa.String(length=100), nullable=False),
+            sa.Column('Isfurtheranalysisrequired', sa.String(length=500), nullable=True),
+            sa.Column('Mentor', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+            sa.Column('ActionBy', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+            sa.Column('QMSSpoc', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+            sa.Column('Technology', sa.Integer(), sa.ForeignKey('technologylist.id'), nullable=True),
+            sa.Column('REXCommitteeComments', sa.String(length=500), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        for column in ['parentid', 'ReviewCommiteeMember', 'Mentor', 'ActionBy', 'QMSSpoc', 'Technology']:
+            op.create_index(f'ix_rex_archive_committee_{column}', 'rex_archive_committee', [column])
+    if not inspector.has_table('rex_archive_action_plan'):
+        op.create_table(
+            'rex_archive_action_plan',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('parentid', sa.Integer(), _archive_children_fk(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=True),
+            sa.Column('AttendeesOfRootCause', sa.Integer(), sa.ForeignKey('employeelist.id'), nullable=True),
+            sa.Column('Date', sa.DateTime(), nullable=True),
+            sa.Column('FrequesncyOfIssue', sa.Integer(), sa.ForeignKey('frequencyofissuelist.id'), nullable=True),
+            sa.Column('EHSRisk', sa.Integer(), sa.ForeignKey('ehsrisklist.id'), nullable=True),
+            sa.Column('AddDocumentsLink', sa.String(length=500), nullable=True),
+            sa.Column('RootCause', sa.String(length=500), nullable=True),
+            sa.Column('CorrectiveAction', sa.String(length=500), nullable=True),
+            sa.Column('DocummentToUpdate', sa.Integer(), sa.ForeignKey('documenttoupdatelist.id'), nullable=True),
+            sa.Column('Remarks', sa.String(length=500), nullable=True),
+            sa.Column('AttachmentLink', sa.String(length=500), nullable=True),
+            sa.Column('ReportingManagerConfirmation', sa.Boolean(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        for column in ['parentid', 'AttendeesOfRootCause', 'FrequesncyOfIssue', 'EHSRisk', 'DocummentToUpdate']:
+            op.create_index(f'ix_rex_archive_action_plan_{column}', 'rex_archive_action_plan', [column])
+    if not inspector.has_table('rex_archive_review'):
+        op.create_table(
+            'rex_archive_review',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('parentid', sa.Integer(), _archive_children_fk(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=True),
+            sa.Column('Remarks', sa.String(length=500), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_rex_archive_review_parentid', 'rex_archive_review', ['parentid'])
+
+
+    for table in ['rex_committee_model', 'action_plan_model', 'review_by_committee_model']:
+        _replace_parent_fk(table, 'parentid', 'CASCADE')
+    _replace_parent_fk('rex_search_document', 'entry_id', None, keep=False)
+    _replace_parent_fk('attachment', 'entry_id', None, keep=False)
+
+
+def downgrade():
+    # Archived rows are dropped with their tables; run with an empty archive.
+    _replace_parent_fk('attachment', 'entry_id', 'SET NULL')
+    _replace_parent_fk('rex_search_document', 'entry_id', 'CASCADE')
+    for table in ['rex_committee_model', 'action_plan_model', 'review_by_committee_model']:
+        _replace_parent_fk(table, 'parentid', None)
+    for table in ['rex_archive_review', 'rex_archive_action_plan', 'rex_archive_committee', 'rex_archive_entry']:
+        op.drop_table(table)
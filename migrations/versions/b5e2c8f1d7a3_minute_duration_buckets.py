@@ -0,0 +1,66 @@
+"""Cycle-time histogram buckets from one minute
+
+Revision ID: b5e2c8f1d7a3
+Revises: f3b8d1e6a4c7
+Create Date: 2026-10-17 21:00:00.000000
+
+The first duration bucket covered everything under an hour, so sub-hour times in state read as
+about half an hour. The buckets now start at one minute (DURATION_BUCKETS in app.py); the
+histogram is re-bucketed from rex_status_transition, which keeps the exact seconds.
+
+"""
+from collections import Counter
+import bisect
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e2c8f1d7a3'
+down_revision = 'f3b8d1e6a4c7'
+branch_labels = None
+depends_on = None
+
+
+# Copies of app.DURATION_BUCKETS before and after this revision
+HOUR_BUCKETS = tuple(int(3600 * 2 ** (i / 4)) for i in range(61))
+MINUTE_BUCKETS = tuple(int(60 * 2 ** (i / 4)) for i in range(85))
+
+log = sa.table(
+    'rex_status_transition',
+    sa.column('from_status'), sa.column('to_status'), sa.column('region_id'), sa.column('discipline_id'),
+    sa.column('changed_at', sa.DateTime()), sa.column('seconds_in_state'), sa.column('seconds_open'),
+)
+histogram = sa.table(
+    'rex_duration_histogram',
+    sa.column('metric'), sa.column('region_id'), sa.column('discipline_id'), sa.column('month', sa.Date()),
+    sa.column('bucket'), sa.column('sample_count'),
+)
+
+
+def _rebucket(bounds):
+    # Same samples as app.transition_stats, under the given bucket bounds
+    bind = op.get_bind()
+    samples = Counter()
+    stmt = sa.select(log).where(log.c.from_status.isnot(None))
+    for row in bind.execute(stmt).mappings():
+        month = date(row['changed_at'].year, row['changed_at'].month, 1)
+        dimensions = (row['region_id'], row['discipline_id'], month)
+        if row['seconds_in_state'] is not None:
+            samples[(row['from_status'],) + dimensions + (bisect.bisect_left(bounds, row['seconds_in_state']),)] += 1
+        if row['to_status'] == 'Closed':
+            samples[('cycle',) + dimensions + (bisect.bisect_left(bounds, row['seconds_open']),)] += 1
+    op.execute(histogram.delete())
+    rows = [dict(metric=k[0], region_id=k[1], discipline_id=k[2], month=k[3], bucket=k[4], sample_count=n)
+            for k, n in samples.items()]
+    if rows: op.bulk_insert(histogram, rows)
+
+
+def upgrade():
+    _rebucket(MINUTE_BUCKETS)
+
+
+def downgrade():
+    _rebucket(HOUR_BUCKETS)
@@ -0,0 +1,51 @@
+"""Workflow status summary table
+
+Revision ID: c4d95e27a1f3
+Revises: 8b7e41c0d2a5
+Create Date: 2026-10-17 11:00:00.000000
+
+Filled from the existing entries, so the counts the app adjusts on every write start out right.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d95e27a1f3'
+down_revision = '8b7e41c0d2a5'
+branch_labels = None
+depends_on = None
+
+
+def _month(bind, column):
+    # First day of the month, as app.summary_key() buckets it
+    if bind.dialect.name == 'sqlite':
+        return f"date({column}, 'start of month')"
+    return f"CAST(DATE_FORMAT({column}, '%Y-%m-01') AS DATE)"
+
+
+def upgrade():
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table('rex_status_summary'):
+        return
+    op.create_table(
+        'rex_status_summary',
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('region_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('discipline_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status', 'region_id', 'discipline_id', 'month'),
+    )
+    month = _month(bind, 'date_created')
+    op.execute(
+        'INSERT INTO rex_status_summary (status, region_id, discipline_id, month, entry_count) '
+        f'SELECT status, Region_id, REXOnDiscipline_id, {month}, COUNT(*) FROM returnonexperienceentrymodel '
+        'WHERE date_created IS NOT NULL '
+        f'GROUP BY status, Region_id, REXOnDiscipline_id, {month}'
+    )
+
+
+def downgrade():
+    op.drop_table('rex_status_summary')
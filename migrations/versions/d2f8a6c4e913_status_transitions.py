@@ -0,0 +1,70 @@
+"""Status transition log and cycle-time aggregates
+
+Revision ID: d2f8a6c4e913
+Revises: a7d3c9e51b28
+Create Date: 2026-10-17 18:00:00.000000
+
+The log starts empty: status changes made before it existed are not recorded, so the first logged
+transition out of a status other than the initial one has no time-in-state.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f8a6c4e913'
+down_revision = 'a7d3c9e51b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('rex_status_transition'):
+        op.create_table(
+            'rex_status_transition',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('entry_id', sa.Integer(), nullable=False),
+            sa.Column('from_status', sa.String(length=50), nullable=True),
+            sa.Column('to_status', sa.String(length=50), nullable=False),
+            sa.Column('region_id', sa.Integer(), nullable=False),
+            sa.Column('discipline_id', sa.Integer(), nullable=False),
+            sa.Column('changed_at', sa.DateTime(), nullable=False),
+            sa.Column('changed_by', sa.String(length=255), nullable=True),
+            sa.Column('seconds_in_state', sa.Integer(), nullable=True),
+            sa.Column('seconds_open', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_rex_status_transition_entry_id_id', 'rex_status_transition', ['entry_id', 'id'])
+        op.create_index('ix_rex_status_transition_changed_at', 'rex_status_transition', ['changed_at'])
+    if not inspector.has_table('rex_transition_summary'):
+        op.create_table(
+            'rex_transition_summary',
+            sa.Column('from_status', sa.String(length=50), nullable=False),
+            sa.Column('to_status', sa.String(length=50), nullable=False),
+            sa.Column('region_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('discipline_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('transition_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('from_status', 'to_status', 'region_id', 'discipline_id', 'month'),
+        )
+    if not inspector.has_table('rex_duration_histogram'):
+        op.create_table(
+            'rex_duration_histogram',
+            sa.Column('metric', sa.String(length=50), nullable=False),
+            sa.Column('region_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('discipline_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('bucket', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('sample_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('metric', 'region_id', 'discipline_id', 'month', 'bucket'),
+        )
+
+
+def downgrade():
+    op.drop_table('rex_duration_histogram')
+    op.drop_table('rex_transition_summary')
+    op.drop_index('ix_rex_status_transition_changed_at', table_name='rex_status_transition')
+    op.drop_index('ix_rex_status_transition_entry_id_id', table_name='rex_status_transition')
+    op.drop_table('rex_status_transition')
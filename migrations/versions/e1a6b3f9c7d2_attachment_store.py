@@ -0,0 +1,44 @@
+"""Content-addressed attachment metadata
+
+Revision ID: e1a6b3f9c7d2
+Revises: c4d95e27a1f3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a6b3f9c7d2'
+down_revision = 'c4d95e27a1f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('attachment'):
+        return
+    op.create_table(
+        'attachment',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date_created', sa.DateTime(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('original_name', sa.String(length=255), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mime_type', sa.String(length=255), nullable=False),
+        sa.Column('uploaded_by', sa.String(length=255), nullable=True),
+        sa.Column('entry_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['entry_id'], ['returnonexperienceentrymodel.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_attachment_sha256', 'attachment', ['sha256'])
+    op.create_index('ix_attachment_date_created_id', 'attachment', ['date_created', 'id'])
+    op.create_index('ix_attachment_entry_id_date_created', 'attachment', ['entry_id', 'date_created', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_attachment_entry_id_date_created', table_name='attachment')
+    op.drop_index('ix_attachment_date_created_id', table_name='attachment')
+    op.drop_index('ix_attachment_sha256', table_name='attachment')
+    op.drop_table('attachment')
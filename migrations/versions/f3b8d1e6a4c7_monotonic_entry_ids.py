@@ -0,0 +1,79 @@
+"""Never reuse entry and child row ids on SQLite
+
+Revision ID: f3b8d1e6a4c7
+Revises: d2f8a6c4e913
+Create Date: 2026-10-17 20:00:00.000000
+
+Archived rows keep their ids, but SQLite gives a new row max(id) + 1 of what is left in the live
+table, so an id moved to the archive could be handed out again. The live entry and child tables
+are rebuilt with AUTOINCREMENT, and their sequences start after the highest archived id. MySQL
+(InnoDB, 8.0+) already never reuses auto-increment values, so nothing changes there.
+
+The rebuild needs foreign keys off, which SQLite only allows outside a transaction: the PRAGMA
+runs in an autocommit block, and env.py gives every revision its own transaction.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1e6a4c7'
+down_revision = 'd2f8a6c4e913'
+branch_labels = None
+depends_on = None
+
+
+# live table -> archive table, parent first
+TABLES = [
+    ('returnonexperienceentrymodel', 'rex_archive_entry'),
+    ('rex_committee_model', 'rex_archive_committee'),
+    ('action_plan_model', 'rex_archive_action_plan'),
+    ('review_by_committee_model', 'rex_archive_review'),
+]
+
+
+def _has_autoincrement(bind, table):
+    sql = bind.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).scalar()
+    return 'AUTOINCREMENT' in sql.upper()
+
+
+def _set_foreign_keys(bind, on):
+    with op.get_context().autocommit_block():
+        bind.exec_driver_sql(f"PRAGMA foreign_keys={'ON' if on else 'OFF'}")
+
+
+def _rebuild(autoincrement):
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    # Tables create_all() made from the current models already have it
+    tables = [table for table, _ in TABLES if _has_autoincrement(bind, table) != autoincrement]
+    if tables:
+        # Dropping the old entry table with foreign keys on would cascade-delete every child row.
+        _set_foreign_keys(bind, False)
+        if bind.exec_driver_sql('PRAGMA foreign_keys').scalar():
+            raise RuntimeError('Foreign keys are still on inside a transaction; cannot rebuild the entry tables.')
+    for table in tables:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+            pass
+    if autoincrement:
+        for table, archive in TABLES:
+            # Never lower a sequence: it can be past both tables when the newest rows were deleted
+            highest = bind.exec_driver_sql(
+                f'SELECT max(id) FROM (SELECT max(id) AS id FROM {table} UNION ALL SELECT max(id) FROM {archive} '
+                'UNION ALL SELECT seq FROM sqlite_sequence WHERE name = ?)', (table,)).scalar() or 0
+            bind.exec_driver_sql('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+            bind.exec_driver_sql('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, highest))
+    if bind.exec_driver_sql('PRAGMA foreign_key_check').first():
+        raise RuntimeError('Foreign key violations after the rebuild')
+    if tables:
+        _set_foreign_keys(bind, True)
+
+
+def upgrade():
+    _rebuild(True)
+
+
+def downgrade():
+    _rebuild(False)
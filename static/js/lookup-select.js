@@ -0,0 +1,47 @@
+// Selects rendered by LookupSelectField carry data-lookup-url and only their current option.
+// Opening one, or typing in its bootstrap-select search box, fetches matching options from the
+// lookup API and swaps them in, keeping the blank and the selected option.
+(function ($) {
+    'use strict';
+    var DELAY = 200;
+
+    function replaceOptions(select, results) {
+        var keep = {};
+        $(select).find('option').each(function () {
+            if (this.value === '' || this.selected) { keep[this.value] = true; } else { $(this).remove(); }
+        });
+        results.forEach(function (item) {
+            var value = String(item.id);
+            if (!keep[value]) { select.appendChild(new Option(item.name, value)); }
+        });
+        $(select).selectpicker('refresh');
+    }
+
+    function fetchOptions(select, query, done) {
+        $.getJSON(select.getAttribute('data-lookup-url'), { q: query }).done(function (data) {
+            replaceOptions(select, data.results);
+            if (done) { done(); }
+        });
+    }
+
+    $(document).on('show.bs.select', 'select[data-lookup-url]', function () {
+        if (!this.getAttribute('data-lookup-loaded')) {
+            this.setAttribute('data-lookup-loaded', '1');
+            fetchOptions(this, '');
+        }
+    });
+
+    $(document).on('input', '.bootstrap-select .bs-searchbox input', function () {
+        var input = this;
+        var select = $(input).closest('.bootstrap-select').find('select[data-lookup-url]')[0];
+        if (!select) { return; }
+        clearTimeout(select.lookupTimer);
+        select.lookupTimer = setTimeout(function () {
+            var query = input.value;
+            fetchOptions(select, query, function () {
+                // Let bootstrap-select filter the new options against what is now in the box
+                if (input.value === query) { $(input).trigger('propertychange'); }
+            });
+        }, DELAY);
+    });
+}(jQuery));
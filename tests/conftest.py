@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+import tempfile
+
+import pytest
+
+# app.py reads its settings at import time
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='rex-tests-'), 'test.db')
+os.environ.setdefault('JOB_WORKER_THREADS', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as rex  # noqa: E402
+
+rex.create_app()
+rex.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+
+
+@pytest.fixture
+def db():
+    with rex.app.app_context():
+        rex.db.create_all()
+        try:
+            yield rex.db
+        finally:
+            rex.db.session.remove()
+            rex.db.drop_all()
+
+
+@pytest.fixture
+def lookups(db):
+    return rex.seed_lookups(random.Random(0), employees=5, projects=5)
+
+
+@pytest.fixture
+def make_entry(db, lookups):
+    def make(status='RexCommitee', committee=False):
+        entry = rex.Returnonexperienceentrymodel(
+            status=status, ProjectNameAndNumber_id=lookups['projects'][0], Region_id=lookups['regions'][0],
+            REXInitiator_id=lookups['employees'][0], REXOnDiscipline_id=lookups['disciplines'][0],
+            REXOnTopic='Topic', REXDescription='Description', Impact='Impact', AttachmentLink='https://example.com',
+            Recommendation='Recommendation')
+        if committee:
+            entry.rexcommitee.append(rex.RexCommitteeModel(IsitREX='Yes', REXCommitteeComments='Comments'))
+        db.session.add(entry)
+        db.session.commit()
+        return entry
+    return make
+
+
+@pytest.fixture
+def client(db):
+    return rex.app.test_client()
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    monkeypatch.setitem(rex.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    return tmp_path
@@ -0,0 +1,71 @@
+import pytest
+
+import app as rex
+
+
+def get(client, url):
+    response = client.get(url)
+    return response.status_code, response.get_json()
+
+
+@pytest.mark.parametrize('fields', ['nope', 'status,nope', 'status,REXOnTopic', 'committee.id'])
+@pytest.mark.parametrize('url', ['/api/v1/entries', '/api/v1/entries/1'])
+def test_unknown_fields_are_rejected(client, make_entry, url, fields):
+    make_entry()
+    status, body = get(client, f'{url}?fields={fields}')
+    assert status == 400
+    assert body['error'].startswith('Unknown fields:')
+
+
+def test_sparse_fields_always_include_the_id(client, make_entry):
+    entry = make_entry(committee=True)
+    status, body = get(client, f'/api/v1/entries/{entry.id}?fields= status , region,committee,status,')
+    assert status == 200
+    assert set(body['data']) == {'id', 'status', 'region', 'committee'}
+    assert body['data']['region'] == rex.db.session.get(rex.Regionlist, entry.Region_id).name
+    assert body['data']['committee']['decision'] == 'Yes'
+
+
+def test_default_fields(client, make_entry):
+    entry = make_entry()
+    status, body = get(client, f'/api/v1/entries/{entry.id}')
+    assert status == 200
+    assert set(body['data']) == set(rex.API_DEFAULT_FIELDS)
+    assert body['data']['archived'] is False
+
+
+@pytest.mark.parametrize('ids', ['1,x', '1,,2', '1.5', ' '])
+def test_malformed_ids_are_rejected(client, make_entry, ids):
+    make_entry()
+    status, body = get(client, f'/api/v1/entries?ids={ids}')
+    assert status == 400
+    assert 'ids' in body['error']
+
+
+def test_too_many_ids_are_rejected(client, db):
+    ids = ','.join(str(n) for n in range(1, rex.API_MAX_IDS + 2))
+    status, body = get(client, f'/api/v1/entries?ids={ids}')
+    assert status == 400
+    assert str(rex.API_MAX_IDS) in body['error']
+
+
+def test_duplicate_ids_count_once_towards_the_limit(client, db):
+    ids = ','.join(str(n) for n in range(1, rex.API_MAX_IDS + 1))
+    status, body = get(client, f'/api/v1/entries?ids={ids},1,2')
+    assert status == 200
+    assert len(body['missing']) == rex.API_MAX_IDS
+
+
+def test_batch_keeps_request_order_and_reports_missing(client, make_entry):
+    live, archived = make_entry().id, make_entry('Rejected').id
+    assert rex.archive_entries(older_than_days=-1) == 1
+    status, body = get(client, f'/api/v1/entries?ids={archived},999,{live}&fields=archived')
+    assert status == 200
+    assert body['data'] == [dict(id=archived, archived=True), dict(id=live, archived=False)]
+    assert body['missing'] == [999]
+
+
+def test_missing_entry_is_a_json_404(client, db):
+    status, body = get(client, '/api/v1/entries/999')
+    assert status == 404
+    assert body == dict(error='Entry not found')
@@ -0,0 +1,60 @@
+from collections import Counter
+
+from sqlalchemy import func, select
+
+import app as rex
+
+
+def archive_all():
+    # A cutoff in the future makes every Closed or Rejected entry old enough
+    return rex.archive_entries(older_than_days=-1)
+
+
+def stored_summary():
+    table = rex.RexStatusSummary
+    return Counter({(r.status, r.region_id, r.discipline_id, r.month): r.entry_count
+                    for r in table.query.filter(table.entry_count != 0)})
+
+
+def test_archive_again_after_new_child_rows(db, make_entry):
+    first = make_entry('Closed', committee=True)
+    first_id, first_committee = first.id, first.rexcommitee[0].id
+    assert archive_all() == 1
+    second = make_entry('RexCommitee', committee=True)
+    assert second.id != first_id
+    assert second.rexcommitee[0].id != first_committee
+    second.status = 'Closed'
+    db.session.commit()
+    assert archive_all() == 1
+    assert db.session.scalar(select(func.count()).select_from(rex.ArchivedCommittee)) == 2
+    assert db.session.scalar(select(func.count()).select_from(rex.Returnonexperienceentrymodel)) == 0
+
+
+def test_new_entry_never_takes_an_archived_id(db, make_entry):
+    archived_id = make_entry('Rejected').id
+    assert archive_all() == 1
+    # The live table is now empty; SQLite without AUTOINCREMENT would hand out the archived id again
+    assert make_entry().id > archived_id
+
+
+def test_purge_keeps_the_workflow_summary_in_step(db, lookups):
+    rex.seed_entries(300, seed=1, employees=5, projects=5)
+    assert archive_all() > 0
+    assert rex.purge_archived_entries(older_than_days=-1) > 0
+    assert db.session.scalar(select(func.count()).select_from(rex.ArchivedEntry)) == 0
+    expected = rex.recompute_status_summary()
+    assert stored_summary() == +expected
+
+
+def test_seeding_after_archiving_skips_archived_ids(db, lookups):
+    rex.seed_entries(200, seed=3, employees=5, projects=5)
+    model = rex.Returnonexperienceentrymodel
+    newest = db.session.get(model, db.session.scalar(select(func.max(model.id))))
+    newest.status = 'Closed'
+    db.session.commit()
+    assert archive_all() > 0
+    rex.seed_entries(200, seed=4, employees=5, projects=5)
+    live = set(db.session.scalars(select(rex.Returnonexperienceentrymodel.id)))
+    archived = set(db.session.scalars(select(rex.ArchivedEntry.id)))
+    assert len(live) == 400 - len(archived)
+    assert not live & archived
@@ -0,0 +1,48 @@
+from sqlalchemy import func, select, update
+
+import app as rex
+
+
+def review_items(*entries):
+    return [dict(id=entry.id, decision='close', Remarks='Reviewed') for entry in entries]
+
+
+def statuses(*ids):
+    model = rex.Returnonexperienceentrymodel
+    return dict(rex.db.session.execute(select(model.id, model.status).where(model.id.in_(ids))).all())
+
+
+def test_bulk_review_closes_entries(db, make_entry):
+    first, second = make_entry('ReviewByCommittee'), make_entry('ReviewByCommittee')
+    ids = first.id, second.id
+    result = rex.apply_bulk_transitions('review', review_items(first, second))
+    assert (result['applied'], result['failed']) == (2, 0)
+    assert statuses(*ids) == {ids[0]: 'Closed', ids[1]: 'Closed'}
+
+
+def test_bulk_review_writes_nothing_when_an_entry_moved_on(db, make_entry, monkeypatch):
+    first, second = make_entry('ReviewByCommittee'), make_entry('ReviewByCommittee')
+    ids, items = (first.id, second.id), review_items(first, second)
+    real_event = rex.transition_event
+
+    def concurrent_close(entry, *args, **kwargs):
+        # Another writer sends the second entry back after the batch checked its status
+        table = rex.Returnonexperienceentrymodel.__table__
+        db.session.connection().execute(update(table).where(table.c.id == ids[1]).values(status='ActinPlan'))
+        return real_event(entry, *args, **kwargs)
+    monkeypatch.setattr(rex, 'transition_event', concurrent_close)
+
+    result = rex.apply_bulk_transitions('review', items)
+    assert (result['applied'], result['failed']) == (0, 2)
+    assert all('retry' in r['errors']['id'][0] for r in result['results'])
+    assert 'Closed' not in statuses(*ids).values()
+    assert db.session.scalar(select(func.count()).select_from(rex.ReviewByCommitteeModel)) == 0
+
+
+def test_bulk_failure_is_logged_with_its_traceback(client, monkeypatch, caplog):
+    def fail(*args, **kwargs): raise RuntimeError('database went away')
+    monkeypatch.setattr(rex, 'apply_bulk_transitions', fail)
+    response = client.post('/bulk/review', json=dict(items=[dict(id=1, decision='close', Remarks='Reviewed')]))
+    assert response.status_code == 500
+    record = next(r for r in caplog.records if 'bulk_transition_failed' in r.getMessage())
+    assert record.exc_info[1].args == ('database went away',)
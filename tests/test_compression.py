@@ -0,0 +1,118 @@
+import gzip
+
+import pytest
+from flask import Flask, Response, send_file, stream_with_context
+
+import app as rex
+
+PAGE = ('<p>' + 'lessons learned ' * 200 + '</p>').encode()
+
+
+@pytest.fixture
+def client(tmp_path):
+    asset = tmp_path / 'report.txt'
+    asset.write_bytes(PAGE)
+    site = Flask('compression-test')
+
+    @site.route('/page')
+    def page(): return Response(PAGE, mimetype='text/html')
+
+    @site.route('/small')
+    def small(): return Response(b'<p>short</p>', mimetype='text/html')
+
+    @site.route('/stream')
+    def stream(): return Response(stream_with_context(PAGE[i:i + 500] for i in range(0, len(PAGE), 500)), mimetype='text/html')
+
+    @site.route('/encoded')
+    def encoded(): return Response(gzip.compress(PAGE), mimetype='text/html', headers={'Content-Encoding': 'gzip'})
+
+    @site.route('/file')
+    def file(): return send_file(str(asset), mimetype='text/plain', conditional=True)
+
+    @site.route('/no-transform')
+    def no_transform(): return Response(PAGE, mimetype='text/html', headers={'Cache-Control': 'no-transform'})
+
+    site.wsgi_app = rex.CompressionMiddleware(site.wsgi_app)
+    return site.test_client()
+
+
+def get(client, url, encoding='gzip', **kwargs):
+    return client.get(url, headers=dict({'Accept-Encoding': encoding}, **kwargs.pop('headers', {})), **kwargs)
+
+
+def test_buffered_page_is_gzipped(client):
+    response = get(client, '/page')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert int(response.headers['Content-Length']) == len(response.data) < len(PAGE)
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == PAGE
+
+
+def test_streamed_page_is_gzipped_chunk_by_chunk(client):
+    response = get(client, '/stream')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data) == PAGE
+
+
+def test_brotli_is_preferred_when_available(client):
+    brotli = pytest.importorskip('brotli')
+    response = get(client, '/page', 'gzip, br')
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == PAGE
+
+
+@pytest.mark.parametrize('url', ['/page', '/stream'])
+def test_identity_without_accept_encoding(client, url):
+    response = get(client, url, 'identity')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == PAGE
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_small_body_is_sent_as_is(client):
+    response = get(client, '/small')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'<p>short</p>'
+
+
+def test_head_is_not_compressed(client):
+    response = client.head('/page', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert int(response.headers['Content-Length']) == len(PAGE)
+    assert response.data == b''
+
+
+def test_existing_content_encoding_passes_through(client):
+    response = get(client, '/encoded')
+    assert response.headers.getlist('Content-Encoding') == ['gzip']
+    assert gzip.decompress(response.data) == PAGE
+
+
+def test_range_request_passes_through(client):
+    response = get(client, '/file', headers={'Range': 'bytes=0-99'})
+    assert response.status_code == 206
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Content-Range'] == f'bytes 0-99/{len(PAGE)}'
+    assert response.data == PAGE[:100]
+
+
+def test_range_capable_file_is_not_compressed(client):
+    # Without a Range header send_file sets no Accept-Ranges; a later range request for the same
+    # ETag must still address the bytes sent here
+    response = get(client, '/file')
+    assert 'Content-Encoding' not in response.headers
+    assert int(response.headers['Content-Length']) == len(PAGE)
+    assert response.data == PAGE
+
+
+def test_no_transform_is_respected(client):
+    assert 'Content-Encoding' not in get(client, '/no-transform').headers
+
+
+def test_app_listing_is_compressed(db, make_entry):
+    make_entry()
+    response = rex.app.test_client().get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data).lstrip().startswith(b'<')
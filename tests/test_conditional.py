@@ -0,0 +1,76 @@
+import pytest
+
+import app as rex
+
+
+@pytest.fixture
+def entry(make_entry):
+    return make_entry()
+
+
+def get(client, url, etag=None):
+    return client.get(url, headers={'If-None-Match': etag} if etag else {})
+
+
+def skip_views(monkeypatch):
+    # A 304 must come from the validators alone
+    def render(*args, **kwargs): raise AssertionError('view rendered')
+    monkeypatch.setattr(rex, 'render_page', render)
+
+
+@pytest.mark.parametrize('url', ['/', '/update/{id}'])
+def test_matching_etag_answers_304_without_the_view(client, entry, monkeypatch, url):
+    url = url.format(id=entry.id)
+    first = get(client, url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert 'no-cache' in first.headers['Cache-Control'] and 'private' in first.headers['Cache-Control']
+    skip_views(monkeypatch)
+    again = get(client, url, etag)
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+
+def test_entry_change_invalidates_its_pages(client, entry, make_entry, db):
+    other = make_entry()
+    listing, page, other_page = (get(client, url).headers['ETag'] for url in ('/', f'/update/{entry.id}', f'/update/{other.id}'))
+    entry.REXOnTopic = 'Changed'
+    db.session.commit()
+    assert get(client, '/', listing).status_code == 200
+    assert get(client, f'/update/{entry.id}', page).status_code == 200
+    assert get(client, f'/update/{other.id}', other_page).status_code == 304
+
+
+def test_lookup_change_invalidates_every_page(client, entry, db):
+    listing, page = (get(client, url).headers['ETag'] for url in ('/', f'/update/{entry.id}'))
+    db.session.add(rex.Regionlist(name='New region'))
+    db.session.commit()
+    assert get(client, '/', listing).status_code == 200
+    assert get(client, f'/update/{entry.id}', page).status_code == 200
+
+
+def test_pending_flash_bypasses_the_check(client, entry):
+    etag = get(client, '/').headers['ETag']
+    with client.session_transaction() as session:
+        session['_flashes'] = [('success', 'Saved')]
+    response = get(client, '/', etag)
+    assert response.status_code == 200
+    assert b'Saved' in response.data
+    assert get(client, '/', etag).status_code == 304
+
+
+def test_query_string_is_part_of_the_listing_etag(client, entry):
+    etag = get(client, '/').headers['ETag']
+    assert get(client, '/?status=Closed', etag).status_code == 200
+
+
+def test_if_modified_since_without_etag(client, entry):
+    first = get(client, f'/update/{entry.id}')
+    response = client.get(f'/update/{entry.id}', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 304
+
+
+def test_unknown_entry_is_left_to_the_view(db):
+    with rex.app.test_request_context('/update/999', headers={'If-None-Match': '"anything"'}):
+        assert rex.entry_validators(id=999) == (None, None)
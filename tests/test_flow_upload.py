@@ -0,0 +1,67 @@
+import app as rex
+
+ALICE, BOB = {'X-Goog-Authenticated-User-Email': 'accounts.google.com:alice@example.com'}, \
+    {'X-Goog-Authenticated-User-Email': 'accounts.google.com:bob@example.com'}
+
+
+def flow_args(number, chunks, body_size, total_size, identifier='1000-reportpdf'):
+    return dict(flowIdentifier=identifier, flowFilename='report.pdf', flowChunkNumber=number,
+                flowTotalChunks=chunks, flowTotalSize=total_size, flowCurrentChunkSize=body_size)
+
+
+def post_chunk(client, number, chunks, data, total_size, headers=ALICE, declared=None):
+    args = flow_args(number, chunks, len(data) if declared is None else declared, total_size)
+    return client.post('/upload/chunk', query_string=args, data=data,
+                       content_type='application/octet-stream', headers=headers)
+
+
+def has_chunk(client, number, chunks, size, total_size, headers=ALICE):
+    response = client.get('/upload/chunk', query_string=flow_args(number, chunks, size, total_size), headers=headers)
+    return response.status_code == 200
+
+
+def blob(sha256):
+    with open(rex.blob_path(sha256), 'rb') as handle: return handle.read()
+
+
+def test_resume_uploads_only_missing_chunks(client, uploads):
+    parts = [b'a' * 10, b'b' * 10, b'c' * 5]
+    assert not has_chunk(client, 1, 3, 10, 25)
+    assert post_chunk(client, 1, 3, parts[0], 25).get_json() == dict(complete=False, filename=None)
+    assert post_chunk(client, 2, 3, parts[1], 25).get_json()['complete'] is False
+    # The client reconnects and asks which chunks the server already has
+    assert [has_chunk(client, n, 3, len(parts[n - 1]), 25) for n in (1, 2, 3)] == [True, True, False]
+    result = post_chunk(client, 3, 3, parts[2], 25).get_json()
+    assert result['complete'] is True
+    assert blob(result['filename']) == b''.join(parts)
+    assert not has_chunk(client, 1, 3, 10, 25)
+
+
+def test_duplicate_chunk_replaces_the_first_copy(client, uploads):
+    post_chunk(client, 1, 2, b'x' * 4, 8)
+    post_chunk(client, 1, 2, b'a' * 4, 8)
+    result = post_chunk(client, 2, 2, b'b' * 4, 8).get_json()
+    assert blob(result['filename']) == b'aaaabbbb'
+
+
+def test_short_chunk_is_rejected_and_not_kept(client, uploads):
+    response = post_chunk(client, 1, 2, b'a' * 3, 8, declared=4)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Incomplete chunk'
+    assert not has_chunk(client, 1, 2, 4, 8)
+
+
+def test_users_with_the_same_identifier_do_not_share_chunks(client, uploads):
+    post_chunk(client, 1, 2, b'a' * 4, 8, headers=ALICE)
+    assert not has_chunk(client, 1, 2, 4, 8, headers=BOB)
+    assert post_chunk(client, 2, 2, b'b' * 4, 8, headers=BOB).get_json()['complete'] is False
+    result = post_chunk(client, 2, 2, b'c' * 4, 8, headers=ALICE).get_json()
+    assert blob(result['filename']) == b'aaaacccc'
+
+
+def test_chunks_beyond_the_declared_total_fail_the_upload(client, uploads):
+    post_chunk(client, 3, 3, b'z' * 4, 12)
+    post_chunk(client, 1, 2, b'a' * 4, 8)
+    response = post_chunk(client, 2, 2, b'b' * 4, 8)
+    assert response.status_code == 400
+    assert not has_chunk(client, 1, 2, 4, 8)
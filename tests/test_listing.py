@@ -0,0 +1,70 @@
+import re
+from datetime import datetime
+
+import pytest
+
+import app as rex
+
+
+@pytest.fixture
+def entries(db, lookups):
+    rex.seed_entries(120, seed=5, employees=5, projects=5)
+    # Closed and Rejected entries move to the archive, so pages merge both tables
+    assert rex.archive_entries(older_than_days=-1) > 0
+
+
+def walk(filters, sort, descending, per_page=7):
+    seen, cursor = [], None
+    while True:
+        page, cursor = rex.paginate_listing(filters, sort, cursor=cursor, per_page=per_page, descending=descending)
+        assert len(page) <= per_page
+        seen.extend(page)
+        if cursor is None: return seen
+
+
+def identity(entry): return (type(entry).__name__, entry.id)
+
+
+@pytest.mark.parametrize('descending', [True, False])
+@pytest.mark.parametrize('sort', sorted(rex.LISTING_SORTS))
+def test_pages_cover_every_entry_once_in_order(entries, sort, descending):
+    _, row_key = rex.listing_sort_spec(sort)
+    everything = rex.Returnonexperienceentrymodel.query.all() + rex.ArchivedEntry.query.all()
+    expected = sorted(everything, key=row_key, reverse=descending)
+    assert [identity(e) for e in walk({}, sort, descending)] == [identity(e) for e in expected]
+
+
+def test_status_filter_pages_one_table(entries):
+    seen = walk(dict(status='RexCommitee'), 'date', True, per_page=3)
+    assert seen and all(isinstance(e, rex.Returnonexperienceentrymodel) and e.status == 'RexCommitee' for e in seen)
+    assert len(seen) == rex.Returnonexperienceentrymodel.query.filter_by(status='RexCommitee').count()
+
+
+def test_ties_on_date_created_are_broken_by_id(db, make_entry):
+    made = [make_entry() for _ in range(5)]
+    stamp = datetime(2024, 1, 1)
+    for entry in made: entry.date_created = stamp
+    db.session.commit()
+    assert [e.id for e in walk({}, 'date', True, per_page=2)] == sorted((e.id for e in made), reverse=True)
+
+
+def test_new_entries_do_not_shift_later_pages(entries, make_entry):
+    first, cursor = rex.paginate_listing({}, 'date', per_page=10)
+    make_entry()
+    second, _ = rex.paginate_listing({}, 'date', cursor=cursor, per_page=10)
+    assert not {identity(e) for e in first} & {identity(e) for e in second}
+    assert second[0].date_created <= first[-1].date_created
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', rex.encode_cursor([1]), '!!!'])
+def test_malformed_cursor_restarts_at_page_one(entries, cursor):
+    first, _ = rex.paginate_listing({}, 'date', per_page=5)
+    again, _ = rex.paginate_listing({}, 'date', cursor=cursor, per_page=5)
+    assert [identity(e) for e in again] == [identity(e) for e in first]
+
+
+def test_listing_links_to_the_next_page(client, entries):
+    body = client.get('/?per_page=5').get_data(as_text=True)
+    cursor = re.search(r'cursor=([\w-]+)', body).group(1)
+    assert client.get(f'/?per_page=5&cursor={cursor}').status_code == 200
+    assert 'First page' in client.get(f'/?per_page=5&cursor={cursor}').get_data(as_text=True)
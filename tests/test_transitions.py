@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+import app as rex
+
+
+def percentile_of(seconds, pct):
+    buckets = Counter(rex.duration_bucket(value) for value in seconds)
+    return rex.bucket_percentile(sorted(buckets.items()), len(seconds), pct)
+
+
+def close_to(value, expected):
+    # One bucket is a quarter doubling wide
+    return expected / 2 ** 0.25 <= value <= expected * 2 ** 0.25
+
+
+@pytest.mark.parametrize('seconds', [90, 300, 1200, 3000])
+def test_sub_hour_durations_keep_their_size(seconds):
+    for pct in rex.CYCLE_TIME_PERCENTILES:
+        assert close_to(percentile_of([seconds] * 20, pct), seconds)
+
+
+def test_sub_hour_durations_are_told_apart():
+    assert percentile_of([60] * 10, 50) < percentile_of([600] * 10, 50) < percentile_of([3000] * 10, 50)
+
+
+def test_percentiles_across_buckets():
+    samples = [600] * 50 + [86400] * 40 + [30 * 86400] * 10
+    assert close_to(percentile_of(samples, 25), 600)
+    assert close_to(percentile_of(samples, 75), 86400)
+    assert close_to(percentile_of(samples, 95), 30 * 86400)
+    values = [percentile_of(samples, pct) for pct in (10, 50, 60, 90, 99)]
+    assert values == sorted(values)
+
+
+def test_percentile_edges():
+    assert rex.bucket_percentile([], 0, 50) is None
+    assert percentile_of([10 ** 10], 50) == rex.DURATION_BUCKETS[-1]
+    assert percentile_of([0, 30], 100) <= rex.DURATION_BUCKETS[0]
+
+
+def stored_transition_stats():
+    summary, histogram = rex.RexTransitionSummary, rex.RexDurationHistogram
+    counts = Counter({(r.from_status, r.to_status, r.region_id, r.discipline_id, r.month): r.transition_count
+                      for r in summary.query.filter(summary.transition_count != 0)})
+    samples = Counter({(r.metric, r.region_id, r.discipline_id, r.month, r.bucket): r.sample_count
+                       for r in histogram.query.filter(histogram.sample_count != 0)})
+    return counts, samples
+
+
+def logged_entry_ids():
+    return set(rex.db.session.scalars(rex.select(rex.RexStatusTransition.entry_id)))
+
+
+def assert_stats_match_log():
+    counts, samples = rex.recompute_transition_stats()
+    assert stored_transition_stats() == (+counts, +samples)
+
+
+def test_purge_removes_the_transition_log(db, lookups):
+    rex.seed_entries(300, seed=2, employees=5, projects=5)
+    assert rex.archive_entries(older_than_days=-1) > 0
+    archived = set(db.session.scalars(rex.select(rex.ArchivedEntry.id)))
+    assert archived <= logged_entry_ids()
+    rex.purge_archived_entries(older_than_days=-1)
+    assert not archived & logged_entry_ids()
+    assert_stats_match_log()
+
+
+def test_delete_removes_the_transition_log(db, make_entry):
+    entry = make_entry()
+    entry.status = 'ReviewByCommittee'
+    db.session.commit()
+    kept, id = make_entry().id, entry.id
+    assert rex.app.test_client().get(f'/delete/{id}').status_code == 302
+    assert logged_entry_ids() == {kept}
+    assert_stats_match_log()
@@ -0,0 +1,50 @@
+import io
+
+import app as rex
+
+
+def upload(client, name, body, content_type):
+    data = {'file': (io.BytesIO(body), name, content_type)}
+    return client.post('/upload', data=data, content_type='multipart/form-data')
+
+
+def latest_attachment():
+    return rex.Attachment.query.order_by(rex.Attachment.id.desc()).first()
+
+
+def test_declared_content_type_is_ignored(client, uploads):
+    assert upload(client, 'a.pdf', b'<script>alert(1)</script>', 'text/html').status_code == 200
+    attachment = latest_attachment()
+    assert attachment.mime_type == 'application/pdf'
+    response = client.get(f'/uploads/{attachment.sha256}')
+    assert response.mimetype == 'application/pdf'
+    assert response.headers['Content-Disposition'].startswith('attachment')
+    assert response.headers['X-Content-Type-Options'] == 'nosniff'
+    assert 'public' not in response.headers['Cache-Control']
+    assert 'private' in response.headers['Cache-Control']
+
+
+def test_images_are_shown_inline(client, uploads):
+    upload(client, 'photo.png', b'\x89PNG\r\n\x1a\n', 'image/png')
+    response = client.get(f'/uploads/{latest_attachment().sha256}')
+    assert response.mimetype == 'image/png'
+    assert response.headers['Content-Disposition'].startswith('inline')
+
+
+def test_stored_type_is_not_trusted_when_served(client, uploads):
+    upload(client, 'notes.txt', b'<b>hi</b>', 'text/plain')
+    attachment = latest_attachment()
+    attachment.mime_type = 'text/html'
+    rex.db.session.commit()
+    response = client.get(f'/uploads/{attachment.sha256}')
+    assert response.mimetype == 'text/plain'
+    assert response.headers['Content-Disposition'].startswith('attachment')
+
+
+def test_first_upload_names_shared_content(client, uploads):
+    upload(client, 'first.png', b'same bytes', 'image/png')
+    sha256 = latest_attachment().sha256
+    upload(client, 'second.txt', b'same bytes', 'text/plain')
+    response = client.get(f'/uploads/{sha256}')
+    assert response.mimetype == 'image/png'
+    assert 'first.png' in response.headers['Content-Disposition']